@@ -0,0 +1,40 @@
+#!/usr/bin/env -S uv run
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+Convert legacy JSON array hook logs in ~/.claude/logs to append-only JSONL.
+
+Hooks now append one JSON line per event instead of rewriting the whole
+array, so the old stop.json / notification.json / subagent_stop.json files
+are migrated once into their .jsonl counterparts. Project-local logs/
+directories (written by pre_tool_use.py and friends) are not discoverable
+from here; run `python3 ~/.claude/hooks/utils/event_store.py migrate` inside
+a project to convert them.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+
+def main() -> None:
+    event_store = Path.home() / ".claude" / "hooks" / "utils" / "event_store.py"
+    log_dir = Path.home() / ".claude" / "logs"
+
+    if not event_store.exists():
+        print(f"{event_store} not found, skipping hook log migration")
+        return
+
+    if not log_dir.is_dir():
+        print(f"No hook logs at {log_dir}, nothing to migrate")
+        return
+
+    result = subprocess.run([sys.executable, str(event_store), "migrate", str(log_dir)])
+    if result.returncode != 0:
+        print("❌ Failed to migrate hook logs", file=sys.stderr)
+        sys.exit(result.returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Stdin-to-socket client for the persistent hook server (utils/hook_server.py).
+
+Forwards the hook name, arguments, stdin, cwd and environment to the warm
+server and relays its stdout, stderr and exit code, so a hook costs one
+bare interpreter start plus a socket round-trip instead of ``uv run``.
+
+When the server is not running the client starts it in the background for
+the next event and runs the hook directly this time, so events are never
+dropped. Set ``CLAUDE_HOOKD=0`` to always run hooks directly.
+
+A directly run hook goes through ``uv run --script``, exactly as before the
+server existed. The plain ``python3`` running this client may be too old for
+the hooks (system Python 3.9 on macOS) and lacks their PEP 723 dependencies
+(``python-dotenv``, so no ``.env`` keys).
+
+Stdlib only, with the fallback-path imports deferred — this file must start
+fast under a plain ``python3`` of any version.
+
+Usage (settings.json):
+    python3 ~/.claude/hooks/hook_client.py stop.py --notify
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+
+HOOKS_DIR = os.path.dirname(os.path.realpath(__file__))
+SOCKET_PATH = os.getenv("CLAUDE_HOOKD_SOCKET") or os.path.expanduser("~/.claude/data/hookd.sock")
+
+
+def _via_server(hook: str, args: list[str], stdin: str):
+    """Send one request to the server. Returns its response dict, or None if unreachable."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(SOCKET_PATH)
+    except OSError:
+        sock.close()
+        return None
+
+    request = {"hook": hook, "args": args, "stdin": stdin, "cwd": os.getcwd(), "env": dict(os.environ)}
+    with sock:
+        sock.sendall(json.dumps(request).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            chunks.append(data)
+    try:
+        return json.loads(b"".join(chunks))
+    except ValueError:
+        # Server child died mid-request; the hook may have run, so don't re-run it.
+        return {"exit": 0, "stdout": "", "stderr": ""}
+
+
+def _start_server() -> None:
+    """Launch the server detached, under ``uv`` when available so it gets its declared deps."""
+    import subprocess
+
+    server = os.path.join(HOOKS_DIR, "utils", "hook_server.py")
+    for cmd in (["uv", "run", "--script", server], [sys.executable, server]):
+        try:
+            subprocess.Popen(
+                [*cmd, "--socket", SOCKET_PATH],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            return
+        except OSError:
+            continue
+
+
+def _run_direct(hook: str, args: list[str], stdin: str) -> int:
+    """Run the hook under ``uv run --script`` (its own interpreter and deps) and return its exit code."""
+    import subprocess
+
+    script = os.path.join(HOOKS_DIR, hook)
+    for cmd in (["uv", "run", "--script", script], [sys.executable, script]):
+        try:
+            result = subprocess.run([*cmd, *args], input=stdin.encode("utf-8"))
+        except OSError:
+            continue
+        return result.returncode if result.returncode >= 0 else 1
+    return 0  # nothing could run it; never block Claude
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage: hook_client.py <hook.py> [args...]", file=sys.stderr)
+        sys.exit(0)  # never block Claude on a misconfigured hook
+
+    hook, args = sys.argv[1], sys.argv[2:]
+    stdin = sys.stdin.read()
+
+    if os.getenv("CLAUDE_HOOKD", "1") != "0":
+        response = _via_server(hook, args, stdin)
+        if response is not None and "error" not in response:
+            sys.stdout.write(response.get("stdout", ""))
+            sys.stderr.write(response.get("stderr", ""))
+            sys.exit(response.get("exit", 0))
+        if response is None:
+            _start_server()
+
+    sys.exit(_run_direct(hook, args, stdin))
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,8 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
-from utils.common import append_to_log, build_service
+from utils.common import append_to_log
+from utils.notify_worker import notify
 
 
 def main():
@@ -39,10 +40,10 @@ def main():
 
         # Log the event
         log_dir = os.path.join(os.path.expanduser("~"), ".claude", "logs")
-        append_to_log(os.path.join(log_dir, 'notification.json'), input_data)
+        append_to_log(os.path.join(log_dir, 'notification.jsonl'), input_data)
 
         if args.notify:
-            build_service().speak_notification(message=input_data.get('message'))
+            notify('notification', message=input_data.get('message'))
 
         sys.exit(0)
 
@@ -20,7 +20,8 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
-from utils.common import append_to_log, build_service, copy_transcript_to_chat
+from utils.common import append_to_log, copy_transcript_to_chat
+from utils.notify_worker import notify
 
 
 def main():
@@ -41,7 +42,7 @@ def main():
 
         # Log the event
         log_dir = os.path.join(os.path.expanduser("~"), ".claude", "logs")
-        append_to_log(os.path.join(log_dir, "stop.json"), input_data)
+        append_to_log(os.path.join(log_dir, "stop.jsonl"), input_data)
 
         # Handle --chat switch
         if args.chat and 'transcript_path' in input_data:
@@ -49,7 +50,7 @@ def main():
 
         # Announce completion via TTS (only if --notify flag is set)
         if args.notify:
-            build_service().speak_completion(transcript_path=input_data.get('transcript_path'))
+            notify('stop', transcript_path=input_data.get('transcript_path'))
 
         sys.exit(0)
 
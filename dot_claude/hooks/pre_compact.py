@@ -19,30 +19,14 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.event_store import append_event
+
 
 def log_pre_compact(input_data):
     """Log pre-compact event to logs directory."""
-    # Ensure logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'pre_compact.json'
-    
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
-    # Append the entire input data
-    log_data.append(input_data)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    append_event(Path("logs") / 'pre_compact.jsonl', input_data)
 
 
 def backup_transcript(transcript_path, trigger):
@@ -9,8 +9,11 @@
 import argparse
 import json
 import os
+import queue
 import sys
 import subprocess
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -20,30 +23,19 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.common import DEFAULT_ANNOUNCEMENT, SESSION_ANNOUNCEMENTS
+from utils.event_store import append_event
+from utils.git_state import git_state
+
+# Seconds the hook waits for weather, git, todos and issues together
+STARTUP_DEADLINE = 3.0
+
 
 def log_session_start(input_data):
     """Log session start event to logs directory."""
-    # Ensure logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'session_start.json'
-    
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
-    # Append the entire input data
-    log_data.append(input_data)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    append_event(Path("logs") / 'session_start.jsonl', input_data)
 
 
 def get_git_status():
@@ -54,37 +46,19 @@ def get_git_status():
     redirect git commands to the symlink's target so the count reflects
     real source-side work, not the structural HOME-vs-source-HEAD
     divergence (always ~200+ by design — chezmoi renames files on deploy).
+
+    Served by the cached ``git_state`` provider; the count covers changed
+    tracked files (untracked files are not scanned).
     """
     try:
         run_dir = Path.cwd()
         if run_dir == Path.home() and (run_dir / ".git").is_symlink():
             run_dir = (run_dir / ".git").resolve().parent
 
-        # Get current branch
-        branch_result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            cwd=str(run_dir),
-        )
-        current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
-
-        # Get uncommitted changes count
-        status_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            cwd=str(run_dir),
-        )
-        if status_result.returncode == 0:
-            changes = status_result.stdout.strip().split('\n') if status_result.stdout.strip() else []
-            uncommitted_count = len(changes)
-        else:
-            uncommitted_count = 0
-
-        return current_branch, uncommitted_count
+        state = git_state(run_dir)
+        if state is None:
+            return None, None
+        return state.branch, state.changes
     except Exception:
         return None, None
 
@@ -121,31 +95,34 @@ def get_recent_todos():
     return incomplete_count
 
 
-def build_morning_context(source: str) -> str:
-    """Build morning brief context for session start."""
+def build_morning_context(source: str, gathered: dict | None = None) -> str:
+    """Build morning brief context for session start.
+
+    ``gathered`` holds provider results from ``gather_context``; a provider
+    missing from it (too slow) leaves its line out.
+    """
     if source != "startup":
         return ""  # Only on fresh startup, not resume/clear
 
-    weather = get_weather()
-    branch, changes = get_git_status()
-    todos_count = get_recent_todos()
-
-    git_info = f"Branch: {branch}" if branch else "Not in git repo"
-    if changes and changes > 0:
-        git_info += f" | {changes} uncommitted files"
-
-    return f"""
-☀️ Session Started
+    if gathered is None:
+        gathered = {"weather": get_weather(), "git": get_git_status(), "todos": get_recent_todos()}
 
-Weather: {weather}
+    lines = ["", "☀️ Session Started", ""]
+    if "weather" in gathered:
+        lines += [f"Weather: {gathered['weather']}", ""]
 
-📋 Git Status:
-{git_info}
+    if "git" in gathered:
+        branch, changes = gathered["git"]
+        git_info = f"Branch: {branch}" if branch else "Not in git repo"
+        if changes and changes > 0:
+            git_info += f" | {changes} uncommitted files"
+        lines += ["📋 Git Status:", git_info, ""]
 
-✅ Pending Tasks: {todos_count} incomplete
+    if "todos" in gathered:
+        lines += [f"✅ Pending Tasks: {gathered['todos']} incomplete", ""]
 
-💡 Tip: Use /morning-brief for detailed briefing from executive-assistant
-"""
+    lines += ["💡 Tip: Use /morning-brief for detailed briefing from executive-assistant", ""]
+    return "\n".join(lines)
 
 
 def get_recent_issues():
@@ -170,8 +147,13 @@ def get_recent_issues():
     return None
 
 
-def load_development_context(source):
-    """Load relevant development context based on session source."""
+def load_development_context(source, gathered: dict | None = None):
+    """Load relevant development context based on session source.
+
+    Git and issues come from ``gathered`` when given (see ``gather_context``).
+    """
+    if gathered is None:
+        gathered = {"git": get_git_status(), "issues": get_recent_issues()}
     context_parts = []
     
     # Add timestamp
@@ -179,7 +161,7 @@ def load_development_context(source):
     context_parts.append(f"Session source: {source}")
     
     # Add git information
-    branch, changes = get_git_status()
+    branch, changes = gathered.get("git", (None, None))
     if branch:
         context_parts.append(f"Git branch: {branch}")
         if changes > 0:
@@ -205,7 +187,7 @@ def load_development_context(source):
                 pass
     
     # Add recent issues if available
-    issues = get_recent_issues()
+    issues = gathered.get("issues")
     if issues:
         context_parts.append("\n--- Recent GitHub Issues ---")
         context_parts.append(issues)
@@ -213,6 +195,62 @@ def load_development_context(source):
     return "\n".join(context_parts)
 
 
+def gather_context(providers: dict, deadline: float) -> dict:
+    """Run ``providers`` (name -> callable) concurrently and return the results ready by ``deadline``.
+
+    Session start used to run weather, git, todos and issues one after
+    another, up to ~20 s. Now they share one deadline. A provider that is
+    still running or that raised is left out. Its daemon thread is abandoned,
+    so it doesn't hold up the hook's exit.
+    """
+    results: queue.Queue = queue.Queue()
+    for name, provider in providers.items():
+        threading.Thread(target=_run_provider, args=(name, provider, results), daemon=True).start()
+
+    gathered = {}
+    pending = len(providers)
+    end = time.monotonic() + deadline
+    while pending:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            name, ok, value = results.get(timeout=remaining)
+        except queue.Empty:
+            break
+        pending -= 1
+        if ok:
+            gathered[name] = value
+    return gathered
+
+
+def _run_provider(name, provider, results):
+    try:
+        results.put((name, True, provider()))
+    except Exception:
+        results.put((name, False, None))
+
+
+def startup_deadline() -> float:
+    try:
+        return float(os.environ["CLAUDE_SESSION_START_DEADLINE"])
+    except (KeyError, ValueError):
+        return STARTUP_DEADLINE
+
+
+def startup_providers(source: str, load_context: bool) -> dict:
+    """The providers this session start needs; git status is shared by both contexts."""
+    providers = {}
+    if source == "startup":
+        providers["weather"] = get_weather
+        providers["todos"] = get_recent_todos
+    if source == "startup" or load_context:
+        providers["git"] = get_git_status
+    if load_context:
+        providers["issues"] = get_recent_issues
+    return providers
+
+
 def main():
     try:
         # Parse command line arguments
@@ -233,12 +271,18 @@ def main():
         # Log the session start event
         log_session_start(input_data)
 
+        # Run every provider at once under one deadline
+        gathered = gather_context(
+            startup_providers(source, args.load_context),
+            startup_deadline(),
+        )
+
         # Build morning context for output
-        morning_context = build_morning_context(source)
+        morning_context = build_morning_context(source, gathered)
 
         # Load development context if requested
         if args.load_context:
-            context = load_development_context(source)
+            context = load_development_context(source, gathered)
             if context:
                 # Combine morning context with development context
                 combined_context = morning_context + "\n\n" + context if morning_context else context
@@ -270,12 +314,7 @@ def main():
                 tts_script = script_dir / "utils" / "tts" / "pyttsx3_tts.py"
 
                 if tts_script.exists():
-                    messages = {
-                        "startup": "Claude Code session started",
-                        "resume": "Resuming previous session",
-                        "clear": "Starting fresh session"
-                    }
-                    message = messages.get(source, "Session started")
+                    message = SESSION_ANNOUNCEMENTS.get(source, DEFAULT_ANNOUNCEMENT)
 
                     subprocess.run(
                         ["uv", "run", str(tts_script), message],
@@ -19,30 +19,15 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.event_store import append_event
+from utils.phrase_pool import draw_agent_name
+
 
 def log_user_prompt(session_id, input_data):
     """Log user prompt to logs directory."""
-    # Ensure logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'user_prompt_submit.json'
-    
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
-    # Append the entire input data
-    log_data.append(input_data)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    append_event(Path("logs") / 'user_prompt_submit.jsonl', input_data)
 
 
 # Legacy function removed - now handled by manage_session_data
@@ -50,8 +35,6 @@ def log_user_prompt(session_id, input_data):
 
 def manage_session_data(session_id, prompt, name_agent=False):
     """Manage session data in the new JSON structure."""
-    import subprocess
-    
     # Ensure sessions directory exists
     sessions_dir = Path(".claude/data/sessions")
     sessions_dir.mkdir(parents=True, exist_ok=True)
@@ -71,42 +54,13 @@ def manage_session_data(session_id, prompt, name_agent=False):
     # Add the new prompt
     session_data["prompts"].append(prompt)
     
-    # Generate agent name if requested and not already present
+    # Name the agent from the pre-generated pool; a low pool refills in the
+    # background, so prompt submission never waits on an LLM.
     if name_agent and "agent_name" not in session_data:
-        # Try Ollama first (preferred)
         try:
-            result = subprocess.run(
-                ["uv", "run", ".claude/hooks/utils/llm/ollama.py", "--agent-name"],
-                capture_output=True,
-                text=True,
-                timeout=5  # Shorter timeout for local Ollama
-            )
-            
-            if result.returncode == 0 and result.stdout.strip():
-                agent_name = result.stdout.strip()
-                # Check if it's a valid name (not an error message)
-                if len(agent_name.split()) == 1 and agent_name.isalnum():
-                    session_data["agent_name"] = agent_name
-                else:
-                    raise Exception("Invalid name from Ollama")
+            session_data["agent_name"] = draw_agent_name()
         except Exception:
-            # Fall back to Anthropic if Ollama fails
-            try:
-                result = subprocess.run(
-                    ["uv", "run", ".claude/hooks/utils/llm/anth.py", "--agent-name"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    agent_name = result.stdout.strip()
-                    # Validate the name
-                    if len(agent_name.split()) == 1 and agent_name.isalnum():
-                        session_data["agent_name"] = agent_name
-            except Exception:
-                # If both fail, don't block the prompt
-                pass
+            pass
     
     # Save the updated session data
     try:
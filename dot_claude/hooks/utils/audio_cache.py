@@ -0,0 +1,191 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "python-dotenv",
+# ]
+# ///
+"""Content-addressed cache of synthesized speech for the TTS backends.
+
+The same few strings are spoken over and over — the fallback completion
+messages, "Your input is needed", the session announcements — and every
+cloud or neural backend re-synthesized them each time. TTS scripts now look
+up ``key(backend, voice, model, text)`` first and play a hit straight from
+disk; on a miss they store the encoded audio (MP3 from the cloud backends,
+WAV from Kokoro) after synthesis.
+
+Entries live in ``~/.claude/data/tts-cache/<sha256>.<ext>``. A hit refreshes
+the file's mtime, and ``store`` evicts least-recently-used files once the
+directory exceeds its byte budget (``CLAUDE_TTS_CACHE_MB``, default 64).
+
+Stdlib only: TTS scripts import it from their own uv environments.
+
+Usage:
+    ./audio_cache.py prewarm     # render every static phrase with each available backend
+    ./audio_cache.py stats
+    ./audio_cache.py clear
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path.home() / ".claude" / "data" / "tts-cache"
+DEFAULT_BUDGET_MB = 64
+
+
+def cache_key(backend: str, voice: str, model: str, text: str) -> str:
+    """Stable content address for one rendering of ``text``."""
+    material = "\0".join((backend, voice, model, text.strip()))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Encoded audio files keyed by ``cache_key``, bounded by ``max_bytes`` with LRU eviction."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None) -> None:
+        self.cache_dir = Path(cache_dir or os.getenv("CLAUDE_TTS_CACHE_DIR") or CACHE_DIR)
+        if max_bytes is None:
+            try:
+                max_bytes = int(float(os.getenv("CLAUDE_TTS_CACHE_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024)
+            except ValueError:
+                max_bytes = DEFAULT_BUDGET_MB * 1024 * 1024
+        self.max_bytes = max_bytes
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Path of the cached audio for ``key``, marked as recently used, or None."""
+        for path in self.cache_dir.glob(f"{key}.*"):
+            if path.name.endswith(".tmp"):
+                continue
+            with contextlib.suppress(OSError):
+                os.utime(path)
+                return path
+        return None
+
+    def store(self, key: str, data: bytes, ext: str) -> Optional[Path]:
+        """Write ``data`` atomically as ``<key>.<ext>`` and enforce the byte budget."""
+        if not data or self.max_bytes <= 0:
+            return None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / f"{key}.{ext}"
+            tmp = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            return None
+        self.evict()
+        return path if path.exists() else None
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob("*.*"):
+            if path.name.endswith(".tmp"):
+                continue
+            with contextlib.suppress(OSError):
+                st = path.stat()
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        """Delete least-recently-used entries until the cache fits its budget."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+                total -= size
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries), "budget": self.max_bytes}
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            with contextlib.suppress(OSError):
+                path.unlink()
+
+
+# Players for cached files, in preference order. afplay ships with macOS.
+_PLAYERS = (
+    ("afplay", []),
+    ("ffplay", ["-nodisp", "-autoexit", "-loglevel", "quiet"]),
+    ("mpv", ["--no-video", "--really-quiet"]),
+    ("paplay", []),
+    ("aplay", ["-q"]),
+)
+
+
+def play_file(path: Path, timeout: float = 60) -> bool:
+    """Play an encoded audio file with the first available system player."""
+    for player, flags in _PLAYERS:
+        if player in ("paplay", "aplay") and Path(path).suffix != ".wav":
+            continue
+        exe = shutil.which(player)
+        if not exe:
+            continue
+        try:
+            return subprocess.run([exe, *flags, str(path)], capture_output=True, timeout=timeout).returncode == 0
+        except (subprocess.TimeoutExpired, OSError):
+            return False
+    return False
+
+
+def play_cached(cache: AudioCache, key: str) -> bool:
+    """Play the cached audio for ``key``. False on a miss or when nothing can play it."""
+    path = cache.lookup(key)
+    return path is not None and play_file(path)
+
+
+def prewarm() -> dict[str, int]:
+    """Render every static phrase with each available caching backend.
+
+    Each backend script is run once under ``uv`` with ``--render``, which
+    synthesizes into the cache without playing. Returns phrases per backend.
+    """
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from utils.common import Backend, build_service, static_phrases
+
+    phrases = static_phrases()
+    rendered = {}
+    for backend in build_service(mode="tts").tts_backends:
+        if backend.name == "pyttsx3" or not backend.is_available():
+            continue  # macOS say is instant; nothing to cache
+        runner = Backend(backend.name, backend.script, backend.env_key, timeout=max(120, 30 * len(phrases)))
+        if runner.run("--render", *phrases) is not None:
+            rendered[backend.name] = len(phrases)
+    return rendered
+
+
+def main() -> None:
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # dotenv is optional
+
+    parser = argparse.ArgumentParser(description="TTS audio cache")
+    parser.add_argument("command", choices=("prewarm", "stats", "clear"))
+    args = parser.parse_args()
+
+    if args.command == "prewarm":
+        for name, count in prewarm().items():
+            print(f"{name}: {count} phrases")
+    elif args.command == "stats":
+        print(AudioCache().stats())
+    else:
+        AudioCache().clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Play raw PCM as it arrives from the network, through a bounded jitter buffer.
+
+A reader thread pulls chunks from the HTTP response into ``JitterBuffer``;
+playback starts once ``prebuffer`` seconds of audio are queued (or the
+response ends) instead of after the whole clip has downloaded. The buffer
+holds at most ``capacity`` seconds, so a fast network blocks the reader
+rather than growing memory. If the network falls behind and the buffer runs
+dry mid-clip, playback pauses until ``prebuffer`` is queued again rather than
+stuttering on every late chunk.
+
+Stdlib only; ``sounddevice`` is imported when the default sink is opened.
+"""
+
+import io
+import threading
+import wave
+from typing import Callable, Iterable, Optional
+
+SAMPLE_WIDTH = 2  # 16-bit signed little-endian, mono
+
+
+class JitterBuffer:
+    """Thread-safe byte FIFO bounded by ``capacity`` bytes."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._chunks = bytearray()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._chunks)
+
+    @property
+    def closed(self) -> bool:
+        with self._cond:
+            return self._closed
+
+    def put(self, data: bytes) -> None:
+        """Append ``data``, blocking while the buffer is full."""
+        with self._cond:
+            while len(self._chunks) >= self.capacity and not self._closed:
+                self._cond.wait()
+            if not self._closed:
+                self._chunks.extend(data)
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """Mark the end of input; readers drain what is left."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def wait_for(self, nbytes: int, timeout: Optional[float] = None) -> bool:
+        """Block until ``nbytes`` are queued or input has ended. False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self._chunks) >= nbytes or self._closed, timeout)
+
+    def take(self, max_bytes: int) -> bytes:
+        """Remove and return up to ``max_bytes`` without blocking."""
+        with self._cond:
+            data = bytes(self._chunks[:max_bytes])
+            del self._chunks[:max_bytes]
+            self._cond.notify_all()
+            return data
+
+
+def _sound_device(sample_rate: int):
+    import sounddevice as sd
+
+    return sd.RawOutputStream(samplerate=sample_rate, channels=1, dtype="int16")
+
+
+def play_stream(
+    chunks: Iterable[bytes],
+    sample_rate: int,
+    prebuffer: float = 0.15,
+    capacity: float = 2.0,
+    sink_factory: Optional[Callable] = None,
+) -> bytes:
+    """Play 16-bit mono PCM ``chunks`` while they download. Returns the full clip.
+
+    Raises whatever the chunk iterator raised, after playing what did arrive.
+    ``sink_factory(sample_rate)`` returns a context manager with ``write``;
+    it defaults to a ``sounddevice`` raw output stream.
+    """
+    bytes_per_second = sample_rate * SAMPLE_WIDTH
+    start_at = max(SAMPLE_WIDTH, int(prebuffer * bytes_per_second))
+    buf = JitterBuffer(max(start_at, int(capacity * bytes_per_second)))
+    received = []
+    errors = []
+
+    def read() -> None:
+        try:
+            for chunk in chunks:
+                if chunk:
+                    received.append(chunk)
+                    buf.put(chunk)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            buf.close()
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+
+    # Write in ~20 ms blocks so a late chunk is noticed before the device drains.
+    block = max(SAMPLE_WIDTH, (bytes_per_second // 50) // SAMPLE_WIDTH * SAMPLE_WIDTH)
+    try:
+        buf.wait_for(start_at)
+        if len(buf):
+            with (sink_factory or _sound_device)(sample_rate) as sink:
+                pending = b""
+                while True:
+                    if not len(buf):
+                        if buf.closed:
+                            break
+                        buf.wait_for(start_at)  # underrun: rebuffer before resuming
+                        continue
+                    data = pending + buf.take(block)
+                    whole = len(data) - len(data) % SAMPLE_WIDTH
+                    pending = data[whole:]
+                    if whole:
+                        sink.write(data[:whole])
+    finally:
+        buf.close()  # unblock the reader if the sound device failed
+
+    reader.join()
+    if errors:
+        raise errors[0]
+    return b"".join(received)
+
+
+def to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap 16-bit mono PCM in a WAV container, e.g. for the audio cache."""
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(SAMPLE_WIDTH)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+    return out.getvalue()
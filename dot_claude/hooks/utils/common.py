@@ -1,19 +1,36 @@
 """Common utilities for Claude Code hook notification system.
 
-Provides Backend, TranscriptParser, NotificationService, and log helpers
+Provides Backend, InProcessBackend, TranscriptParser, TranscriptCache, BackendHealth, MessageCache, Budget, NotificationService, and log helpers
 to eliminate duplicated logic across stop.py, notification.py, and
 subagent_stop.py hook scripts.
 """
 
+import contextlib
+import fcntl
+import hashlib
+import importlib.util
+import io
 import json
+import math
 import os
+import queue
 import random
+import re
+import select
+import signal
+import sqlite3
 import subprocess
-from collections import deque
-from dataclasses import dataclass
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import ModuleType
 from typing import Optional
 
+from utils.event_store import append_event
+from utils.phrase_pool import AnnouncementPool
+
 MODE_FILE = Path.home() / ".claude" / "data" / "notify-mode"
 # SYNC REQUIRED: these mode values must match MODES in ~/.local/bin/claude-notify.
 # The CLI is a standalone script that cannot import from this library.
@@ -41,6 +58,27 @@ FALLBACK_MESSAGES = [
     "Ready for next task!",
 ]
 
+_INPUT_NEEDED = "Your input is needed"
+
+# Spoken by session_start.py --announce, keyed by session source
+SESSION_ANNOUNCEMENTS = {
+    "startup": "Claude Code session started",
+    "resume": "Resuming previous session",
+    "clear": "Starting fresh session",
+}
+DEFAULT_ANNOUNCEMENT = "Session started"
+
+
+def static_phrases() -> list[str]:
+    """Every fixed string the hooks speak; ``audio_cache.py prewarm`` renders these ahead of time."""
+    phrases = [*FALLBACK_MESSAGES, _INPUT_NEEDED]
+    engineer_name = os.getenv("ENGINEER_NAME", "").strip()
+    if engineer_name:
+        phrases.append(f"{engineer_name}, your input is needed")
+    phrases += [*SESSION_ANNOUNCEMENTS.values(), DEFAULT_ANNOUNCEMENT]
+    return list(dict.fromkeys(phrases))
+
+
 _GENERIC_NOTIFICATION = "Claude is waiting for your input"
 _MAX_SPOKEN_CHARS = 200
 
@@ -68,21 +106,22 @@ class Backend:
             return False
         return True
 
-    def run(self, *args: str) -> Optional[str]:
+    def run(self, *args: str, timeout: Optional[float] = None) -> Optional[str]:
         """Execute the backend script and return stdout on success, or None on failure.
 
         Returns the stripped stdout string on exit code 0, which may be empty
         for TTS backends (they produce audio, not text output). Returns None on
         non-zero exit, timeout, or missing executable. Callers distinguish
         success from failure with ``is not None``; LLM callers additionally
-        check truthiness to detect empty responses.
+        check truthiness to detect empty responses. ``timeout`` overrides the
+        backend's own (e.g. to fit a notification ``Budget``).
         """
         try:
             result = subprocess.run(
                 ["uv", "run", str(self.script), *args],
                 capture_output=True,
                 text=True,
-                timeout=self.timeout,
+                timeout=self.timeout if timeout is None else timeout,
             )
             if result.returncode == 0:
                 return result.stdout.strip()  # "" for TTS backends, text for LLM backends
@@ -90,6 +129,203 @@ class Backend:
             pass
         return None
 
+    def spawn(self, *args: str) -> Optional[subprocess.Popen]:
+        """Start the backend script without waiting; pair with ``collect``/``cancel``.
+
+        The script runs in its own process group so ``cancel`` also stops the
+        interpreter ``uv`` launches and anything it spawns (e.g. ``claude -p``).
+        """
+        try:
+            return subprocess.Popen(
+                ["uv", "run", str(self.script), *args],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                start_new_session=True,
+            )
+        except (FileNotFoundError, OSError, subprocess.SubprocessError):
+            return None
+
+    def collect(self, proc: subprocess.Popen) -> Optional[str]:
+        """Wait up to ``timeout`` for a spawned run; same return contract as ``run``."""
+        try:
+            stdout, _ = proc.communicate(timeout=self.timeout)
+            if proc.returncode == 0:
+                return (stdout or "").strip()
+        except subprocess.TimeoutExpired:
+            self.cancel(proc)
+        except (OSError, ValueError, subprocess.SubprocessError):
+            pass
+        return None
+
+    @staticmethod
+    def cancel(proc: subprocess.Popen) -> None:
+        """Terminate a spawned run and its process group if it is still running."""
+        if proc.poll() is not None:
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+_PLUGINS: dict[str, Optional[ModuleType]] = {}
+
+
+def load_plugin(script: Path) -> Optional[ModuleType]:
+    """Import a backend script as a module, once per process.
+
+    Returns None when the import fails, typically because a package the
+    script imports at the top is missing from this interpreter; callers then
+    fall back to running the script under ``uv``. Scripts that import heavy
+    dependencies lazily (``kokoro_tts.py``) still load, and a missing package
+    surfaces as ``ImportError`` from the entry call instead.
+    """
+    key = str(script)
+    if key not in _PLUGINS:
+        module = None
+        try:
+            spec = importlib.util.spec_from_file_location(
+                f"_backend_{Path(script).parent.name}_{Path(script).stem}", script
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception:
+            module = None
+        _PLUGINS[key] = module
+    return _PLUGINS[key]
+
+
+@dataclass
+class InProcessBackend(Backend):
+    """A backend whose script is imported and called in this process.
+
+    ``entry`` names the function to call. ``generate_completion_message``
+    receives ``context=`` from ``--completion [--context C]``; any other
+    entry (e.g. a TTS script's ``speak(text)``) is called with the run
+    arguments and succeeds unless it raises. The script is loaded lazily via
+    ``load_plugin``; when it cannot be loaded, ``run`` falls back to
+    ``uv run`` exactly like a plain ``Backend``, as do ``spawn``-based races.
+
+    ``isolate=True`` makes the call in a forked child of this (already warm)
+    process, so a crash or a hung audio device cannot take the hook down.
+    Other calls run on a daemon thread so they keep this process's pooled
+    HTTP connections. Either way the caller waits at most ``timeout``
+    (the run's, else ``Backend.timeout``); a thread that overruns it cannot be
+    interrupted and is abandoned.
+
+    The result is the entry's return value. Whatever the entry prints is not
+    captured: a forked child discards its stdout, and a threaded call leaves
+    ``sys.stdout`` alone because swapping it would swallow the other threads'
+    output too.
+
+    The fork happens while other threads run (``_deliver`` plays speech and
+    shows the visual notification at once), so the child may inherit a lock
+    some other thread held. The child only touches state that is safe: the
+    interpreter reinitializes its own locks after ``fork``, ``http_clients``
+    drops the parent's connection pool, and ``sys.stdout``/``sys.stderr`` are
+    replaced by fresh objects instead of the parent's buffered writers. Any
+    other inherited lock can only hang the child, and the parent kills the
+    child's process group at the deadline, so the hook never waits longer
+    than ``timeout``.
+    """
+
+    entry: str = "speak"
+    isolate: bool = False
+
+    def _function(self):
+        module = load_plugin(self.script)
+        return getattr(module, self.entry, None) if module else None
+
+    def _call(self, fn, args: tuple[str, ...]) -> Optional[str]:
+        if self.entry == "generate_completion_message":
+            context = args[args.index("--context") + 1] if "--context" in args[:-1] else None
+            result = fn(context=context)
+            return result.strip() if result else None
+        result = fn(*args)
+        return "" if result is None else str(result).strip()
+
+    def _call_forked(self, fn, args: tuple[str, ...], timeout: float) -> Optional[str]:
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            os.setpgid(0, 0)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            sys.stdout = io.StringIO()
+            sys.stderr = open(2, "w", buffering=1, closefd=False)
+            try:
+                payload = json.dumps({"result": self._call(fn, args)})
+            except ImportError:
+                payload = json.dumps({"import_error": True})
+            except BaseException:
+                payload = "{}"
+            os.write(w, payload.encode("utf-8"))
+            with contextlib.suppress(Exception):
+                sys.stderr.flush()
+            os._exit(0)
+
+        os.close(w)
+        chunks = []
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                ready, _, _ = select.select([r], [], [], max(0.0, deadline - time.monotonic()))
+                if not ready:
+                    with contextlib.suppress(ProcessLookupError, PermissionError):
+                        os.killpg(pid, signal.SIGKILL)
+                    return None
+                data = os.read(r, 65536)
+                if not data:
+                    break
+                chunks.append(data)
+        finally:
+            os.close(r)
+            with contextlib.suppress(ChildProcessError):
+                os.waitpid(pid, 0)
+        try:
+            reply = json.loads(b"".join(chunks) or b"{}")
+        except ValueError:
+            return None
+        if reply.get("import_error"):
+            raise ImportError(self.entry)
+        return reply.get("result")
+
+    def _call_threaded(self, fn, args: tuple[str, ...], timeout: float) -> Optional[str]:
+        outcome: queue.Queue = queue.Queue(maxsize=1)
+
+        def target() -> None:
+            try:
+                outcome.put((self._call(fn, args), None))
+            except BaseException as e:
+                outcome.put((None, e))
+
+        threading.Thread(target=target, daemon=True).start()
+        try:
+            result, error = outcome.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if error is not None:
+            raise error
+        return result
+
+    def run(self, *args: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Call the entry function, or run the script under ``uv`` if it can't be loaded here."""
+        fn = self._function()
+        if fn is None:
+            return super().run(*args, timeout=timeout)
+        limit = self.timeout if timeout is None else timeout
+        try:
+            if self.isolate:
+                return self._call_forked(fn, args, limit)
+            return self._call_threaded(fn, args, limit)
+        except ImportError:
+            # An optional extra (e.g. openai[voice_helpers]) is missing here; uv installs it.
+            _PLUGINS[str(self.script)] = None
+            return super().run(*args, timeout=timeout)
+        except (Exception, SystemExit):
+            return None
+
 
 def _shorten_path(path: str) -> str:
     """Shorten an absolute path to ~/last/two/parts for readability."""
@@ -99,17 +335,13 @@ def _shorten_path(path: str) -> str:
 
 
 def append_to_log(log_path: str, data: dict) -> None:
-    """Append data to a JSON array log file, creating it if needed."""
+    """Append data as one JSON line to a JSONL log file, creating it if needed.
+
+    The log rotates into compressed segments per its event type's
+    ``RotationPolicy`` (see ``utils/event_store.py``).
+    """
     try:
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        try:
-            with open(log_path, "r") as f:
-                log_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError, ValueError):
-            log_data = []
-        log_data.append(data)
-        with open(log_path, "w") as f:
-            json.dump(log_data, f, indent=2)
+        append_event(log_path, data)
     except Exception:
         pass
 
@@ -133,6 +365,162 @@ def copy_transcript_to_chat(transcript_path: str, log_dir: str) -> None:
         pass
 
 
+def _decode_line(raw: bytes) -> Optional[dict]:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def _tail_jsonl(
+    path: str, max_entries: int, block_size: int = 64 * 1024, end: Optional[int] = None
+) -> list[dict]:
+    """Decode the last ``max_entries`` valid JSON lines of a file, reading backwards from EOF.
+
+    Blocks are read from the end (or from byte ``end``) until enough complete
+    lines have decoded; a line spanning several blocks is reassembled once
+    its start is found. Blank and undecodable lines are skipped and do not count.
+    """
+    entries: list[dict] = []
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END) if end is None else end
+        pending: list[bytes] = []  # pieces of the earliest, still-incomplete line, last piece first
+        while pos > 0 and len(entries) < max_entries:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = f.read(step).split(b"\n")
+            if len(lines) == 1:
+                pending.append(lines[0])
+                continue
+            lines[-1] += b"".join(reversed(pending))
+            pending = [lines[0]]
+            for raw in reversed(lines[1:]):
+                entry = _decode_line(raw)
+                if entry is not None:
+                    entries.append(entry)
+                    if len(entries) == max_entries:
+                        break
+        if pos == 0 and len(entries) < max_entries:
+            entry = _decode_line(b"".join(reversed(pending)))
+            if entry is not None:
+                entries.append(entry)
+    entries.reverse()
+    return entries
+
+
+_MAX_ACTIONS = 8
+
+
+def _digest(entry: dict) -> list[list]:
+    """Reduce one transcript entry to the updates ``TranscriptSummary.apply`` makes, in order.
+
+    An update is ``["user", text]``, ``["text", text]``, ``["action", key,
+    label]`` or ``["agent", label]``. Digests are small and JSON-safe, so a
+    window of them can be persisted and re-applied instead of the entries.
+    """
+    updates: list[list] = []
+    etype = entry.get("type")
+
+    if etype == "user" and not entry.get("toolUseResult"):
+        content = entry.get("message", {}).get("content", "")
+        if isinstance(content, str) and content.strip():
+            updates.append(["user", content.strip()[:200]])
+        elif isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict) and block.get("type") == "text":
+                    text = block.get("text", "").strip()
+                    if text:
+                        updates.append(["user", text[:200]])
+
+    elif etype == "assistant":
+        for block in entry.get("message", {}).get("content", []):
+            if not isinstance(block, dict):
+                continue
+            btype = block.get("type")
+
+            if btype == "text":
+                text = block.get("text", "").strip()
+                if text:
+                    updates.append(["text", text[:300]])
+
+            elif btype == "tool_use":
+                name = block.get("name", "")
+                inp = block.get("input", {})
+
+                if name in ("Edit", "Write", "Read", "MultiEdit"):
+                    short = _shorten_path(inp.get("file_path", ""))
+                    updates.append(["action", f"{name}:{short}", f"{name} {short}"])
+
+                elif name == "Bash":
+                    cmd = inp.get("command", "").split("\n")[0].strip()[:60]
+                    updates.append(["action", f"Bash:{cmd[:30]}", f"Bash({cmd})"])
+
+                elif name == "Agent":
+                    desc = inp.get("description", "")[:60]
+                    updates.append(["agent", f"Agent({desc})"])
+
+                elif name in ("Glob", "Grep", "WebFetch", "WebSearch"):
+                    updates.append(["action", name, name])
+    return updates
+
+
+@dataclass
+class TranscriptSummary:
+    """Rolling Request/Actions/Outcome state folded from transcript entries.
+
+    ``fold`` consumes entries in order; ``render`` formats the summary. A
+    repeated action moves to the end instead of being re-listed, so folding
+    more history never hides recent work.
+    """
+
+    last_user_message: Optional[str] = None
+    last_assistant_text: Optional[str] = None
+    actions: dict[str, str] = field(default_factory=dict)  # dedup key -> label, oldest first
+    agent_count: int = 0
+
+    def _add_action(self, key: str, label: str) -> None:
+        self.actions.pop(key, None)
+        self.actions[key] = label
+        while len(self.actions) > _MAX_ACTIONS:
+            del self.actions[next(iter(self.actions))]
+
+    def fold(self, entry: dict) -> None:
+        """Update the summary with one transcript entry."""
+        self.apply(_digest(entry))
+
+    def apply(self, updates: list[list]) -> None:
+        """Update the summary with one entry's ``_digest``."""
+        for update in updates:
+            kind = update[0]
+            if kind == "user":
+                self.last_user_message = update[1]
+            elif kind == "text":
+                self.last_assistant_text = update[1]
+            elif kind == "agent":
+                self.agent_count += 1
+                self._add_action(f"Agent#{self.agent_count}", update[1])
+            else:
+                self._add_action(update[1], update[2])
+
+    def render(self) -> Optional[str]:
+        """Return the formatted summary (max 800 chars), or None when empty."""
+        parts: list[str] = []
+        if self.last_user_message:
+            parts.append(f"Request: {self.last_user_message}")
+        if self.actions:
+            parts.append(f"Actions: {', '.join(self.actions.values())}")
+        if self.last_assistant_text:
+            parts.append(f"Outcome: {self.last_assistant_text}")
+
+        if not parts:
+            return None
+        return "\n".join(parts)[:800]
+
+
 class TranscriptParser:
     """Parses Claude Code JSONL transcripts into a context summary.
 
@@ -144,102 +532,479 @@ class TranscriptParser:
 
     @staticmethod
     def parse(transcript_path: Optional[str], max_entries: int = 60) -> Optional[str]:
-        """Parse a transcript file and return a context summary string, or None."""
+        """Parse a transcript file and return a context summary string, or None.
+
+        Only the last ``max_entries`` entries are read (seeking back from EOF),
+        so cost is independent of transcript length.
+        """
         if not transcript_path:
             return None
 
         try:
-            recent: deque[dict] = deque(maxlen=max_entries)
-            with open(transcript_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            recent.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            pass
-
-            if not recent:
-                return None
-
-            last_user_message: Optional[str] = None
-            tool_actions: list[str] = []
-            seen_action_keys: set[str] = set()
-            last_assistant_text: Optional[str] = None
-
-            for entry in recent:
-                etype = entry.get("type")
-
-                if etype == "user" and not entry.get("toolUseResult"):
-                    content = entry.get("message", {}).get("content", "")
-                    if isinstance(content, str) and content.strip():
-                        last_user_message = content.strip()[:200]
-                    elif isinstance(content, list):
-                        for block in content:
-                            if isinstance(block, dict) and block.get("type") == "text":
-                                text = block.get("text", "").strip()
-                                if text:
-                                    last_user_message = text[:200]
-
-                elif etype == "assistant":
-                    for block in entry.get("message", {}).get("content", []):
-                        if not isinstance(block, dict):
-                            continue
-                        btype = block.get("type")
-
-                        if btype == "text":
-                            text = block.get("text", "").strip()
-                            if text:
-                                last_assistant_text = text[:300]
-
-                        elif btype == "tool_use":
-                            name = block.get("name", "")
-                            inp = block.get("input", {})
-
-                            if name in ("Edit", "Write", "Read", "MultiEdit"):
-                                short = _shorten_path(inp.get("file_path", ""))
-                                key = f"{name}:{short}"
-                                if key not in seen_action_keys:
-                                    seen_action_keys.add(key)
-                                    tool_actions.append(f"{name} {short}")
-
-                            elif name == "Bash":
-                                cmd = inp.get("command", "").split("\n")[0].strip()[:60]
-                                key = f"Bash:{cmd[:30]}"
-                                if key not in seen_action_keys:
-                                    seen_action_keys.add(key)
-                                    tool_actions.append(f"Bash({cmd})")
-
-                            elif name == "Agent":
-                                desc = inp.get("description", "")[:60]
-                                tool_actions.append(f"Agent({desc})")
-
-                            elif name in ("Glob", "Grep", "WebFetch", "WebSearch"):
-                                if name not in seen_action_keys:
-                                    seen_action_keys.add(name)
-                                    tool_actions.append(name)
-
-            parts: list[str] = []
-            if last_user_message:
-                parts.append(f"Request: {last_user_message}")
-            if tool_actions:
-                parts.append(f"Actions: {', '.join(tool_actions[-8:])}")
-            if last_assistant_text:
-                parts.append(f"Outcome: {last_assistant_text}")
-
-            if not parts:
-                return None
-            return "\n".join(parts)[:800]
+            summary = TranscriptSummary()
+            for entry in _tail_jsonl(transcript_path, max_entries):
+                summary.fold(entry)
+            return summary.render()
+        except Exception:
+            return None
+
+
+def _complete_offset(path: str, size: int, block_size: int = 64 * 1024) -> int:
+    """Return the byte offset just past the last newline at or before ``size``."""
+    with open(path, "rb") as f:
+        pos = size
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            nl = f.read(step).rfind(b"\n")
+            if nl != -1:
+                return pos + nl + 1
+    return 0
+
+
+@contextlib.contextmanager
+def _flocked(lock_file: Path):
+    """Hold an exclusive ``flock`` on ``lock_file``, creating it and its directory as needed.
+
+    If the lock file cannot be opened the body runs unlocked: a lost update
+    to a cache or statistics file is better than no update at all.
+    """
+    try:
+        lock_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        fd = None
+    try:
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+TRANSCRIPT_CACHE_FILE = Path.home() / ".claude" / "data" / "transcript-cache.json"
+
+
+class TranscriptCache:
+    """Persisted per-transcript summaries, updated only with lines appended since the last call.
+
+    Stop, SubagentStop and Notification fire repeatedly against the same
+    transcript. Each cached entry stores the ``_digest`` of the last
+    ``max_entries`` transcript entries and the byte offset they cover; the
+    next call decodes only the bytes after that offset, slides the window,
+    and re-applies it, so once the last line is complete the summary matches
+    ``TranscriptParser.parse``.
+    A transcript that shrank, was replaced, or grew by more than
+    ``max_delta`` bytes is re-summarised from its tail instead.
+
+    Entries are evicted least-recently-used beyond ``max_transcripts`` and
+    when the transcript is gone or untouched for ``max_age`` seconds. Each
+    load-update-save holds an ``flock`` on ``<file>.lock``, so hooks firing
+    together don't drop each other's entries.
+    """
+
+    def __init__(
+        self,
+        cache_file: Path = TRANSCRIPT_CACHE_FILE,
+        max_entries: int = 60,
+        max_transcripts: int = 64,
+        max_age: float = 7 * 86400,
+        max_delta: int = 4 * 1024 * 1024,
+    ) -> None:
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.max_transcripts = max_transcripts
+        self.max_age = max_age
+        self.max_delta = max_delta
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.cache_file.read_text())
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError, ValueError, OSError):
+            return {}
+
+    def _save(self, cache: dict) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(cache, separators=(",", ":")))
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            pass
 
+    def _evict(self, cache: dict, now: float) -> None:
+        for path in list(cache):
+            try:
+                stale = now - os.stat(path).st_mtime > self.max_age
+            except OSError:
+                stale = True
+            if stale:
+                del cache[path]
+        for path in sorted(cache, key=lambda p: cache[p].get("used", 0))[: max(0, len(cache) - self.max_transcripts)]:
+            del cache[path]
+
+    def _cold(self, path: str, size: int) -> tuple[int, list]:
+        # A partially written last line is left for the next incremental update, not digested twice
+        offset = _complete_offset(path, size)
+        return offset, [_digest(entry) for entry in _tail_jsonl(path, self.max_entries, end=offset)]
+
+    def _cached(self, entry: Optional[dict], st: os.stat_result) -> Optional[tuple[int, list]]:
+        if not entry or entry.get("ino") != st.st_ino:
+            return None
+        offset, window = entry.get("offset"), entry.get("window")
+        if not isinstance(offset, int) or not isinstance(window, list):
+            return None
+        if offset > st.st_size or st.st_size - offset > self.max_delta:
+            return None
+        return offset, window
+
+    def summarize(self, transcript_path: Optional[str]) -> Optional[str]:
+        """Return the context summary for a transcript, updating the cache."""
+        if not transcript_path:
+            return None
+        try:
+            path = os.path.abspath(transcript_path)
+            st = os.stat(path)
+            with _flocked(self.cache_file.with_name(self.cache_file.name + ".lock")):
+                cache = self._load()
+                cached = self._cached(cache.get(path), st)
+
+                if cached is None:
+                    offset, window = self._cold(path, st.st_size)
+                else:
+                    offset, window = cached
+                    if offset < st.st_size:
+                        with open(path, "rb") as f:
+                            f.seek(offset)
+                            data = f.read(st.st_size - offset)
+                        end = data.rfind(b"\n") + 1  # leave a partially written last line for next time
+                        for raw in data[:end].split(b"\n"):
+                            entry = _decode_line(raw)
+                            if entry is not None:
+                                window.append(_digest(entry))
+                        offset += end
+                window = window[-self.max_entries:]  # the same entries TranscriptParser.parse reads
+
+                now = time.time()
+                cache[path] = {"ino": st.st_ino, "used": now, "offset": offset, "window": window}
+                self._evict(cache, now)
+                self._save(cache)
+
+            summary = TranscriptSummary()
+            for updates in window:
+                summary.apply(updates)
+            return summary.render()
         except Exception:
             return None
 
 
+HEALTH_FILE = Path.home() / ".claude" / "data" / "backend-health.json"
+
+
+class BackendHealth:
+    """Persisted per-backend run statistics with a circuit breaker.
+
+    Every run is recorded with its outcome and wall time. After
+    ``failure_threshold`` consecutive failures a backend's circuit opens and
+    ``allow`` rejects it for ``cooldown`` seconds, so a dead Ollama or a
+    rate-limited ElevenLabs stops costing its full timeout on every event.
+    Once the cooldown passes, one caller gets through as a half-open probe:
+    success closes the circuit, failure keeps it open for another cooldown.
+
+    Backends are keyed by script directory and name (``tts/openai``,
+    ``llm/openai``) because TTS and LLM backends share names. Every
+    read-modify-write of the table holds an ``flock`` on ``<file>.lock``, so
+    concurrent hooks and workers don't overwrite each other's counts.
+    """
+
+    def __init__(
+        self,
+        health_file: Path = HEALTH_FILE,
+        failure_threshold: int = 3,
+        cooldown: float = 300.0,
+        max_samples: int = 32,
+    ) -> None:
+        self.health_file = health_file
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(backend: Backend) -> str:
+        return f"{Path(backend.script).parent.name}/{backend.name}"
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the thread lock and an exclusive flock on the table's lock file."""
+        with self._lock, _flocked(self.health_file.with_name(self.health_file.name + ".lock")):
+            yield
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.health_file.read_text())
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError, ValueError, OSError):
+            return {}
+
+    def _save(self, table: dict) -> None:
+        try:
+            self.health_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.health_file.with_name(f"{self.health_file.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(table, separators=(",", ":")))
+            os.replace(tmp, self.health_file)
+        except OSError:
+            pass
+
+    def snapshot(self) -> dict:
+        """The whole table, keyed by ``key(backend)``."""
+        return self._load()
+
+    def stats(self, backend: Backend) -> dict:
+        """The recorded entry for ``backend`` (empty if it has never run)."""
+        return self._load().get(self.key(backend), {})
+
+    def typical(self, backend: Backend, min_samples: int = 3) -> Optional[float]:
+        """Median wall time of ``backend``'s recent successful runs, if there are enough."""
+        times = [t for t, ok in self.stats(backend).get("samples", []) if ok]
+        return _percentile(times, 0.5) if len(times) >= min_samples else None
+
+    def state(self, backend: Backend, now: Optional[float] = None) -> str:
+        """``closed``, ``open`` or ``half-open`` (cooldown over, next call is a probe)."""
+        entry = self.stats(backend)
+        if entry.get("consecutive_failures", 0) < self.failure_threshold:
+            return "closed"
+        now = time.time() if now is None else now
+        return "half-open" if now - entry.get("opened_at", 0) >= self.cooldown else "open"
+
+    def allow(self, backend: Backend) -> bool:
+        """Whether ``backend`` may run now. Claims the probe when the circuit is half-open.
+
+        Call it only right before running the backend: a claimed probe that
+        is never run leaves the circuit open for another cooldown.
+        """
+        with self._locked():
+            table = self._load()
+            entry = table.get(self.key(backend), {})
+            if entry.get("consecutive_failures", 0) < self.failure_threshold:
+                return True
+            now = time.time()
+            if now - entry.get("opened_at", 0) < self.cooldown:
+                return False
+            entry["opened_at"] = now  # other callers stay out while the probe runs
+            self._save(table)
+            return True
+
+    def record(self, backend: Backend, ok: bool, elapsed: float) -> None:
+        """Record one run's outcome and wall time, opening or closing the circuit."""
+        with self._locked():
+            table = self._load()
+            entry = table.setdefault(self.key(backend), {})
+            now = time.time()
+            if ok:
+                entry["successes"] = entry.get("successes", 0) + 1
+                entry["consecutive_failures"] = 0
+                entry.pop("opened_at", None)
+            else:
+                entry["failures"] = entry.get("failures", 0) + 1
+                entry["consecutive_failures"] = entry.get("consecutive_failures", 0) + 1
+                if entry["consecutive_failures"] >= self.failure_threshold:
+                    entry["opened_at"] = now
+            samples = entry.get("samples", [])
+            samples.append([round(elapsed, 3), int(ok)])
+            entry["samples"] = samples[-self.max_samples:]
+            entry["last_run"] = now
+            self._save(table)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+def rank_backends(
+    backends: list[Backend],
+    health: BackendHealth,
+    pinned: tuple[str, ...] | list[str] = (),
+    min_samples: int = 3,
+    tie_window: float = 0.25,
+) -> list[Backend]:
+    """Order ``backends`` by observed cost, fastest reliable backend first.
+
+    A backend's cost is the mean of its rolling p50 and p95 run time divided
+    by its success rate, i.e. the expected wait for a usable result. Backends
+    with at least ``min_samples`` runs and a success rate of 50% or more come
+    first, by cost. Backends with too few samples come next, then mostly
+    failing ones. Costs within the same ``tie_window`` seconds count as a tie.
+    Ties go to ``pinned`` names (``openai`` or ``tts/openai``), then to the
+    configured order.
+    """
+    table = health.snapshot()
+
+    def sort_key(item: tuple[int, Backend]) -> tuple:
+        index, backend = item
+        is_pinned = backend.name in pinned or health.key(backend) in pinned
+        samples = table.get(health.key(backend), {}).get("samples", [])
+        if len(samples) < min_samples:
+            return (1, 0, not is_pinned, index)
+        times = [t for t, _ in samples]
+        success = sum(ok for _, ok in samples) / len(samples)
+        if success < 0.5:
+            return (2, 0, not is_pinned, index)
+        cost = (_percentile(times, 0.5) + _percentile(times, 0.95)) / 2 / success
+        return (0, int(cost / tie_window), not is_pinned, index)
+
+    return [b for _, b in sorted(enumerate(backends), key=sort_key)]
+
+
+MESSAGE_CACHE_FILE = Path.home() / ".claude" / "data" / "message-cache.sqlite"
+
+# UUIDs, hex ids of 7+ chars with at least one digit (SHAs), and plain numbers.
+# The digit keeps hex-letter words like "defaced" or "effaced" intact.
+_VOLATILE = re.compile(
+    r"\b(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|(?=[a-f]*\d)[0-9a-f]{7,}|\d+)\b"
+)
+
+
+def normalize_context(context: str) -> str:
+    """Canonical form of a transcript summary for cache keys.
+
+    Case, whitespace and volatile tokens (numbers, hashes) are folded, so
+    "Edit src/a.py" after 3 vs 4 retries or commit abc1234 vs def5678 map
+    to the same message.
+    """
+    return " ".join(_VOLATILE.sub("#", context.casefold()).split())
+
+
+class MessageCache:
+    """LLM completion messages keyed by normalized transcript context, in SQLite.
+
+    Repeated stops after the same actions (subagents especially) produce the
+    same ``TranscriptSummary``; a hit skips the LLM round-trip entirely.
+    Entries expire ``ttl`` seconds after they were generated, and beyond
+    ``max_entries`` the least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = MESSAGE_CACHE_FILE,
+        ttl: float = 3600.0,
+        max_entries: int = 256,
+    ) -> None:
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(context: str) -> str:
+        return hashlib.sha256(normalize_context(context).encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.db_path, timeout=1.0)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS messages"
+            " (key TEXT PRIMARY KEY, message TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL)"
+        )
+        return db
+
+    def get(self, context: str) -> Optional[str]:
+        """The cached message for ``context``, or None when missing or expired."""
+        try:
+            key = self.key(context)
+            with contextlib.closing(self._connect()) as db, db:
+                now = time.time()
+                row = db.execute(
+                    "SELECT message FROM messages WHERE key = ? AND created > ?", (key, now - self.ttl)
+                ).fetchone()
+                if row:
+                    db.execute("UPDATE messages SET used = ? WHERE key = ?", (now, key))
+                return row[0] if row else None
+        except (sqlite3.Error, OSError):
+            return None
+
+    def put(self, context: str, message: str) -> None:
+        """Store ``message`` for ``context`` and evict expired and surplus entries."""
+        try:
+            with contextlib.closing(self._connect()) as db, db:
+                now = time.time()
+                db.execute(
+                    "INSERT OR REPLACE INTO messages (key, message, created, used) VALUES (?, ?, ?, ?)",
+                    (self.key(context), message, now, now),
+                )
+                db.execute("DELETE FROM messages WHERE created <= ?", (now - self.ttl,))
+                db.execute(
+                    "DELETE FROM messages WHERE key NOT IN"
+                    " (SELECT key FROM messages ORDER BY used DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+        except (sqlite3.Error, OSError):
+            pass
+
+
+@dataclass
+class Budget:
+    """Wall-clock allowance for one notification, shared by every stage.
+
+    ``first_sound`` bounds everything before playback starts: transcript
+    context, message generation and the TTS request. ``total`` bounds the
+    whole notification, playback included. Stages take what is left instead
+    of their own fixed timeouts. None leaves a limit open.
+    """
+
+    first_sound: Optional[float] = None
+    total: Optional[float] = None
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def bounded(self) -> bool:
+        return self.first_sound is not None or self.total is not None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        """Seconds until ``total`` runs out (``inf`` when unbounded)."""
+        return math.inf if self.total is None else max(0.0, self.total - self.elapsed())
+
+    def until_first_sound(self) -> float:
+        """Seconds until playback should start (``inf`` when unbounded)."""
+        if self.first_sound is None:
+            return self.remaining()
+        return min(self.remaining(), max(0.0, self.first_sound - self.elapsed()))
+
+
 class NotificationService:
     """Orchestrates TTS and LLM backends for hook notifications.
 
     Tries backends in priority order, falling back gracefully when
     a backend is unavailable or returns no output.
+
+    With a ``BackendHealth`` table every run is recorded and backends whose
+    circuit is open are skipped.
+
+    With a ``MessageCache``, a completion message generated for a transcript
+    context is reused for the same (normalized) context until it expires.
+
+    With an ``AnnouncementPool``, a completion that gets no LLM answer draws
+    a pre-generated announcement instead of one of ``fallback_messages``,
+    which remain the last resort while the pool is empty.
+
+    With ``llm_race=True`` all available LLM backends start at once and the
+    first non-empty answer wins (see ``_race_llms``), so a hanging backend
+    costs at most ``llm_deadline`` seconds instead of its full timeout plus
+    everyone else's.
+
+    With a ``first_sound`` and/or ``total_budget`` (seconds), every
+    notification gets a ``Budget``. Message generation may use the time
+    until first sound minus ``speech_lead`` (what the TTS request needs
+    before audio starts). LLM backends whose typical latency does not fit
+    are skipped. When none fits, the message comes from the cache or the
+    fallbacks. Delivery gets what is left of ``total_budget``.
     """
 
     def __init__(
@@ -248,63 +1013,238 @@ class NotificationService:
         llm_backends: list[Backend],
         fallback_messages: list[str],
         visual_backends: list[Backend] | None = None,
+        llm_race: bool = False,
+        llm_deadline: float = 15.0,
+        llm_grace: float = 0.5,
+        delivery_deadline: float = 30.0,
+        health: Optional[BackendHealth] = None,
+        message_cache: Optional[MessageCache] = None,
+        announcements: Optional[AnnouncementPool] = None,
+        first_sound: Optional[float] = None,
+        total_budget: Optional[float] = None,
+        speech_lead: float = 0.5,
     ) -> None:
         self.tts_backends = tts_backends
         self.llm_backends = llm_backends
         self.fallback_messages = fallback_messages
         self.visual_backends = visual_backends or []
+        self.llm_race = llm_race
+        self.llm_deadline = llm_deadline
+        self.llm_grace = llm_grace
+        self.delivery_deadline = delivery_deadline
+        self.health = health
+        self.message_cache = message_cache
+        self.announcements = announcements
+        self.first_sound = first_sound
+        self.total_budget = total_budget
+        self.speech_lead = speech_lead
+
+    def budget(self) -> Budget:
+        """A fresh ``Budget`` for one notification, starting now."""
+        return Budget(first_sound=self.first_sound, total=self.total_budget)
+
+    def _allowed(self, backend: Backend) -> bool:
+        return self.health is None or self.health.allow(backend)
+
+    def _record(self, backend: Backend, ok: bool, elapsed: float) -> None:
+        if self.health is not None:
+            self.health.record(backend, ok, elapsed)
+
+    def _run(self, backend: Backend, *args: str, timeout: Optional[float] = None) -> Optional[str]:
+        """``backend.run`` with the outcome recorded in the health table."""
+        start = time.monotonic()
+        result = backend.run(*args) if timeout is None else backend.run(*args, timeout=timeout)
+        self._record(backend, result is not None, time.monotonic() - start)
+        return result
+
+    def _race_llms(self, backends: list[Backend], args: list[str], limit: float = math.inf) -> Optional[str]:
+        """Run ``backends`` concurrently and return the preferred non-empty answer.
+
+        An answer is accepted as soon as every higher-priority backend has
+        finished without one. Otherwise the service waits up to ``llm_grace``
+        seconds for a higher-priority answer. Nothing waits past
+        ``llm_deadline`` or ``limit``. Losing and late backends are cancelled.
+        """
+        results: queue.Queue = queue.Queue()
+        procs: list[tuple[Backend, subprocess.Popen]] = []
+        start = time.monotonic()
+        for i, backend in enumerate(backends):
+            proc = backend.spawn(*args)
+            if proc is None:
+                results.put((i, None))
+                continue
+            procs.append((backend, proc))
+            threading.Thread(
+                target=lambda i=i, b=backend, p=proc: results.put((i, b.collect(p))),
+                daemon=True,
+            ).start()
+
+        deadline = start + min(self.llm_deadline, limit)
+        finished: set[int] = set()
+        best: Optional[tuple[int, str]] = None
+        try:
+            while len(finished) < len(backends):
+                if best is not None and all(j in finished for j in range(best[0])):
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    i, text = results.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                finished.add(i)
+                self._record(backends[i], text is not None, time.monotonic() - start)
+                if text and (best is None or i < best[0]):
+                    if best is None:
+                        deadline = min(deadline, time.monotonic() + self.llm_grace)
+                    best = (i, text)
+        finally:
+            for backend, proc in procs:
+                backend.cancel(proc)
+
+        if best is None:
+            # Nobody answered in time: the stragglers count as failures. When
+            # someone did answer, cancelled runs were merely slower, not broken.
+            for i in set(range(len(backends))) - finished:
+                self._record(backends[i], False, time.monotonic() - start)
+
+        return best[1] if best else None
+
+    def _generation_window(self, budget: Budget) -> float:
+        """Seconds message generation may still take under ``budget``."""
+        return budget.until_first_sound() - self.speech_lead if budget.bounded else math.inf
+
+    def _fits(self, backend: Backend, window: float) -> bool:
+        """Whether ``backend`` typically answers within ``window`` seconds and is allowed to run.
+
+        Latency is checked first: ``_allowed`` claims a half-open probe,
+        which must only happen when the backend is about to run.
+        """
+        if window <= 0:
+            return False
+        typical = self.health.typical(backend) if self.health is not None and window < math.inf else None
+        if typical is not None and typical > window:
+            return False
+        return self._allowed(backend)
 
-    def _generate_message(self, transcript_path: Optional[str] = None) -> str:
-        """Generate a completion message via LLM, with transcript context."""
-        available_llms = [b for b in self.llm_backends if b.is_available()]
-        context = TranscriptParser.parse(transcript_path) if available_llms else None
+    def _generate_message(self, transcript_path: Optional[str] = None, budget: Optional[Budget] = None) -> str:
+        """Generate a completion message via LLM, with transcript context.
 
-        for backend in available_llms:
-            args = ["--completion"]
-            if context:
-                args += ["--context", context]
-            result = backend.run(*args)
-            if result:
-                return result
+        Under a bounded ``budget`` each LLM run is capped at the remaining
+        generation window. Once nothing fits, the message is a fallback.
+        """
+        budget = budget or Budget()
+        available_llms = [b for b in self.llm_backends if b.is_available()]
+        context = TranscriptCache().summarize(transcript_path) if available_llms else None
+
+        cache = self.message_cache if context else None
+        if cache is not None:
+            cached = cache.get(context)
+            if cached:
+                return cached
+
+        args = ["--completion"]
+        if context:
+            args += ["--context", context]
+
+        result = None
+        if self.llm_race and len(available_llms) > 1:
+            window = self._generation_window(budget)
+            racers = [b for b in available_llms if self._fits(b, window)]
+            result = self._race_llms(racers, args, limit=window) if racers else None
+        else:
+            for backend in available_llms:
+                window = self._generation_window(budget)
+                if not self._fits(backend, window):
+                    continue
+                timeout = min(backend.timeout, window) if window < math.inf else None
+                result = self._run(backend, *args, timeout=timeout)
+                if result:
+                    break
+
+        if not result:
+            return self._fallback_message()
+        if cache is not None:
+            cache.put(context, result)
+        return result
+
+    def _fallback_message(self) -> str:
+        """A pre-generated announcement from the pool, or one of the fixed fallback messages."""
+        drawn = self.announcements.draw() if self.announcements is not None else None
+        return drawn or random.choice(self.fallback_messages)
+
+    def _run_chain(self, backends: list[Backend], *args: str, budget: Optional[Budget] = None) -> bool:
+        """Run ``args`` through ``backends`` in priority order until one succeeds.
+
+        Under a ``budget`` with a ``total``, each run is capped at what is
+        left of it, and the chain stops once it is spent.
+        """
+        for backend in backends:
+            if not backend.is_available():
+                continue
+            timeout = None
+            if budget is not None and budget.total is not None:
+                remaining = budget.remaining()
+                if remaining <= 0:
+                    return False
+                timeout = min(backend.timeout, remaining)
+            if not self._allowed(backend):
+                continue
+            if self._run(backend, *args, timeout=timeout) is not None:
+                return True
+        return False
 
-        return random.choice(self.fallback_messages)
+    def _deliver_tts(self, message: str, budget: Optional[Budget] = None) -> None:
+        """Speak message via the first TTS backend that succeeds."""
+        self._run_chain(self.tts_backends, message, budget=budget)
 
-    def _deliver_visual(self, message: str, urgent: bool = False) -> None:
+    def _deliver_visual(self, message: str, urgent: bool = False, budget: Optional[Budget] = None) -> None:
         """Deliver message via the first available visual backend (macOS/terminal).
 
-        Fires independently of TTS — both channels can be active simultaneously.
         urgent=True uses an attention sound (for input-needed events).
         """
-        for visual in self.visual_backends:
-            if not visual.is_available():
-                continue
-            args = [message, "--urgent"] if urgent else [message]
-            if visual.run(*args) is not None:
-                return
+        args = [message, "--urgent"] if urgent else [message]
+        self._run_chain(self.visual_backends, *args, budget=budget)
+
+    def _deliver(self, message: str, urgent: bool = False, budget: Optional[Budget] = None) -> None:
+        """Dispatch the TTS and visual channels concurrently.
+
+        Each channel keeps its own fallback order. Returns once both channels
+        finish or ``delivery_deadline`` (or the ``budget`` total) passes. A
+        backend still running at the deadline is abandoned, not waited for.
+        """
+        threads = []
+        if self.tts_backends:
+            threads.append(threading.Thread(target=self._deliver_tts, args=(message, budget), daemon=True))
+        if self.visual_backends:
+            threads.append(
+                threading.Thread(target=self._deliver_visual, args=(message, urgent, budget), daemon=True)
+            )
+
+        limit = self.delivery_deadline if budget is None else min(self.delivery_deadline, budget.remaining())
+        deadline = time.monotonic() + limit
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
 
     def speak_completion(self, transcript_path: Optional[str] = None) -> None:
         """Generate an LLM completion message and deliver via TTS and/or visual channels.
 
-        Message is generated once and delivered to all active channels.
-        TTS chain stops at first success; visual chain is always attempted independently.
+        Message is generated once and delivered to all active channels at the
+        same time. TTS chain stops at first success; visual chain is always
+        attempted independently.
         """
+        budget = self.budget()
         has_tts = any(b.is_available() for b in self.tts_backends)
         has_visual = any(b.is_available() for b in self.visual_backends)
 
         if not has_tts and not has_visual:
             return
 
-        message = self._generate_message(transcript_path)
-
-        # TTS chain: stop at first success
-        for tts in self.tts_backends:
-            if not tts.is_available():
-                continue
-            if tts.run(message) is not None:
-                break
-
-        # Visual chain: independent of TTS result
-        self._deliver_visual(message, urgent=False)
+        message = self._generate_message(transcript_path, budget)
+        self._deliver(message, urgent=False, budget=budget)
 
     def speak_notification(self, message: Optional[str] = None) -> None:
         """Speak a notification message verbatim, or a generic fallback.
@@ -319,20 +1259,19 @@ class NotificationService:
             if engineer_name and random.random() < 0.3:
                 spoken = f"{engineer_name}, your input is needed"
             else:
-                spoken = "Your input is needed"
+                spoken = _INPUT_NEEDED
 
-        # TTS chain
-        for tts in self.tts_backends:
-            if not tts.is_available():
-                continue
-            if tts.run(spoken) is not None:
-                break
+        self._deliver(spoken, urgent=True, budget=self.budget())
 
-        # Visual chain (urgent — different sound for input-needed)
-        self._deliver_visual(spoken, urgent=True)
 
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
 
-def build_service(hooks_dir: Optional[Path] = None) -> NotificationService:
+
+def build_service(hooks_dir: Optional[Path] = None, mode: Optional[str] = None) -> NotificationService:
     """Factory that creates a NotificationService with default backends.
 
     Reads ~/.claude/data/notify-mode to determine active delivery channels:
@@ -340,8 +1279,35 @@ def build_service(hooks_dir: Optional[Path] = None) -> NotificationService:
       macos  — visual chain only  (macOS notification → terminal OSC)
       both   — TTS + visual  (default)
       silent — no delivery (logging only)
+    A valid ``mode`` argument overrides the state file (the notification
+    worker passes the mode captured when the job was queued).
 
     LLM priority:  claude_cli → OpenAI → Anthropic → Ollama
+
+    TTS and LLM backends are ``InProcessBackend``s: their scripts are imported
+    and called directly when their dependencies are importable here, and run
+    under ``uv`` otherwise. The notification worker declares the provider SDKs
+    so that its calls stay in-process. Set CLAUDE_NOTIFY_INPROCESS=0 to
+    always use ``uv``.
+
+    Set CLAUDE_NOTIFY_LLM_RACE=1 to query the LLMs concurrently instead of
+    one after another; CLAUDE_NOTIFY_LLM_DEADLINE and CLAUDE_NOTIFY_LLM_GRACE
+    (seconds) tune the race. CLAUDE_NOTIFY_DEADLINE caps how long delivery
+    waits for the TTS and visual channels.
+
+    Set CLAUDE_NOTIFY_ORDER=adaptive to reorder the TTS and LLM chains by
+    observed latency and success rate (see ``rank_backends``);
+    CLAUDE_NOTIFY_PREFER lists backend names to favour on ties.
+
+    CLAUDE_NOTIFY_FIRST_SOUND and CLAUDE_NOTIFY_BUDGET (seconds) set a
+    per-notification ``Budget``: time until audio starts, and total wall
+    time including playback. CLAUDE_NOTIFY_SPEECH_LEAD (default 0.5) is the
+    part of the first-sound budget kept back for the TTS request.
+
+    Completion messages are cached per transcript context for
+    CLAUDE_NOTIFY_MESSAGE_TTL seconds (default 3600; 0 disables the cache).
+    Without an LLM answer, completions draw from the pre-generated
+    announcement pool; CLAUDE_NOTIFY_POOL=0 uses only FALLBACK_MESSAGES.
     """
     if hooks_dir is None:
         hooks_dir = Path(__file__).parent.parent
@@ -350,14 +1316,24 @@ def build_service(hooks_dir: Optional[Path] = None) -> NotificationService:
     llm_dir = hooks_dir / "utils" / "llm"
     notify_dir = hooks_dir / "utils" / "notify"
 
-    mode = get_notify_mode()
+    if mode not in _VALID_MODES:
+        mode = get_notify_mode()
+
+    if os.getenv("CLAUDE_NOTIFY_INPROCESS", "1") != "0":
+        def tts(*args, **kwargs) -> Backend:
+            return InProcessBackend(*args, entry="speak", isolate=True, **kwargs)
+
+        def llm(*args, **kwargs) -> Backend:
+            return InProcessBackend(*args, entry="generate_completion_message", **kwargs)
+    else:
+        tts = llm = Backend
 
     tts_backends = (
         [
-            Backend("elevenlabs", tts_dir / "elevenlabs_tts.py", env_key="ELEVENLABS_API_KEY", timeout=10),
-            Backend("openai", tts_dir / "openai_tts.py", env_key="OPENAI_API_KEY", timeout=10),
-            Backend("kokoro", tts_dir / "kokoro_tts.py", timeout=60),
-            Backend("pyttsx3", tts_dir / "pyttsx3_tts.py", timeout=10),
+            tts("elevenlabs", tts_dir / "elevenlabs_tts.py", env_key="ELEVENLABS_API_KEY", timeout=10),
+            tts("openai", tts_dir / "openai_tts.py", env_key="OPENAI_API_KEY", timeout=10),
+            tts("kokoro", tts_dir / "kokoro_tts.py", timeout=60),
+            tts("pyttsx3", tts_dir / "pyttsx3_tts.py", timeout=10),
         ]
         if mode in ("tts", "both")
         else []
@@ -373,15 +1349,33 @@ def build_service(hooks_dir: Optional[Path] = None) -> NotificationService:
     )
 
     llm_backends = [
-        Backend("claude_cli", llm_dir / "claude_cli.py", timeout=15),
-        Backend("openai", llm_dir / "oai.py", env_key="OPENAI_API_KEY", timeout=15),
-        Backend("anthropic", llm_dir / "anth.py", env_key="ANTHROPIC_API_KEY", timeout=15),
-        Backend("ollama", llm_dir / "ollama.py", timeout=15),
+        llm("claude_cli", llm_dir / "claude_cli.py", timeout=15),
+        llm("openai", llm_dir / "oai.py", env_key="OPENAI_API_KEY", timeout=15),
+        llm("anthropic", llm_dir / "anth.py", env_key="ANTHROPIC_API_KEY", timeout=15),
+        llm("ollama", llm_dir / "ollama.py", timeout=15),
     ]
 
+    health = BackendHealth()
+    if os.getenv("CLAUDE_NOTIFY_ORDER", "").lower() == "adaptive":
+        pinned = [p.strip() for p in os.getenv("CLAUDE_NOTIFY_PREFER", "").split(",") if p.strip()]
+        tts_backends = rank_backends(tts_backends, health, pinned)
+        llm_backends = rank_backends(llm_backends, health, pinned)
+
+    message_ttl = _env_float("CLAUDE_NOTIFY_MESSAGE_TTL", 3600.0)
+
     return NotificationService(
         tts_backends=tts_backends,
         llm_backends=llm_backends,
         fallback_messages=FALLBACK_MESSAGES,
         visual_backends=visual_backends,
+        llm_race=os.getenv("CLAUDE_NOTIFY_LLM_RACE", "").lower() in ("1", "true", "yes"),
+        llm_deadline=_env_float("CLAUDE_NOTIFY_LLM_DEADLINE", 15.0),
+        llm_grace=_env_float("CLAUDE_NOTIFY_LLM_GRACE", 0.5),
+        delivery_deadline=_env_float("CLAUDE_NOTIFY_DEADLINE", 30.0),
+        health=health,
+        message_cache=MessageCache(ttl=message_ttl) if message_ttl > 0 else None,
+        announcements=AnnouncementPool() if os.getenv("CLAUDE_NOTIFY_POOL", "1") != "0" else None,
+        first_sound=_env_float("CLAUDE_NOTIFY_FIRST_SOUND", 0.0) or None,
+        total_budget=_env_float("CLAUDE_NOTIFY_BUDGET", 0.0) or None,
+        speech_lead=_env_float("CLAUDE_NOTIFY_SPEECH_LEAD", 0.5),
     )
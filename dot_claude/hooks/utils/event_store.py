@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""Append-only JSONL event store for Claude Code hook logs.
+
+Every hook event is serialised to one compact JSON line and written with a
+single ``os.write`` on an ``O_APPEND`` descriptor. Appends therefore cost
+O(1) regardless of how large the log has grown, and concurrent hooks never
+interleave partial lines — the kernel positions each write at end-of-file.
+Appenders hold a shared ``flock`` on ``<name>.jsonl.lock`` while they write;
+rotation takes it exclusively, so no line can land in a segment that is
+already being compressed.
+
+Legacy logs were JSON arrays rewritten in full on every event. The
+``migrate`` command converts them once:
+
+    python3 ~/.claude/hooks/utils/event_store.py migrate [LOG_DIR ...]
+
+With no arguments it migrates ``~/.claude/logs`` and ``./logs``.
+
+Logs rotate. When the active ``<name>.jsonl`` exceeds its policy's size or
+age limit it is closed into a compressed segment (zstd when ``zstandard`` is
+installed, gzip otherwise) and recorded in ``<name>.index.json`` with the
+wall-clock range it covers, so ``read_events(since=..., until=...)`` can
+skip whole segments. Old segments are pruned per event type.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import gzip
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # gzip fallback
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Hook logs that used the legacy read-modify-write JSON array format.
+# chat.json is a transcript snapshot, not an event log, so it is excluded.
+LEGACY_LOG_NAMES = (
+    "stop",
+    "subagent_stop",
+    "notification",
+    "pre_tool_use",
+    "post_tool_use",
+    "session_start",
+    "user_prompt_submit",
+    "pre_compact",
+)
+
+
+@dataclass(frozen=True)
+class RotationPolicy:
+    """When to close the active segment and how long to keep closed ones.
+
+    ``max_bytes`` / ``max_age`` trigger rotation of the active file (either
+    one is enough). ``keep_segments`` and ``retain_days`` bound the closed
+    segments kept on disk; a value of 0 disables that limit.
+    """
+
+    max_bytes: int = 8 * 1024 * 1024
+    max_age: float = 7 * 86400
+    keep_segments: int = 10
+    retain_days: float = 30
+
+
+DEFAULT_POLICY = RotationPolicy()
+
+# Per event type, keyed by log name. Tool-use logs see one event per tool
+# call and carry full tool outputs, so they roll daily and keep two weeks;
+# session_start fires a handful of times a day and can keep months.
+ROTATION_POLICIES: dict[str, RotationPolicy] = {
+    "pre_tool_use": RotationPolicy(max_bytes=16 * 1024 * 1024, max_age=86400, keep_segments=14, retain_days=14),
+    "post_tool_use": RotationPolicy(max_bytes=32 * 1024 * 1024, max_age=86400, keep_segments=14, retain_days=14),
+    "session_start": RotationPolicy(max_bytes=1024 * 1024, max_age=30 * 86400, keep_segments=12, retain_days=365),
+    "pre_compact": RotationPolicy(max_bytes=1024 * 1024, max_age=30 * 86400, keep_segments=12, retain_days=365),
+}
+
+
+def policy_for(log_path: PathLike) -> RotationPolicy:
+    """Return the rotation policy for a log, keyed by its file stem."""
+    return ROTATION_POLICIES.get(Path(log_path).stem, DEFAULT_POLICY)
+
+
+def encode_event(data: object) -> bytes:
+    """Serialise one event to a compact, newline-terminated UTF-8 JSON line."""
+    line = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+    return (line + "\n").encode("utf-8")
+
+
+def append_event(
+    log_path: PathLike,
+    data: object,
+    policy: Optional[RotationPolicy] = None,
+) -> None:
+    """Append one event to a JSONL log, creating the file and directory if needed.
+
+    The whole line goes out in a single ``write`` on an ``O_APPEND`` descriptor,
+    which is atomic with respect to other appenders on a local filesystem.
+    The write happens under a shared lock, so it cannot race a rotation.
+    Afterwards the active file is rotated if it has outgrown ``policy``
+    (default: ``policy_for(log_path)``).
+    """
+    path = os.fspath(log_path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    line = encode_event(data)
+    with _locked(Path(path), fcntl.LOCK_SH):
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            written = os.write(fd, line)
+            # Short writes only happen on full disks or signals; finish the line
+            # so a later append never lands mid-record.
+            while written < len(line):
+                written += os.write(fd, line[written:])
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+    _maybe_rotate(Path(path), size, policy or policy_for(path))
+
+
+# ---------------------------------------------------------------------------
+# Rotation
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _locked(log_path: Path, operation: int):
+    """Hold ``flock(operation)`` on ``<log>.lock``: shared for appends, exclusive for rotation and the index."""
+    fd = os.open(log_path.with_name(log_path.name + ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, operation)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _index_path(log_path: Path) -> Path:
+    return log_path.with_name(log_path.stem + ".index.json")
+
+
+def load_index(log_path: PathLike) -> dict:
+    """Return the segment index for a log: {"active_started": ts, "seq": n, "segments": [...]}.
+
+    Each segment is {"file", "start", "end", "bytes"}, oldest first, with
+    ``start``/``end`` as Unix timestamps of the wall-clock range it covers.
+    """
+    try:
+        index = json.loads(_index_path(Path(log_path)).read_text())
+        if isinstance(index, dict) and isinstance(index.get("segments"), list):
+            return index
+    except (FileNotFoundError, json.JSONDecodeError, ValueError, OSError):
+        pass
+    return {"active_started": None, "segments": []}
+
+
+def _save_index(log_path: Path, index: dict) -> None:
+    path = _index_path(log_path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(index, separators=(",", ":")))
+    os.replace(tmp, path)
+
+
+def _compress(src: Path) -> Path:
+    """Compress a closed segment next to itself and remove the original.
+
+    Called under the exclusive lock, so no appender still holds ``src`` open.
+    """
+    if zstandard is not None:
+        dst = src.with_name(src.name + ".zst")
+        opener = lambda p: zstandard.open(p, "wb")  # noqa: E731
+    else:
+        dst = src.with_name(src.name + ".gz")
+        opener = lambda p: gzip.open(p, "wb")  # noqa: E731
+
+    with open(src, "rb") as f, opener(dst) as out:
+        out.write(f.read())
+    src.unlink()
+    return dst
+
+
+def _open_segment(path: Path):
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise OSError(f"zstandard is required to read {path.name}")
+        return zstandard.open(path, "rb")
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _prune(log_path: Path, index: dict, policy: RotationPolicy, now: float) -> None:
+    segments = index["segments"]
+    cutoff = now - policy.retain_days * 86400 if policy.retain_days else None
+    while segments and (
+        (policy.keep_segments and len(segments) > policy.keep_segments)
+        or (cutoff is not None and segments[0]["end"] < cutoff)
+    ):
+        dropped = segments.pop(0)
+        try:
+            (log_path.parent / dropped["file"]).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _needs_rotation(size: int, started: Optional[float], policy: RotationPolicy, now: float) -> bool:
+    if policy.max_bytes and size >= policy.max_bytes:
+        return True
+    return bool(policy.max_age and started is not None and now - started >= policy.max_age)
+
+
+def rotate(
+    log_path: PathLike,
+    policy: Optional[RotationPolicy] = None,
+    now: Optional[float] = None,
+    force: bool = True,
+) -> Optional[Path]:
+    """Close the active segment into a compressed file. Returns its path, or None.
+
+    Safe against concurrent hooks: rotation happens under an exclusive lock
+    and is a no-op when the active file is empty or already gone. With
+    ``force=False`` the policy is re-checked under the lock, so hooks that
+    race past the threshold together rotate only once.
+    """
+    log_path = Path(log_path)
+    policy = policy or policy_for(log_path)
+    now = time.time() if now is None else now
+
+    with _locked(log_path, fcntl.LOCK_EX):
+        try:
+            size = log_path.stat().st_size
+        except FileNotFoundError:
+            return None
+        index = load_index(log_path)
+        start = index.get("active_started")
+        if size == 0 or not (force or _needs_rotation(size, start, policy, now)):
+            return None
+
+        start = start or now
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(start))
+        seq = index.get("seq", 0)
+        closed = log_path.with_name(f"{log_path.stem}.{stamp}.{seq}{log_path.suffix}")
+        os.rename(log_path, closed)
+        segment = _compress(closed)
+
+        index["segments"].append({"file": segment.name, "start": start, "end": now, "bytes": size})
+        index["active_started"] = now
+        index["seq"] = seq + 1
+        _prune(log_path, index, policy, now)
+        _save_index(log_path, index)
+        return segment
+
+
+def _maybe_rotate(log_path: Path, size: int, policy: RotationPolicy) -> None:
+    """Rotate the active file if it exceeds ``policy``; record its start time otherwise."""
+    try:
+        started = load_index(log_path).get("active_started")
+        now = time.time()
+        if started is None:
+            with _locked(log_path, fcntl.LOCK_EX):
+                # Re-read under the lock: another hook may have started or rotated it
+                index = load_index(log_path)
+                if index.get("active_started") is None:
+                    index["active_started"] = now
+                    _save_index(log_path, index)
+        elif _needs_rotation(size, started, policy, now):
+            rotate(log_path, policy, now, force=False)
+    except OSError:
+        pass  # rotation is best-effort; the event is already written
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def _iter_lines(f) -> Iterator[dict]:
+    for raw in f:
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            yield json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+
+
+def read_events(
+    log_path: PathLike,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> Iterator[dict]:
+    """Yield events from a JSONL log in append order, including rotated segments.
+
+    ``since``/``until`` (Unix timestamps) skip whole segments whose indexed
+    time range lies outside the window; events inside a matching segment are
+    not filtered individually. Blank lines and undecodable lines (e.g. a torn
+    final line after a crash) are skipped. A missing log yields nothing.
+    """
+    log_path = Path(log_path)
+    index = load_index(log_path)
+    for segment in index["segments"]:
+        if since is not None and segment["end"] < since:
+            continue
+        if until is not None and segment["start"] > until:
+            continue
+        try:
+            with _open_segment(log_path.parent / segment["file"]) as f:
+                yield from _iter_lines(f)
+        except OSError:
+            continue
+
+    started = index.get("active_started")
+    if until is not None and started is not None and started > until:
+        return
+    try:
+        with open(log_path, "rb") as f:
+            yield from _iter_lines(f)
+    except FileNotFoundError:
+        return
+
+
+# ---------------------------------------------------------------------------
+# Migration
+# ---------------------------------------------------------------------------
+
+
+def migrate_json_array(json_path: PathLike, jsonl_path: Optional[PathLike] = None) -> int:
+    """Convert a legacy JSON array log into JSONL. Returns the number of events migrated.
+
+    Legacy events are written ahead of any lines already in the JSONL file
+    (those were appended after the switchover, so they are newer). The old file
+    is renamed to ``<name>.json.migrated`` rather than deleted. Files that are
+    missing, unreadable, or not a JSON array are left untouched and count as 0.
+
+    Run while hooks are idle: events appended to the JSONL file during the
+    final swap could be lost.
+    """
+    src = Path(json_path)
+    dst = Path(jsonl_path) if jsonl_path else src.with_suffix(".jsonl")
+
+    try:
+        legacy = json.loads(src.read_text())
+    except (FileNotFoundError, json.JSONDecodeError, ValueError, OSError):
+        return 0
+    if not isinstance(legacy, list):
+        return 0
+
+    tmp = dst.with_name(dst.name + ".migrating")
+    with open(tmp, "wb") as out:
+        for event in legacy:
+            out.write(encode_event(event))
+        try:
+            out.write(dst.read_bytes())
+        except FileNotFoundError:
+            pass
+    os.replace(tmp, dst)
+    src.rename(src.with_name(src.name + ".migrated"))
+    return len(legacy)
+
+
+def migrate_log_dir(log_dir: PathLike) -> dict[str, int]:
+    """Migrate every known legacy array log in ``log_dir``. Returns {name: count}."""
+    migrated: dict[str, int] = {}
+    for name in LEGACY_LOG_NAMES:
+        src = Path(log_dir) / f"{name}.json"
+        if src.exists():
+            migrated[name] = migrate_json_array(src)
+    return migrated
+
+
+def main() -> None:
+    if len(sys.argv) < 2 or sys.argv[1] not in ("migrate", "rotate"):
+        print("Usage: event_store.py migrate [LOG_DIR ...] | rotate LOG_FILE ...", file=sys.stderr)
+        sys.exit(1)
+
+    if sys.argv[1] == "rotate":
+        for log_file in sys.argv[2:]:
+            segment = rotate(log_file)
+            print(f"{log_file} -> {segment.name if segment else 'nothing to rotate'}")
+        return
+
+    dirs = sys.argv[2:] or [str(Path.home() / ".claude" / "logs"), "logs"]
+    for log_dir in dirs:
+        for name, count in migrate_log_dir(log_dir).items():
+            print(f"{log_dir}/{name}.json -> {name}.jsonl ({count} events)")
+
+
+if __name__ == "__main__":
+    main()
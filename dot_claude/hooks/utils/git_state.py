@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Cached git branch / dirty / ahead-behind state for status lines and hooks.
+
+The status lines, ``statusline-command.sh`` and ``session_start.py`` each
+shelled out to ``git`` (up to three times) on every render or hook, and
+``git status --porcelain`` alone takes hundreds of milliseconds in a large
+repository. ``git_state(path)`` answers all three questions with one
+
+    git --no-optional-locks status --porcelain=v2 --branch --untracked-files=no
+
+and caches the result in ``~/.claude/data/git-state/<repo>.json``, keyed on
+the mtimes of ``.git/HEAD``, the index, the branch ref, ``packed-refs`` and
+``FETCH_HEAD``. A commit, checkout, ``git add`` or fetch changes the key and
+forces a recount. Edits to tracked files don't touch the index, so a cached
+answer is also trusted for at most ``ttl`` seconds (``CLAUDE_GIT_STATE_TTL``,
+default 10).
+
+- Untracked files are not scanned, so they are not counted.
+- ``--no-optional-locks`` keeps the status run from rewriting the index, which
+  would change the key.
+- Repositories with ``core.fsmonitor`` configured get git's fsmonitor fast
+  path automatically.
+
+``is_dirty(path)`` is for callers that only need the dirty flag on every
+refresh. It compares each index entry's recorded size and mtime with an
+``lstat`` of the file, in-process, as ``git diff-files`` does before any
+content check. Staged changes can't be seen that way, so they come from
+``git_state`` with no TTL. Its key changes with every ``git add``, commit
+or checkout, so editing files never starts a ``git`` process.
+
+Stdlib only, and light on imports (no ``dataclasses``/``hashlib``;
+``subprocess`` only on a cache miss) because status lines import it on
+every refresh. Usage:
+
+    python3 ~/.claude/hooks/utils/git_state.py [PATH] [--format ' {branch}{dirty}']
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+
+GIT_STATE_DIR = Path.home() / ".claude" / "data" / "git-state"
+DEFAULT_TTL = 10.0
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+_INDEX_HEADER = struct.Struct(">4sII")  # "DIRC", version, entry count
+_INDEX_ENTRY = struct.Struct(">10I20sH")  # ctime/mtime s+ns, dev, ino, mode, uid, gid, size, sha, flags
+_GITLINK = 0o160000
+
+
+class GitState(NamedTuple):
+    """Branch and working tree summary. ``branch`` is ``HEAD`` when detached, as ``git rev-parse --abbrev-ref``."""
+
+    branch: str
+    changes: int = 0
+    ahead: int = 0
+    behind: int = 0
+    upstream: Optional[str] = None
+
+    @property
+    def dirty(self) -> bool:
+        return self.changes > 0
+
+
+def _locate(path: PathLike) -> Optional[tuple[Path, Path]]:
+    """``(work tree, git dir)`` of the repository containing ``path``."""
+    current = Path(path).absolute()
+    for directory in (current, *current.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:"):].strip())
+                return directory, git_dir if git_dir.is_absolute() else (directory / git_dir).resolve()
+            return None
+    return None
+
+
+def find_git_dir(path: PathLike) -> Optional[Path]:
+    """The git directory of the repository containing ``path`` (following ``.git`` files for worktrees)."""
+    located = _locate(path)
+    return located[1] if located else None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    """Where refs live: the main repository's git dir for a linked worktree."""
+    try:
+        common = (git_dir / "commondir").read_text().strip()
+    except OSError:
+        return git_dir
+    return (git_dir / common).resolve()
+
+
+def read_head(git_dir: Path) -> Optional[str]:
+    """The checked-out branch name read straight from ``HEAD``; ``HEAD`` when detached."""
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+    if head.startswith("ref: "):
+        ref = head[len("ref: "):]
+        return ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    return "HEAD"
+
+
+def _mtime(path: Path) -> Optional[list[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def cache_key(git_dir: Path) -> list:
+    """File stats that change whenever branch, index, commits or upstream refs change."""
+    common = _common_dir(git_dir)
+    branch = read_head(git_dir)
+    return [
+        str(git_dir),
+        _mtime(git_dir / "HEAD"),
+        _mtime(git_dir / "index"),
+        _mtime(common / "refs" / "heads" / branch) if branch and branch != "HEAD" else None,
+        _mtime(common / "packed-refs"),
+        _mtime(common / "FETCH_HEAD"),
+    ]
+
+
+def read_index(git_dir: Path) -> Optional[list[tuple[str, int, int, int, int, int]]]:
+    """``(path, mode, mtime_s, mtime_ns, size, flags)`` per entry of a version 2 or 3 index.
+
+    ``flags`` holds the entry flags in the low 16 bits and the extended
+    flags above them. None when the index is unreadable or version 4
+    (prefix-compressed paths); an empty list when there is no index yet.
+    """
+    try:
+        data = (git_dir / "index").read_bytes()
+    except FileNotFoundError:
+        return []
+    except OSError:
+        return None
+    try:
+        signature, version, count = _INDEX_HEADER.unpack_from(data)
+        if signature != b"DIRC" or version not in (2, 3):
+            return None
+        entries = []
+        pos = _INDEX_HEADER.size
+        for _ in range(count):
+            _, _, mtime_s, mtime_ns, _, _, mode, _, _, size, _, flags = _INDEX_ENTRY.unpack_from(data, pos)
+            name_at = pos + _INDEX_ENTRY.size
+            if flags & 0x4000:  # extended flags follow (version 3)
+                flags |= struct.unpack_from(">H", data, name_at)[0] << 16
+                name_at += 2
+            end = data.index(b"\0", name_at)
+            path = data[name_at:end].decode("utf-8", "surrogateescape")
+            entries.append((path, mode, mtime_s, mtime_ns, size, flags))
+            pos += (end - pos + 8) & ~7  # entries are NUL-padded to a multiple of 8 bytes
+        return entries
+    except (struct.error, ValueError):
+        return None
+
+
+def worktree_changed(git_dir: Path, work_tree: Path) -> Optional[bool]:
+    """Whether a tracked file's size, mtime or type no longer matches its index entry.
+
+    The stat comparison ``git diff-files`` makes before reading contents, so
+    a file that was only touched counts as changed. None when the index
+    can't be read here.
+    """
+    entries = read_index(git_dir)
+    if entries is None:
+        return None
+    for path, mode, mtime_s, mtime_ns, size, flags in entries:
+        if flags & 0x3000:
+            return True  # unmerged
+        if flags & 0x8000 or flags & (0x4000 << 16) or mode == _GITLINK:
+            continue  # assume-unchanged, skip-worktree, submodule
+        try:
+            st = os.lstat(work_tree / path)
+        except OSError:
+            return True
+        if (
+            st.st_size & 0xFFFFFFFF != size
+            or (st.st_mtime_ns // 1_000_000_000) & 0xFFFFFFFF != mtime_s
+            or (mtime_ns and st.st_mtime_ns % 1_000_000_000 != mtime_ns)
+            or st.st_mode & 0o170000 != mode & 0o170000
+        ):
+            return True
+    return False
+
+
+def parse_status(text: str) -> GitState:
+    """Parse ``git status --porcelain=v2 --branch`` output."""
+    branch, upstream, ahead, behind, changes = "HEAD", None, 0, 0, 0
+    for line in text.splitlines():
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            branch = "HEAD" if head == "(detached)" else head
+        elif line.startswith("# branch.upstream "):
+            upstream = line[len("# branch.upstream "):]
+        elif line.startswith("# branch.ab "):
+            a, b = line[len("# branch.ab "):].split()
+            ahead, behind = int(a), -int(b)
+        elif line and not line.startswith("#"):
+            changes += 1
+    return GitState(branch, changes, ahead, behind, upstream)
+
+
+def _ttl() -> float:
+    try:
+        return float(os.environ["CLAUDE_GIT_STATE_TTL"])
+    except (KeyError, ValueError):
+        return DEFAULT_TTL
+
+
+def _run_status(work_tree: Path, timeout: float) -> Optional[GitState]:
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["git", "--no-optional-locks", "status", "--porcelain=v2", "--branch", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=str(work_tree),
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError, subprocess.SubprocessError):
+        return None
+    return parse_status(result.stdout) if result.returncode == 0 else None
+
+
+def git_state(
+    path: Optional[PathLike] = None,
+    ttl: Optional[float] = None,
+    cache_dir: Path = GIT_STATE_DIR,
+    timeout: float = 5.0,
+) -> Optional[GitState]:
+    """Git state of the repository containing ``path`` (default: cwd), or None outside a repository.
+
+    Served from the cache while the repository's key files are unchanged and
+    the entry is younger than ``ttl`` seconds; otherwise ``git status`` runs
+    once and the cache is refreshed.
+    """
+    work_tree = Path.cwd() if path is None else Path(path)
+    git_dir = find_git_dir(work_tree)
+    if git_dir is None:
+        return None
+    ttl = _ttl() if ttl is None else ttl
+
+    key = cache_key(git_dir)
+    # The key holds the full git dir path, so a crc32 name collision is just a miss
+    cache_file = Path(cache_dir) / f"{zlib.crc32(str(git_dir).encode()):08x}.json"
+    try:
+        entry = json.loads(cache_file.read_bytes())
+        if entry["key"] == key and time.time() - entry["at"] < ttl:
+            return GitState(**entry["state"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    state = _run_status(work_tree, timeout)
+    if state is None:
+        return None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"key": key, "at": time.time(), "state": state._asdict()}))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+    return state
+
+
+def is_dirty(path: Optional[PathLike] = None, cache_dir: Path = GIT_STATE_DIR) -> Optional[bool]:
+    """Whether tracked files differ from HEAD, or None outside a repository.
+
+    Unstaged changes are found in-process by ``worktree_changed``. Without
+    any, the staged ones come from ``git_state`` with no TTL, which runs
+    ``git status`` only after HEAD, the index or a ref changed.
+    """
+    work_tree = Path.cwd() if path is None else Path(path)
+    located = _locate(work_tree)
+    if located is None:
+        return None
+    changed = worktree_changed(located[1], located[0])
+    if changed:
+        return True
+    state = git_state(work_tree, ttl=float("inf") if changed is not None else None, cache_dir=cache_dir)
+    return state.dirty if state else None
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", default=None)
+    parser.add_argument(
+        "--format",
+        help="str.format template with {branch} {changes} {ahead} {behind} {upstream} {dirty} ('*' or '')",
+    )
+    args = parser.parse_args()
+
+    state = git_state(args.path)
+    if state is None:
+        sys.exit(1)
+    if args.format is None:
+        print(json.dumps({**state._asdict(), "dirty": state.dirty}))
+    else:
+        print(args.format.format(**{**state._asdict(), "dirty": "*" if state.dirty else ""}), end="")
+
+
+if __name__ == "__main__":
+    main()
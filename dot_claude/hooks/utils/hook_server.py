@@ -0,0 +1,200 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "python-dotenv",
+# ]
+# ///
+"""Persistent hook server — keeps Claude Code hook modules warm behind a Unix socket.
+
+Launching every hook as ``uv run .../stop.py`` pays for environment
+resolution, interpreter startup and imports (``dotenv``, ``utils.common``)
+on each event. This server imports every hook once, then serves requests
+from ``hook_client.py`` by forking: the child inherits the warm modules,
+adopts the caller's cwd, environment, argv and stdin, runs the hook's
+``main()`` and returns its exit code and output. Forking keeps per-event
+state (cwd, ``sys.exit``, redirected stdio) isolated and lets a slow
+``--notify`` hook run without blocking the next event.
+
+The server exits after ``IDLE_TIMEOUT`` seconds without requests and
+re-executes itself when any hook source file changes (e.g. after
+``chezmoi apply``). ``hook_client.py`` starts it on demand.
+
+Usage:
+    ./hook_server.py                      # serve on ~/.claude/data/hookd.sock
+    ./hook_server.py --socket /tmp/h.sock --hooks-dir ~/.claude/hooks
+"""
+
+import argparse
+import contextlib
+import fcntl
+import importlib.util
+import io
+import json
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+from types import ModuleType
+
+SOCKET_PATH = Path.home() / ".claude" / "data" / "hookd.sock"
+HOOKS_DIR = Path(__file__).resolve().parent.parent
+IDLE_TIMEOUT = 30 * 60
+
+HOOK_SCRIPTS = (
+    "stop.py",
+    "subagent_stop.py",
+    "notification.py",
+    "session_start.py",
+    "user_prompt_submit.py",
+    "pre_compact.py",
+    "pre_tool_use.py",
+    "post_tool_use.py",
+)
+
+
+def load_hooks(hooks_dir: Path) -> dict[str, ModuleType]:
+    """Import every known hook script in ``hooks_dir`` that defines ``main()``."""
+    hooks: dict[str, ModuleType] = {}
+    for name in HOOK_SCRIPTS:
+        path = hooks_dir / name
+        if not path.exists():
+            continue
+        try:
+            spec = importlib.util.spec_from_file_location(f"_hook_{path.stem}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception:
+            continue
+        if callable(getattr(module, "main", None)):
+            hooks[name] = module
+    return hooks
+
+
+def run_hook(module: ModuleType, request: dict, base_env: dict[str, str]) -> dict:
+    """Run one hook's ``main()`` as if it were a fresh process. Returns the response dict.
+
+    Mutates process-global state (cwd, environment, argv, stdio), so it must
+    run in a forked child. ``base_env`` holds variables the hooks loaded from
+    ``.env`` at import time; the caller's environment takes precedence, the
+    same as ``load_dotenv(override=False)``.
+    """
+    os.chdir(request.get("cwd") or "/")
+    os.environ.clear()
+    os.environ.update({**base_env, **request.get("env", {})})
+    sys.argv = [module.__file__, *request.get("args", [])]
+    sys.stdin = io.StringIO(request.get("stdin", ""))
+
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            module.main()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            code = 1
+    return {"exit": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+def _recv_all(conn: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        data = conn.recv(65536)
+        if not data:
+            return b"".join(chunks)
+        chunks.append(data)
+
+
+def _handle(conn: socket.socket, hooks: dict[str, ModuleType], base_env: dict[str, str]) -> None:
+    try:
+        request = json.loads(_recv_all(conn))
+        module = hooks.get(request.get("hook", ""))
+        if module is None:
+            response = {"error": f"unknown hook: {request.get('hook')}"}
+        else:
+            response = run_hook(module, request, base_env)
+    except Exception as e:
+        response = {"error": str(e)}
+    with contextlib.suppress(OSError):
+        conn.sendall(json.dumps(response).encode("utf-8"))
+
+
+def _sources_mtime(hooks_dir: Path) -> float:
+    """Newest mtime across hook scripts and utils — the reload trigger."""
+    newest = 0.0
+    for path in [*hooks_dir.glob("*.py"), *hooks_dir.glob("utils/**/*.py")]:
+        with contextlib.suppress(OSError):
+            newest = max(newest, path.stat().st_mtime)
+    return newest
+
+
+def serve(socket_path: Path, hooks_dir: Path, idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """Accept hook requests until idle. Exits quietly if another server holds the lock."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    lock = open(socket_path.with_name(socket_path.name + ".lock"), "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return  # another server is already running
+
+    sys.path.insert(0, str(hooks_dir))
+    startup_env = dict(os.environ)
+    hooks = load_hooks(hooks_dir)
+    base_env = {k: v for k, v in os.environ.items() if startup_env.get(k) != v}
+    loaded_mtime = _sources_mtime(hooks_dir)
+
+    with contextlib.suppress(FileNotFoundError):
+        socket_path.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(old_umask)
+    server.listen(64)
+    server.settimeout(idle_timeout)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # auto-reap children
+
+    stale = False
+    try:
+        while not stale:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            conn.settimeout(None)
+            stale = _sources_mtime(hooks_dir) != loaded_mtime
+            if os.fork() == 0:
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)  # hooks wait on their own subprocesses
+                server.close()
+                _handle(conn, hooks, base_env)
+                conn.close()
+                os._exit(0)
+            conn.close()
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        lock.close()
+
+    if stale:
+        # Hook sources changed since startup: restart with fresh imports.
+        os.environ.clear()
+        os.environ.update(startup_env)
+        os.execv(sys.executable, [sys.executable, *sys.argv])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Persistent Claude Code hook server")
+    parser.add_argument("--socket", type=Path, default=Path(os.getenv("CLAUDE_HOOKD_SOCKET", SOCKET_PATH)))
+    parser.add_argument("--hooks-dir", type=Path, default=HOOKS_DIR)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    args = parser.parse_args()
+    serve(args.socket, args.hooks_dir.resolve(), args.idle_timeout)
+
+
+if __name__ == "__main__":
+    main()
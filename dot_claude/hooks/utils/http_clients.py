@@ -0,0 +1,131 @@
+"""Shared, pooled HTTP clients for the LLM and TTS provider scripts.
+
+Every call used to construct a fresh ``anthropic.Anthropic``, ``OpenAI`` or
+``ElevenLabs`` client, paying a TCP + TLS handshake per request. The
+registry hands back one SDK client per provider and credentials, all sharing
+one keep-alive ``httpx.Client`` per provider, capped at ``PROVIDER_LIMITS``
+connections and speaking HTTP/2 when the ``h2`` package is importable.
+
+The pool pays off in the notification worker, which calls the LLM backends
+in-process and declares ``httpx[http2]``. One-shot ``uv run`` invocations
+build a client per call, as before. Reuse is limited in two ways:
+
+- TTS backends run isolated, in a fork per call. After ``fork`` the child
+  forgets the parent's clients rather than sharing its sockets, so
+  ElevenLabs and OpenAI TTS build a client per utterance and never reuse a
+  connection.
+- The worker exits after ``notify_worker.IDLE_TIMEOUT`` (15 s) without jobs,
+  well inside ``KEEPALIVE_EXPIRY``. Connections are reused within a burst of
+  notifications, not across quiet periods.
+
+Stdlib at import time; ``httpx`` and the SDKs are imported on first use
+(every provider SDK already depends on ``httpx``).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import threading
+from typing import Any, Callable, Optional
+
+# Maximum open connections per provider. Hooks make at most a couple of
+# concurrent requests to any one provider; the cap keeps a stuck endpoint
+# from accumulating sockets in a long-lived process.
+PROVIDER_LIMITS = {
+    "anthropic": 4,
+    "openai": 4,
+    "ollama": 2,
+    "elevenlabs": 2,
+}
+DEFAULT_LIMIT = 4
+KEEPALIVE_EXPIRY = 60.0
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 60.0
+
+_clients: dict[tuple, Any] = {}
+_lock = threading.RLock()  # re-entrant: SDK factories fetch their http_client() under it
+
+
+def _forget_after_fork() -> None:
+    global _lock
+    _clients.clear()
+    _lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_after_fork)
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def shared(key: tuple, factory: Callable[[], Any]) -> Any:
+    """Return the client cached under ``key``, creating it with ``factory`` once."""
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = factory()
+        return client
+
+
+def http_client(provider: str):
+    """The pooled keep-alive ``httpx.Client`` for ``provider``."""
+
+    def create():
+        import httpx
+
+        limit = PROVIDER_LIMITS.get(provider, DEFAULT_LIMIT)
+        return httpx.Client(
+            http2=http2_available(),
+            limits=httpx.Limits(
+                max_connections=limit,
+                max_keepalive_connections=limit,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+
+    return shared(("http", provider), create)
+
+
+def anthropic_client(api_key: str):
+    def create():
+        import anthropic
+
+        return anthropic.Anthropic(api_key=api_key, http_client=http_client("anthropic"))
+
+    return shared(("anthropic", api_key), create)
+
+
+def openai_client(api_key: str, base_url: Optional[str] = None, provider: str = "openai"):
+    """An ``OpenAI`` client; ``provider`` names the pool (e.g. ``ollama`` for a local base URL)."""
+
+    def create():
+        from openai import OpenAI
+
+        return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client(provider))
+
+    return shared((provider, api_key, base_url), create)
+
+
+def elevenlabs_client(api_key: str):
+    def create():
+        from elevenlabs.client import ElevenLabs
+
+        return ElevenLabs(api_key=api_key, httpx_client=http_client("elevenlabs"))
+
+    return shared(("elevenlabs", api_key), create)
+
+
+def close_all() -> None:
+    """Close every pooled connection (tests, or a server shutting down)."""
+    with _lock:
+        clients = [c for key, c in _clients.items() if key[0] == "http"]
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
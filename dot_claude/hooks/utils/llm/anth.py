@@ -9,15 +9,24 @@
 
 import os
 import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from utils.http_clients import anthropic_client
+from utils.llm_stream import take_first_sentence
+from utils.phrase_pool import agent_names_prompt, announcement_prompt, parse_agent_names, parse_announcements
 
-def prompt_llm(prompt_text):
+
+def prompt_llm(prompt_text, max_tokens=100, first_sentence=False):
     """
     Base Anthropic LLM prompting method using fastest model.
 
     Args:
         prompt_text (str): The prompt to send to the model
+        max_tokens (int): Response length cap
+        first_sentence (bool): Stream the response and stop at the first
+            newline or sentence end
 
     Returns:
         str: The model's response text, or None if error
@@ -29,17 +38,21 @@ def prompt_llm(prompt_text):
         return None
 
     try:
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=api_key)
-
-        message = client.messages.create(
+        client = anthropic_client(api_key)
+        request = dict(
             model="claude-haiku-4-5-20251001",  # Fastest Anthropic model
-            max_tokens=100,
+            max_tokens=max_tokens,
             temperature=0.7,
             messages=[{"role": "user", "content": prompt_text}],
         )
 
+        if first_sentence:
+            # Leaving the block closes the stream, which stops generation
+            with client.messages.stream(**request) as stream:
+                return take_first_sentence(stream.text_stream)
+
+        message = client.messages.create(**request)
+
         return message.content[0].text.strip()
 
     except Exception:
@@ -80,7 +93,7 @@ Requirements:
 
 Generate ONE announcement:"""
 
-    response = prompt_llm(prompt)
+    response = prompt_llm(prompt, first_sentence=True)
 
     # Clean up response - remove quotes and extra formatting
     if response:
@@ -91,6 +104,21 @@ Generate ONE announcement:"""
     return response
 
 
+def generate_announcements(count=20, engineer_name=None):
+    """
+    Generate a batch of completion announcements for the phrase pool.
+
+    Args:
+        count (int): How many announcements to ask for
+        engineer_name (str): Address every announcement to this name, if set
+
+    Returns:
+        list[str]: Validated announcements (possibly fewer than count)
+    """
+    response = prompt_llm(announcement_prompt(count, engineer_name), max_tokens=600)
+    return parse_announcements(response, engineer_name)
+
+
 def generate_agent_name():
     """
     Generate a one-word agent name using Anthropic.
@@ -134,8 +162,7 @@ Name:"""
         if not api_key:
             raise Exception("No API key")
         
-        import anthropic
-        client = anthropic.Anthropic(api_key=api_key)
+        client = anthropic_client(api_key)
         
         message = client.messages.create(
             model="claude-haiku-4-5-20251001",  # Fast model
@@ -164,6 +191,19 @@ Name:"""
         return random.choice(example_names)
 
 
+def generate_agent_names(count=40):
+    """
+    Generate a batch of one-word agent names for the name pool.
+
+    Args:
+        count (int): How many names to ask for
+
+    Returns:
+        list[str]: Validated names (possibly fewer than count)
+    """
+    return parse_agent_names(prompt_llm(agent_names_prompt(count), max_tokens=400))
+
+
 def main():
     """Command line interface for testing."""
     import json
@@ -180,6 +220,21 @@ def main():
                 print(message)
             else:
                 sys.exit(1)
+        elif sys.argv[1] == "--announcements":
+            count = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 20
+            name = sys.argv[sys.argv.index("--name") + 1] if "--name" in sys.argv[:-1] else None
+            announcements = generate_announcements(count, name)
+            if announcements:
+                print("\n".join(announcements))
+            else:
+                sys.exit(1)
+        elif sys.argv[1] == "--agent-names":
+            count = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 40
+            names = generate_agent_names(count)
+            if names:
+                print("\n".join(names))
+            else:
+                sys.exit(1)
         elif sys.argv[1] == "--agent-name":
             # Generate agent name (no input needed)
             name = generate_agent_name()
@@ -192,7 +247,7 @@ def main():
             else:
                 print("Error calling Anthropic API")
     else:
-        print("Usage: ./anth.py 'your prompt here' or ./anth.py --completion or ./anth.py --agent-name")
+        print("Usage: ./anth.py 'your prompt here' or ./anth.py --completion, --announcements N [--name NAME], --agent-names N or --agent-name")
 
 
 if __name__ == "__main__":
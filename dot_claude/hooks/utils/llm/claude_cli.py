@@ -18,8 +18,12 @@ import os
 import shutil
 import subprocess
 import sys
+from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from utils.phrase_pool import agent_names_prompt, announcement_prompt, parse_agent_names, parse_announcements
+
 
 def _clean_llm_response(response: Optional[str]) -> Optional[str]:
     """Normalize a raw LLM response to a single clean line, or None."""
@@ -28,7 +32,7 @@ def _clean_llm_response(response: Optional[str]) -> Optional[str]:
     return response.split("\n")[0].strip().strip('"').strip("'").strip() or None
 
 
-def prompt_llm(prompt_text):
+def prompt_llm(prompt_text, timeout=15):
     """Invoke claude CLI non-interactively and return the response text, or None."""
     if not shutil.which("claude"):
         return None
@@ -39,7 +43,7 @@ def prompt_llm(prompt_text):
             ["claude", "-p", prompt_text, "--model", "claude-haiku-4-5-20251001"],
             capture_output=True,
             text=True,
-            timeout=15,
+            timeout=timeout,
             env=env,
         )
         if result.returncode == 0 and result.stdout.strip():
@@ -73,9 +77,20 @@ def generate_completion_message(context=None):
     return _clean_llm_response(prompt_llm(prompt))
 
 
+def generate_announcements(count=20, engineer_name=None):
+    """Generate a batch of announcements for the phrase pool. Returns a list, possibly empty."""
+    response = prompt_llm(announcement_prompt(count, engineer_name), timeout=60)
+    return parse_announcements(response, engineer_name)
+
+
+def generate_agent_names(count=40):
+    """Generate a batch of one-word agent names for the name pool. Returns a list, possibly empty."""
+    return parse_agent_names(prompt_llm(agent_names_prompt(count), timeout=60))
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: claude_cli.py 'prompt' | --completion [--context 'ctx']")
+        print("Usage: claude_cli.py 'prompt' | --completion [--context 'ctx'] | --announcements N [--name NAME] | --agent-names N")
         return
 
     if sys.argv[1] == "--completion":
@@ -89,6 +104,21 @@ def main():
             print(msg)
         else:
             sys.exit(1)
+    elif sys.argv[1] == "--announcements":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 20
+        name = sys.argv[sys.argv.index("--name") + 1] if "--name" in sys.argv[:-1] else None
+        announcements = generate_announcements(count, name)
+        if announcements:
+            print("\n".join(announcements))
+        else:
+            sys.exit(1)
+    elif sys.argv[1] == "--agent-names":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 40
+        names = generate_agent_names(count)
+        if names:
+            print("\n".join(names))
+        else:
+            sys.exit(1)
     else:
         response = prompt_llm(" ".join(sys.argv[1:]))
         print(response or "Error: claude CLI unavailable or no response")
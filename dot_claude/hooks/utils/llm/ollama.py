@@ -4,22 +4,29 @@
 # dependencies = [
 #     "openai",
 #     "python-dotenv",
-#     "openai",
 # ]
 # ///
 
 import os
 import sys
+from pathlib import Path
 import traceback
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from utils.http_clients import openai_client
+from utils.llm_stream import take_first_sentence
+from utils.phrase_pool import agent_names_prompt, announcement_prompt, parse_agent_names, parse_announcements
+
 
-def prompt_llm(prompt_text):
+def prompt_llm(prompt_text, first_sentence=False):
     """
     Base Ollama LLM prompting method using GPT-OSS model.
 
     Args:
         prompt_text (str): The prompt to send to the model
+        first_sentence (bool): Stream the response and stop at the first
+            newline or sentence end
 
     Returns:
         str: The model's response text, or None if error
@@ -27,23 +34,32 @@ def prompt_llm(prompt_text):
     load_dotenv()
 
     try:
-        from openai import OpenAI
-
         # Ollama uses OpenAI-compatible API - exactly as shown in docs
-        client = OpenAI(
-            base_url="http://localhost:11434/v1",
+        client = openai_client(
             api_key="ollama",  # required, but unused
+            base_url="http://localhost:11434/v1",
+            provider="ollama",
         )
 
         # Default to 20b model, can override with OLLAMA_MODEL env var
         model = os.getenv("OLLAMA_MODEL", "gpt-oss:20b")
 
-        response = client.chat.completions.create(
+        # The budget covers gpt-oss reasoning tokens, which precede the answer
+        request = dict(
             model=model,
             messages=[{"role": "user", "content": prompt_text}],
             max_tokens=1000,
         )
 
+        if first_sentence:
+            stream = client.chat.completions.create(**request, stream=True)
+            try:
+                return take_first_sentence(c.choices[0].delta.content or "" for c in stream if c.choices)
+            finally:
+                stream.close()  # stops generation
+
+        response = client.chat.completions.create(**request)
+
         return response.choices[0].message.content.strip()
 
     except Exception as e:
@@ -86,7 +102,7 @@ Requirements:
 
 Generate ONE announcement:"""
 
-    response = prompt_llm(prompt)
+    response = prompt_llm(prompt, first_sentence=True)
 
     # Clean up response - remove quotes and extra formatting
     if response:
@@ -97,6 +113,21 @@ Generate ONE announcement:"""
     return response
 
 
+def generate_announcements(count=20, engineer_name=None):
+    """
+    Generate a batch of completion announcements for the phrase pool.
+
+    Args:
+        count (int): How many announcements to ask for
+        engineer_name (str): Address every announcement to this name, if set
+
+    Returns:
+        list[str]: Validated announcements (possibly fewer than count)
+    """
+    response = prompt_llm(announcement_prompt(count, engineer_name))
+    return parse_announcements(response, engineer_name)
+
+
 def generate_agent_name():
     """
     Generate a one-word agent name using Ollama.
@@ -172,6 +203,19 @@ Name:"""
         return random.choice(example_names)
 
 
+def generate_agent_names(count=40):
+    """
+    Generate a batch of one-word agent names for the name pool.
+
+    Args:
+        count (int): How many names to ask for
+
+    Returns:
+        list[str]: Validated names (possibly fewer than count)
+    """
+    return parse_agent_names(prompt_llm(agent_names_prompt(count)))
+
+
 def main():
     """Command line interface for testing."""
     import json
@@ -188,6 +232,21 @@ def main():
                 print(message)
             else:
                 sys.exit(1)
+        elif sys.argv[1] == "--announcements":
+            count = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 20
+            name = sys.argv[sys.argv.index("--name") + 1] if "--name" in sys.argv[:-1] else None
+            announcements = generate_announcements(count, name)
+            if announcements:
+                print("\n".join(announcements))
+            else:
+                sys.exit(1)
+        elif sys.argv[1] == "--agent-names":
+            count = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 40
+            names = generate_agent_names(count)
+            if names:
+                print("\n".join(names))
+            else:
+                sys.exit(1)
         elif sys.argv[1] == "--agent-name":
             # Generate agent name (no input needed)
             name = generate_agent_name()
@@ -201,7 +260,7 @@ def main():
                 print("Error calling Ollama API")
     else:
         print(
-            "Usage: ./ollama.py 'your prompt here' or ./ollama.py --completion or ./ollama.py --agent-name"
+            "Usage: ./ollama.py 'your prompt here' or ./ollama.py --completion, --announcements N [--name NAME], --agent-names N or --agent-name"
         )
 
 
@@ -0,0 +1,40 @@
+"""Early exit for streamed LLM completions.
+
+Completion announcements keep only their first line, yet the LLM backends
+used to wait for the whole response (up to 1000 tokens for Ollama).
+``take_first_sentence`` consumes a stream of text deltas only until the
+first newline or sentence terminator, so the announcement is ready at
+time-to-first-sentence and the caller can close the stream, which stops
+generation (and billing) for the rest.
+"""
+
+import re
+from typing import Iterable, Optional
+
+# A newline, or ., ! or ? (plus any closing quotes/brackets) followed by
+# whitespace. A terminator at the very end of the buffer is not trusted yet:
+# "v3." may continue as "v3.5".
+_SENTENCE_END = re.compile(r"\n|[.!?…]+[\"')\]]*(?=\s)")
+
+
+def take_first_sentence(deltas: Iterable[str], max_chars: int = 300) -> Optional[str]:
+    """Read ``deltas`` up to the end of the first sentence or line. None if nothing was said.
+
+    Leading blank lines are skipped. Stops after ``max_chars`` even without a
+    terminator. Closes ``deltas`` if it is a generator that was cut short.
+    """
+    text = ""
+    try:
+        for delta in deltas:
+            text += delta or ""
+            body = text.lstrip()
+            match = _SENTENCE_END.search(body)
+            if match:
+                return body[: match.end()].strip() or None
+            if len(body) >= max_chars:
+                break
+        return text.lstrip()[:max_chars].strip() or None
+    finally:
+        close = getattr(deltas, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,258 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "anthropic",
+#     "elevenlabs",
+#     "httpx[http2]",
+#     "openai",
+#     "python-dotenv",
+#     "sounddevice",
+# ]
+# ///
+"""Detached notification worker — takes LLM generation and playback off the hook path.
+
+``stop.py --notify`` used to block Claude Code's Stop event until the
+completion message was generated and spoken. Hooks now call ``notify()``,
+which drops a small job file (event, transcript path, message, notify mode)
+into a spool directory and makes sure a worker is running. The hook then
+exits in milliseconds.
+
+The worker drains the spool, waits ``COALESCE_WINDOW`` seconds to absorb
+bursts (e.g. several subagents finishing together), and delivers at most one
+notification and one completion per batch. Jobs older than ``MAX_JOB_AGE``
+are dropped, not announced. The worker exits after ``IDLE_TIMEOUT`` seconds
+without jobs. A flock keeps it single-instance.
+
+The header declares the provider SDKs the TTS and LLM backend scripts
+import, so ``build_service`` can call them in-process instead of paying a
+``uv run`` per backend. ``httpx[http2]`` lets the pooled clients in
+``utils/http_clients.py`` speak HTTP/2. Kokoro is left out on purpose: its
+model lives in ``kokoro_server.py``, and ``kokoro_tts.py`` imports
+``kokoro`` only for its one-shot fallback.
+
+Usage:
+    ./notify_worker.py                 # drain ~/.claude/data/notify-queue, then idle out
+    ./notify_worker.py --once          # drain once and exit
+"""
+
+import argparse
+import contextlib
+import fcntl
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+QUEUE_DIR = Path.home() / ".claude" / "data" / "notify-queue"
+COALESCE_WINDOW = 0.25
+MAX_JOB_AGE = 120
+IDLE_TIMEOUT = 15
+POLL_INTERVAL = 0.1
+
+COMPLETION_EVENTS = ("stop", "subagent_stop")
+
+
+def queue_dir() -> Path:
+    return Path(os.getenv("CLAUDE_NOTIFY_QUEUE") or QUEUE_DIR)
+
+
+def _lock_path(qdir: Path) -> Path:
+    return qdir / "worker.lock"
+
+
+def enqueue(
+    event: str,
+    transcript_path: Optional[str] = None,
+    message: Optional[str] = None,
+    mode: Optional[str] = None,
+    start: bool = True,
+) -> Path:
+    """Write one job to the spool and start a worker if none is running.
+
+    The job file appears atomically (written under a dot-name, then renamed)
+    so the worker never reads a partial job.
+    """
+    qdir = queue_dir()
+    qdir.mkdir(parents=True, exist_ok=True)
+    job = {
+        "event": event,
+        "transcript_path": transcript_path,
+        "message": message,
+        "mode": mode,
+        "created": time.time(),
+    }
+    name = f"{time.time_ns()}-{os.getpid()}.json"
+    tmp = qdir / f".{name}"
+    tmp.write_text(json.dumps(job))
+    os.replace(tmp, qdir / name)
+    if start:
+        start_worker(qdir)
+    return qdir / name
+
+
+def notify(event: str, transcript_path: Optional[str] = None, message: Optional[str] = None) -> None:
+    """Hook entry point: queue the announcement, or deliver inline when queuing is off or fails.
+
+    Set ``CLAUDE_NOTIFY_SYNC=1`` to deliver inline (useful when debugging backends).
+    """
+    from utils.common import get_notify_mode
+
+    job = {"event": event, "transcript_path": transcript_path, "message": message, "mode": get_notify_mode()}
+    if os.getenv("CLAUDE_NOTIFY_SYNC") != "1":
+        try:
+            enqueue(**job)
+            return
+        except OSError:
+            pass
+    deliver(job)
+
+
+def _worker_running(qdir: Path) -> bool:
+    try:
+        with open(_lock_path(qdir), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return False
+    except OSError:
+        return True
+
+
+def start_worker(qdir: Optional[Path] = None) -> None:
+    """Launch the worker detached unless one already holds the lock.
+
+    Prefers ``uv run --script`` so the worker gets its declared deps, the
+    same as ``hook_client.py`` does for the hook server.
+    """
+    import subprocess
+
+    qdir = qdir or queue_dir()
+    if _worker_running(qdir):
+        return
+    worker = str(Path(__file__).resolve())
+    for cmd in (["uv", "run", "--script", worker], [sys.executable, worker]):
+        try:
+            subprocess.Popen(
+                [*cmd, "--queue", str(qdir)],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            return
+        except OSError:
+            continue
+
+
+def _pending(qdir: Path) -> list[Path]:
+    return sorted(qdir.glob("[0-9]*.json"))
+
+
+def take_jobs(qdir: Path) -> list[dict]:
+    """Read and remove every queued job, oldest first. Unreadable jobs are discarded."""
+    jobs = []
+    for path in _pending(qdir):
+        try:
+            jobs.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            pass
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+    return jobs
+
+
+def coalesce(jobs: list[dict], now: Optional[float] = None) -> list[dict]:
+    """Reduce a burst to at most one notification and one completion.
+
+    The newest notification wins: an older "input needed" is superseded by a
+    newer one. For completions, a main-agent ``stop`` beats ``subagent_stop``
+    and the newest transcript is the one summarised.
+    """
+    now = time.time() if now is None else now
+    fresh = [j for j in jobs if now - j.get("created", 0) <= MAX_JOB_AGE]
+
+    notifications = [j for j in fresh if j.get("event") == "notification"]
+    completions = [j for j in fresh if j.get("event") in COMPLETION_EVENTS]
+    stops = [j for j in completions if j["event"] == "stop"]
+
+    batch = []
+    if notifications:
+        batch.append(notifications[-1])
+    if stops or completions:
+        batch.append((stops or completions)[-1])
+    return batch
+
+
+def deliver(job: dict) -> None:
+    """Generate and play one job, using the notify mode captured when it was queued."""
+    from utils.common import build_service
+
+    service = build_service(mode=job.get("mode"))
+    if job.get("event") == "notification":
+        service.speak_notification(message=job.get("message"))
+    else:
+        service.speak_completion(transcript_path=job.get("transcript_path"))
+
+
+def drain(qdir: Path) -> int:
+    """Deliver everything queued now (plus a short burst window). Returns jobs consumed."""
+    if not _pending(qdir):
+        return 0
+    time.sleep(COALESCE_WINDOW)
+    jobs = take_jobs(qdir)
+    for job in coalesce(jobs):
+        try:
+            deliver(job)
+        except Exception:
+            pass
+    return len(jobs)
+
+
+def run(qdir: Path, idle_timeout: float = IDLE_TIMEOUT, once: bool = False) -> None:
+    """Drain the spool until idle. Exits quietly if another worker holds the lock."""
+    qdir.mkdir(parents=True, exist_ok=True)
+    while True:
+        lock = open(_lock_path(qdir), "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return  # another worker is already running
+
+        idle_since = time.monotonic()
+        try:
+            while True:
+                if drain(qdir):
+                    idle_since = time.monotonic()
+                elif once or time.monotonic() - idle_since >= idle_timeout:
+                    break
+                else:
+                    time.sleep(POLL_INTERVAL)
+        finally:
+            lock.close()
+
+        # A hook may have queued a job after our last scan but before the lock
+        # was released; it saw the lock held and did not start a worker.
+        if once or not _pending(qdir):
+            return
+
+
+def main() -> None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # dotenv is optional
+
+    parser = argparse.ArgumentParser(description="Claude Code notification worker")
+    parser.add_argument("--queue", type=Path, default=queue_dir())
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+    args = parser.parse_args()
+    run(args.queue, args.idle_timeout, args.once)
+
+
+if __name__ == "__main__":
+    main()
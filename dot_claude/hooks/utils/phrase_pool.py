@@ -0,0 +1,387 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "python-dotenv",
+# ]
+# ///
+"""Pools of pre-generated phrases, drawn instantly and refilled in the background.
+
+Generating a completion message online costs 1-15s before anything is heard,
+and when every LLM is slow or down the hooks fell back to five fixed strings.
+``AnnouncementPool`` keeps a few dozen LLM-written announcements on disk
+(generic ones, plus ones addressing ``ENGINEER_NAME``). ``draw()`` pops one
+without touching the network. When a pool runs low it starts a detached
+``phrase_pool.py refill`` job, which asks the existing LLM backends for a
+whole batch in one request and appends the validated lines.
+
+Pools live in ``~/.claude/data/pools/<name>.json`` as JSON lists, guarded by
+a flock. A refill job holds ``<kind>.refill.lock`` so only one runs at a
+time, and is not retried within ``REFILL_BACKOFF`` seconds of the last
+attempt (e.g. no LLM is reachable).
+
+``draw_agent_name`` does the same for ``user_prompt_submit.py --name-agent``,
+which used to block the first prompt of every session on one LLM call per
+name.
+
+Usage:
+    ./phrase_pool.py refill announcements    # top up the announcement pools now
+    ./phrase_pool.py refill agent-names
+    ./phrase_pool.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fcntl
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+POOL_DIR = Path.home() / ".claude" / "data" / "pools"
+REFILL_BACKOFF = 600
+BATCH_SIZE = 20
+
+ANNOUNCEMENTS = "announcements"
+AGENT_NAMES = "agent-names"
+AGENT_NAME_BATCH = 40
+
+# Style examples for the name prompt, and the draw while the pool is empty
+EXAMPLE_AGENT_NAMES = [
+    "Phoenix", "Sage", "Nova", "Echo", "Atlas", "Cipher", "Nexus",
+    "Oracle", "Quantum", "Zenith", "Aurora", "Vortex", "Nebula",
+    "Catalyst", "Prism", "Axiom", "Helix", "Flux", "Synth", "Vertex",
+]
+
+
+def pool_dir() -> Path:
+    return Path(os.getenv("CLAUDE_POOL_DIR") or POOL_DIR)
+
+
+class PhrasePool:
+    """A bounded on-disk list of phrases; ``pop`` takes the newest."""
+
+    def __init__(self, name: str, directory: Optional[Path] = None, low_water: int = 8, capacity: int = 60) -> None:
+        self.name = name
+        self.directory = Path(directory or pool_dir())
+        self.low_water = low_water
+        self.capacity = capacity
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"{self.name}.json"
+
+    @contextlib.contextmanager
+    def _locked(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / f"{self.name}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _load(self) -> list[str]:
+        try:
+            items = json.loads(self.path.read_text())
+            return [i for i in items if isinstance(i, str)] if isinstance(items, list) else []
+        except (FileNotFoundError, json.JSONDecodeError, ValueError, OSError):
+            return []
+
+    def _save(self, items: list[str]) -> None:
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(items))
+        os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def low(self) -> bool:
+        return len(self) < self.low_water
+
+    def pop(self) -> Optional[str]:
+        """Remove and return one phrase, or None when the pool is empty."""
+        try:
+            with self._locked():
+                items = self._load()
+                if not items:
+                    return None
+                item = items.pop()
+                self._save(items)
+                return item
+        except OSError:
+            return None
+
+    def extend(self, phrases: list[str]) -> int:
+        """Add phrases not already pooled, keeping at most ``capacity``. Returns how many were added."""
+        try:
+            with self._locked():
+                items = self._load()
+                seen = {i.casefold() for i in items}
+                fresh = [p for p in dict.fromkeys(phrases) if p.casefold() not in seen]
+                # Shuffled so consecutive draws don't replay one batch in order
+                random.shuffle(fresh)
+                items = (fresh + items)[: self.capacity]
+                self._save(items)
+                return len(fresh)
+        except OSError:
+            return 0
+
+
+# ---------------------------------------------------------------------------
+# Batch prompts and validation, shared by the utils/llm scripts
+# ---------------------------------------------------------------------------
+
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def parse_phrases(text: Optional[str], max_words: int = 12, max_chars: int = 80) -> list[str]:
+    """Clean a one-per-line LLM response into speakable phrases, dropping anything malformed."""
+    phrases = []
+    for line in (text or "").splitlines():
+        line = _LIST_MARKER.sub("", line).strip().strip('"').strip("'").strip()
+        if not line or len(line) > max_chars or len(line.split()) > max_words:
+            continue
+        if line.endswith(":") or any(c in line for c in "`*#[]{}<>"):
+            continue  # headings, markdown, template residue
+        phrases.append(line)
+    return list(dict.fromkeys(phrases))
+
+
+def announcement_prompt(count: int = BATCH_SIZE, engineer_name: Optional[str] = None) -> str:
+    """Prompt asking for ``count`` completion announcements, one per line."""
+    if engineer_name:
+        style = (
+            f"Every announcement must address the engineer by name, {engineer_name}, in a natural way.\n"
+            f"Examples: {engineer_name}, all set! / Ready for you, {engineer_name}! / Complete, {engineer_name}!\n"
+        )
+    else:
+        style = "Examples: Work complete! / All done! / Task finished! / Ready for your next move!\n"
+    return (
+        f"Generate {count} different short, friendly spoken announcements for when an AI coding assistant "
+        "finishes a task.\n"
+        "Rules: each under 12 words, natural conversational language suitable for text-to-speech, "
+        "varied wording, no numbering, no quotes, no formatting.\n"
+        f"{style}"
+        "Return ONLY the announcements, one per line."
+    )
+
+
+def parse_announcements(text: Optional[str], engineer_name: Optional[str] = None) -> list[str]:
+    phrases = parse_phrases(text)
+    if engineer_name:
+        phrases = [p for p in phrases if engineer_name.casefold() in p.casefold()]
+    return phrases
+
+
+def agent_names_prompt(count: int = AGENT_NAME_BATCH) -> str:
+    """Prompt asking for ``count`` one-word agent names, one per line."""
+    return (
+        f"Generate {count} unique agent/assistant names.\n"
+        "Requirements: single word only (no spaces, hyphens, or punctuation), abstract and memorable, "
+        "professional sounding, easy to pronounce.\n"
+        f"Similar style to these examples, but not these: {', '.join(EXAMPLE_AGENT_NAMES[:10])}\n"
+        "Return ONLY the names, one per line."
+    )
+
+
+def parse_agent_names(text: Optional[str]) -> list[str]:
+    """Single alphanumeric words of 3-20 characters, capitalised."""
+    names = []
+    for phrase in parse_phrases(text, max_words=1, max_chars=20):
+        name = phrase.rstrip(".,!")
+        if name.isalnum() and len(name) >= 3:
+            names.append(name.capitalize())
+    return list(dict.fromkeys(names))
+
+
+# ---------------------------------------------------------------------------
+# Announcements
+# ---------------------------------------------------------------------------
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.casefold()).strip("-")
+
+
+class AnnouncementPool:
+    """Generic and ``ENGINEER_NAME``-personalised completion announcements.
+
+    ``draw`` picks a personalised one about 30% of the time when a name is
+    set (matching the LLM prompts), falls back to the other pool when one is
+    empty, and starts a background refill when either runs low.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, engineer_name: Optional[str] = None) -> None:
+        self.directory = directory
+        if engineer_name is None:
+            engineer_name = os.getenv("ENGINEER_NAME", "").strip()
+        self.engineer_name = engineer_name or None
+        self.generic = PhrasePool(ANNOUNCEMENTS, directory)
+        self.personal = (
+            PhrasePool(f"{ANNOUNCEMENTS}-{_slug(self.engineer_name)}", directory) if self.engineer_name else None
+        )
+
+    def pools(self) -> list[tuple[PhrasePool, Optional[str]]]:
+        """Each pool with the name its phrases address."""
+        pools = [(self.generic, None)]
+        if self.personal is not None:
+            pools.append((self.personal, self.engineer_name))
+        return pools
+
+    def draw(self, refill: bool = True) -> Optional[str]:
+        """Pop an announcement without blocking on an LLM. None when both pools are empty."""
+        order = [self.generic, self.personal] if self.personal else [self.generic]
+        if len(order) > 1 and random.random() < 0.3:
+            order.reverse()
+        phrase = None
+        for pool in order:
+            phrase = pool.pop()
+            if phrase:
+                break
+        if refill and any(pool.low() for pool, _ in self.pools()):
+            start_refill(ANNOUNCEMENTS, self.directory)
+        return phrase
+
+
+def refill_announcements(directory: Optional[Path] = None) -> int:
+    """Top up each low announcement pool from the first LLM backend that answers."""
+    from utils.common import Backend, build_service
+
+    added = 0
+    backends = [b for b in build_service(mode="silent").llm_backends if b.is_available()]
+    for pool, name in AnnouncementPool(directory).pools():
+        if not pool.low():
+            continue
+        args = ["--announcements", str(BATCH_SIZE)] + (["--name", name] if name else [])
+        for backend in backends:
+            runner = Backend(backend.name, backend.script, backend.env_key, timeout=90)
+            phrases = parse_announcements(runner.run(*args), name)
+            if phrases:
+                added += pool.extend(phrases)
+                break
+    return added
+
+
+# ---------------------------------------------------------------------------
+# Agent names
+# ---------------------------------------------------------------------------
+
+
+def agent_name_pool(directory: Optional[Path] = None) -> PhrasePool:
+    return PhrasePool(AGENT_NAMES, directory, low_water=10, capacity=120)
+
+
+def draw_agent_name(directory: Optional[Path] = None, refill: bool = True) -> str:
+    """Pop a pre-generated agent name, starting a background refill when the pool runs low.
+
+    Never waits on an LLM: while the pool is empty an example name is used.
+    """
+    pool = agent_name_pool(directory)
+    name = pool.pop()
+    if refill and pool.low():
+        start_refill(AGENT_NAMES, directory)
+    return name or random.choice(EXAMPLE_AGENT_NAMES)
+
+
+def refill_agent_names(directory: Optional[Path] = None) -> int:
+    """Top up the agent-name pool from the first LLM backend that answers."""
+    from utils.common import Backend, build_service
+
+    pool = agent_name_pool(directory)
+    if not pool.low():
+        return 0
+    for backend in build_service(mode="silent").llm_backends:
+        if not backend.is_available():
+            continue
+        runner = Backend(backend.name, backend.script, backend.env_key, timeout=90)
+        names = parse_agent_names(runner.run("--agent-names", str(AGENT_NAME_BATCH)))
+        if names:
+            return pool.extend(names)
+    return 0
+
+
+REFILLERS: dict[str, Callable[[Optional[Path]], int]] = {
+    ANNOUNCEMENTS: refill_announcements,
+    AGENT_NAMES: refill_agent_names,
+}
+
+
+# ---------------------------------------------------------------------------
+# Background refill
+# ---------------------------------------------------------------------------
+
+
+def _refill_lock(kind: str, directory: Optional[Path]) -> Path:
+    return Path(directory or pool_dir()) / f"{kind}.refill.lock"
+
+
+def start_refill(kind: str, directory: Optional[Path] = None) -> None:
+    """Launch ``refill <kind>`` detached, unless one is running or was tried recently."""
+    import subprocess
+
+    lock = _refill_lock(kind, directory)
+    try:
+        if time.time() - lock.stat().st_mtime < REFILL_BACKOFF:
+            return
+    except OSError:
+        pass  # never attempted
+
+    script = str(Path(__file__).resolve())
+    extra = ["--dir", str(directory)] if directory else []
+    for cmd in (["uv", "run", "--script", script], [sys.executable, script]):
+        try:
+            subprocess.Popen(
+                [*cmd, "refill", kind, *extra],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            return
+        except OSError:
+            continue
+
+
+def refill(kind: str, directory: Optional[Path] = None) -> int:
+    """Run one refill of ``kind`` under its lock. Returns phrases added (0 if another refill holds the lock)."""
+    lock_path = _refill_lock(kind, directory)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return 0
+        os.utime(lock_path)  # starts the backoff window
+        return REFILLERS[kind](directory)
+
+
+def main() -> None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # dotenv is optional
+
+    parser = argparse.ArgumentParser(description="Pre-generated phrase pools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    refill_cmd = sub.add_parser("refill")
+    refill_cmd.add_argument("kind", choices=sorted(REFILLERS))
+    refill_cmd.add_argument("--dir", type=Path, default=None)
+    sub.add_parser("stats")
+    args = parser.parse_args()
+
+    if args.command == "refill":
+        print(f"{args.kind}: added {refill(args.kind, args.dir)}")
+    else:
+        for path in sorted(pool_dir().glob("*.json")):
+            print(f"{path.stem}: {len(PhrasePool(path.stem))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Mtime-keyed session state for the status line renderers.
+
+Claude Code runs the status line command on every refresh. The renderers
+used to parse ``.claude/data/sessions/<id>.json`` each time, and that file
+grows with every prompt. They only need the agent name, the latest prompt
+and the extras. ``SessionStateCache`` keeps exactly that digest in
+``~/.claude/data/status-cache/<id>.json``, keyed by the session file's path,
+``st_mtime_ns`` and size. A render therefore costs one ``stat`` plus one
+small read, however long the session gets. The session file is parsed again
+only after ``user_prompt_submit.py`` (or anything else) has changed it.
+
+Stdlib only, with nothing heavier than ``json`` imported, because it sits
+on the status line's hot path.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+STATUS_CACHE_DIR = Path.home() / ".claude" / "data" / "status-cache"
+SESSIONS_DIR = Path(".claude") / "data" / "sessions"
+
+# Longer prompts are cut in the digest; renderers show at most ~100 chars.
+MAX_PROMPT_CHARS = 500
+
+# Digests not rewritten for this long (their session went quiet) are deleted
+# on the next write; a session that comes back is simply digested again.
+MAX_AGE = 7 * 86400
+
+
+def digest_session(data: dict) -> dict:
+    """The part of a session file the status lines display."""
+    prompts = data.get("prompts") or []
+    last = prompts[-1] if prompts else None
+    return {
+        "agent_name": data.get("agent_name"),
+        "last_prompt": last[:MAX_PROMPT_CHARS] if isinstance(last, str) else last,
+        "prompt_count": len(prompts),
+        "extras": data.get("extras") or {},
+    }
+
+
+class SessionStateCache:
+    """Session digests, refreshed only when the session file's mtime or size changes.
+
+    There is one digest file per session. Writing one also deletes those
+    untouched for ``max_age`` seconds, so ended sessions don't pile up.
+    Writes happen only when a session file changed, not on every render.
+    """
+
+    def __init__(
+        self, sessions_dir: Path = SESSIONS_DIR, cache_dir: Path = STATUS_CACHE_DIR, max_age: float = MAX_AGE
+    ) -> None:
+        self.sessions_dir = Path(sessions_dir)
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self._entries: dict[str, dict] = {}
+
+    def _path(self, session_id: str) -> Path:
+        return self.cache_dir / f"{session_id}.json"
+
+    def _read(self, session_id: str) -> dict:
+        if session_id not in self._entries:
+            try:
+                entry = json.loads(self._path(session_id).read_bytes())
+            except (OSError, ValueError):
+                entry = None
+            self._entries[session_id] = entry if isinstance(entry, dict) else {}
+        return self._entries[session_id]
+
+    def _write(self, session_id: str, entry: dict) -> None:
+        self._entries[session_id] = entry
+        path = self._path(session_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(entry, separators=(",", ":"), ensure_ascii=False))
+            os.replace(tmp, path)
+        except OSError:
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete digests (and stray temp files) not modified for ``max_age`` seconds."""
+        cutoff = time.time() - self.max_age
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for item in it:
+                    try:
+                        if item.stat().st_mtime < cutoff:
+                            os.unlink(item.path)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+
+    def load(self, session_id: str) -> tuple[Optional[dict], Optional[str]]:
+        """``(digest, None)`` for the session, or ``(None, error)`` when its file is unusable."""
+        session_file = self.sessions_dir / f"{session_id}.json"
+        try:
+            st = os.stat(session_file)
+        except FileNotFoundError:
+            return None, f"Session file {session_file} does not exist"
+        except OSError as e:
+            return None, f"Error reading session file: {e}"
+
+        key = [os.path.abspath(session_file), st.st_mtime_ns, st.st_size]
+        entry = self._read(session_id)
+        if entry.get("key") == key:
+            return entry["state"], None
+
+        try:
+            data = json.loads(session_file.read_bytes())
+            state = digest_session(data)
+        except Exception as e:
+            return None, f"Error reading session file: {str(e)}"
+        self._write(session_id, {**entry, "key": key, "state": state})
+        return state, None
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Sampled status line telemetry with memory-mapped counters.
+
+Every status line version used to append the full ``input_data`` and output
+to ``logs/status_line.json`` on each refresh, by rewriting the whole array.
+Now whether a render is sampled (``CLAUDE_STATUS_SAMPLE``, default 2%) is
+decided in memory before anything else, and an unsampled render touches no
+file at all. Errors are sampled like any other render.
+
+A sampled render bumps counters and a latency histogram in a small
+memory-mapped file per version (``~/.claude/data/status-telemetry/<v>.bin``),
+weighted by ``1 / rate`` so the counts estimate all renders, and appends one
+JSONL line to ``logs/status_line.jsonl``. When ``FLUSH_INTERVAL`` seconds
+have passed it also appends a snapshot of the aggregates to
+``logs/status_line_stats.jsonl``, so the data survives alongside the other
+hook logs.
+
+``CLAUDE_STATUS_TELEMETRY=full`` samples every render (the old behaviour, as
+JSONL, with exact counts); ``off`` records nothing.
+
+Usage:
+    python3 ~/.claude/hooks/utils/status_telemetry.py stats
+    python3 ~/.claude/hooks/utils/status_telemetry.py reset
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Taken at import, which status lines do first thing: render latency covers
+# everything the script does after the interpreter is up.
+STARTED = time.perf_counter()
+
+TELEMETRY_DIR = Path.home() / ".claude" / "data" / "status-telemetry"
+LOG_DIR = Path("logs")
+DEFAULT_SAMPLE_RATE = 0.02
+FLUSH_INTERVAL = 300.0
+
+# Histogram bucket upper bounds in milliseconds; a final bucket takes the rest.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 1000)
+
+_COUNTERS = ("renders", "errors", "logged", "total_us", "last_flush")
+_RENDERS, _ERRORS, _LOGGED, _TOTAL_US, _LAST_FLUSH = range(len(_COUNTERS))
+_SLOTS = len(_COUNTERS) + len(BUCKETS_MS) + 1
+_LAYOUT = struct.Struct(f"<{_SLOTS}Q")
+
+
+def telemetry_mode() -> str:
+    """``sampled`` (default), ``full`` or ``off``, from CLAUDE_STATUS_TELEMETRY."""
+    mode = os.getenv("CLAUDE_STATUS_TELEMETRY", "sampled").strip().lower()
+    return mode if mode in ("sampled", "full", "off") else "sampled"
+
+
+def sample_rate() -> float:
+    try:
+        return min(1.0, max(0.0, float(os.environ["CLAUDE_STATUS_SAMPLE"])))
+    except (KeyError, ValueError):
+        return DEFAULT_SAMPLE_RATE
+
+
+def _bucket(elapsed_ms: float) -> int:
+    for i, bound in enumerate(BUCKETS_MS):
+        if elapsed_ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+class RenderStats:
+    """Render counters and a latency histogram for one status line version.
+
+    Backed by a fixed-size memory-mapped file, updated under ``flock`` so
+    concurrent renders (several panes) don't lose counts. Only sampled
+    renders are recorded, each with a ``weight``, so render and error counts
+    and the histogram are estimates; ``logged`` counts the recorded samples.
+    """
+
+    def __init__(self, version: str, directory: Path = TELEMETRY_DIR) -> None:
+        self.path = Path(directory) / f"{version}.bin"
+
+    def _update(self, change) -> list[int]:
+        """Apply ``change`` to the decoded counters in place and return them."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size < _LAYOUT.size:
+                os.ftruncate(fd, _LAYOUT.size)
+            with mmap.mmap(fd, _LAYOUT.size) as mapped:
+                values = list(_LAYOUT.unpack_from(mapped))
+                change(values)
+                _LAYOUT.pack_into(mapped, 0, *values)
+            return values
+        finally:
+            os.close(fd)
+
+    def record(self, elapsed: float, error: bool = False, weight: int = 1) -> bool:
+        """Count one sampled render (or error) as ``weight``. True if a periodic flush is due.
+
+        When it is, the caller appends ``snapshot`` to the stats log.
+        """
+        now = int(time.time())
+        due = False
+
+        def change(values: list[int]) -> None:
+            nonlocal due
+            if error:
+                values[_ERRORS] += weight
+            else:
+                values[_RENDERS] += weight
+                values[_TOTAL_US] += int(elapsed * 1e6) * weight
+                values[len(_COUNTERS) + _bucket(elapsed * 1000)] += weight
+            values[_LOGGED] += 1
+            if not values[_LAST_FLUSH]:
+                values[_LAST_FLUSH] = now  # a new file starts its first interval
+            elif now - values[_LAST_FLUSH] >= FLUSH_INTERVAL:
+                values[_LAST_FLUSH] = now
+                due = True
+
+        self._update(change)
+        return due
+
+    def snapshot(self) -> dict:
+        """Counters, mean latency and the histogram as a JSON-ready dict."""
+        try:
+            values = list(_LAYOUT.unpack(self.path.read_bytes()[: _LAYOUT.size]))
+        except (OSError, struct.error):
+            values = [0] * _SLOTS
+        counters = dict(zip(_COUNTERS, values))
+        histogram = values[len(_COUNTERS):]
+        labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        renders = counters["renders"]
+        return {
+            "renders": renders,
+            "errors": counters["errors"],
+            "logged": counters["logged"],
+            "mean_ms": round(counters["total_us"] / renders / 1000, 3) if renders else None,
+            "histogram": dict(zip(labels, histogram)),
+        }
+
+    def reset(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def record_render(
+    version: str,
+    input_data: dict,
+    output: str,
+    error: Optional[str] = None,
+    log_dir: Path = LOG_DIR,
+    directory: Path = TELEMETRY_DIR,
+) -> None:
+    """Count and log one status line render if it is sampled.
+
+    ``error`` marks an error report (``No session data``) rather than a
+    render. Telemetry failures never break the status line.
+    """
+    mode = telemetry_mode()
+    if mode == "off":
+        return
+    rate = 1.0 if mode == "full" else sample_rate()
+    if rate <= 0 or random.random() >= rate:
+        return  # the common case: no file is opened
+    elapsed = time.perf_counter() - STARTED
+    stats = RenderStats(version, directory)
+    try:
+        flush_due = stats.record(elapsed, error=error is not None, weight=max(1, round(1 / rate)))
+    except OSError:
+        flush_due = False
+
+    # Only sampled renders pay for this import (rotation pulls in gzip)
+    from utils.event_store import append_event
+
+    try:
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "version": version,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "input_data": input_data,
+            "status_line_output": output,
+        }
+        if error:
+            entry["error"] = error
+        append_event(Path(log_dir) / "status_line.jsonl", entry)
+        if flush_due:
+            append_event(
+                Path(log_dir) / "status_line_stats.jsonl",
+                {"timestamp": datetime.now().isoformat(), "version": version, **stats.snapshot()},
+            )
+    except OSError:
+        pass
+
+
+def main() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    versions = sorted(p.stem for p in TELEMETRY_DIR.glob("*.bin"))
+    if command == "stats":
+        for version in versions:
+            print(json.dumps({"version": version, **RenderStats(version).snapshot()}))
+    elif command == "reset":
+        for version in versions:
+            RenderStats(version).reset()
+    else:
+        print("Usage: status_telemetry.py [stats|reset]", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
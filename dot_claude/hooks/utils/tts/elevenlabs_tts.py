@@ -4,6 +4,7 @@
 # dependencies = [
 #     "elevenlabs",
 #     "python-dotenv",
+#     "sounddevice",
 # ]
 # ///
 
@@ -12,6 +13,98 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from utils.audio_cache import AudioCache, cache_key, play_cached
+from utils.audio_stream import play_stream, to_wav
+from utils.http_clients import elevenlabs_client
+
+VOICE_ID = "WejK3H1m7MI9CHnIjW9K"  # Specified voice
+MODEL_ID = "eleven_turbo_v2_5"
+OUTPUT_FORMAT = "mp3_44100_128"
+
+# Streaming mode asks for raw PCM so frames can go to the sound device as
+# they arrive, with no MP3 decoder in between.
+STREAM_FORMAT = "pcm_24000"
+STREAM_SAMPLE_RATE = 24000
+
+
+def _streaming():
+    return os.getenv("ELEVENLABS_STREAM", "1") != "0"
+
+
+def _key(text, output_format):
+    return cache_key("elevenlabs", VOICE_ID, f"{MODEL_ID}/{output_format}", text)
+
+
+def _client():
+    api_key = os.getenv('ELEVENLABS_API_KEY')
+    if not api_key:
+        raise RuntimeError("ELEVENLABS_API_KEY not found in environment variables")
+    return elevenlabs_client(api_key)
+
+
+def synthesize(text, output_format=OUTPUT_FORMAT):
+    """Render ``text`` with ElevenLabs Turbo v2.5 and return the encoded audio. Raises on failure."""
+    audio = _client().text_to_speech.convert(
+        text=text,
+        voice_id=VOICE_ID,
+        model_id=MODEL_ID,
+        output_format=output_format,
+    )
+    return b"".join(audio)
+
+
+def stream(text):
+    """Play ``text`` as it downloads; returns the PCM that was received. Raises on failure."""
+    chunks = _client().text_to_speech.stream(
+        text=text,
+        voice_id=VOICE_ID,
+        model_id=MODEL_ID,
+        output_format=STREAM_FORMAT,
+    )
+    return play_stream(chunks, STREAM_SAMPLE_RATE)
+
+
+def speak(text):
+    """Play ``text`` from the audio cache, or synthesize, cache and play it. Raises on failure.
+
+    Streams by default, so playback starts on the first frames and the
+    received PCM is cached as WAV afterwards. ELEVENLABS_STREAM=0 downloads
+    the whole MP3 before playing.
+    """
+    cache = AudioCache()
+    if _streaming():
+        key = _key(text, STREAM_FORMAT)
+        if not play_cached(cache, key):
+            cache.store(key, to_wav(stream(text), STREAM_SAMPLE_RATE), "wav")
+        return
+
+    key = _key(text, OUTPUT_FORMAT)
+    if play_cached(cache, key):
+        return
+
+    from elevenlabs import play
+
+    audio = synthesize(text)
+    cache.store(key, audio, "mp3")
+    play(audio)
+
+
+def render(texts):
+    """Synthesize ``texts`` into the audio cache, in the format ``speak`` looks up, without playing."""
+    cache = AudioCache()
+    output_format = STREAM_FORMAT if _streaming() else OUTPUT_FORMAT
+    for text in texts:
+        key = _key(text, output_format)
+        if cache.lookup(key) is not None:
+            continue
+        audio = synthesize(text, output_format)
+        if output_format == STREAM_FORMAT:
+            cache.store(key, to_wav(audio, STREAM_SAMPLE_RATE), "wav")
+        else:
+            cache.store(key, audio, "mp3")
+
+
 def main():
     """
     ElevenLabs Turbo v2.5 TTS Script
@@ -22,9 +115,11 @@ def main():
     Usage:
     - ./eleven_turbo_tts.py                    # Uses default text
     - ./eleven_turbo_tts.py "Your custom text" # Uses provided text
+    - ./eleven_turbo_tts.py --render "A" "B"   # Cache phrases without playing
     
     Features:
     - Fast generation (optimized for real-time use)
+    - Streamed playback: audio starts on the first received frames
     - High-quality voice synthesis
     - Stable production model
     - Cost-effective for high-volume usage
@@ -42,11 +137,11 @@ def main():
         sys.exit(1)
     
     try:
-        from elevenlabs.client import ElevenLabs
-        from elevenlabs import play
-        
-        # Initialize client
-        elevenlabs = ElevenLabs(api_key=api_key)
+        import elevenlabs  # noqa: F401 — fail early with the install hint below
+
+        if sys.argv[1:2] == ["--render"]:
+            render(sys.argv[2:])
+            return
         
         print("🎙️  ElevenLabs Turbo v2.5 TTS")
         print("=" * 40)
@@ -62,14 +157,7 @@ def main():
         
         try:
             # Generate and play audio directly
-            audio = elevenlabs.text_to_speech.convert(
-                text=text,
-                voice_id="WejK3H1m7MI9CHnIjW9K",  # Specified voice
-                model_id="eleven_turbo_v2_5",
-                output_format="mp3_44100_128",
-            )
-            
-            play(audio)
+            speak(text)
             print("✅ Playback complete!")
             
         except Exception as e:
@@ -0,0 +1,168 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "kokoro>=0.9.4",
+#     "sounddevice",
+# ]
+# ///
+
+"""
+Warm Kokoro synthesis server — keeps KPipeline loaded behind a Unix socket.
+
+kokoro_tts.py used to build a KPipeline and load Kokoro-82M on every call,
+which takes seconds before the first sample plays. This server loads one
+pipeline per language (voices are cached by the pipeline) and plays each
+request's segments on the sound device as soon as they are synthesized, so
+time-to-first-audio is one segment's synthesis instead of a model load.
+Once playback finishes the clip is written to the audio cache under the same
+key kokoro_tts.py looks up, so a repeated phrase plays from disk.
+
+Protocol: the client sends one JSON object ({"text", "voice", "speed"}),
+shuts down its write side, and reads back {"ok": true} or
+{"ok": false, "error": "..."} once playback finishes; caching happens after
+the response is sent. Requests are served one at a time (there is one sound
+device).
+
+The server pre-warms KOKORO_VOICE at startup, exits after IDLE_TIMEOUT
+seconds without requests, and is started on demand by kokoro_tts.py.
+
+Usage:
+    ./kokoro_server.py                       # serve on ~/.claude/data/kokoro.sock
+    ./kokoro_server.py --socket /tmp/k.sock --idle-timeout 600
+"""
+
+import argparse
+import contextlib
+import fcntl
+import json
+import os
+import socket
+from pathlib import Path
+
+from kokoro_tts import cache_wav, to_wav
+
+SOCKET_PATH = Path.home() / ".claude" / "data" / "kokoro.sock"
+IDLE_TIMEOUT = 30 * 60
+SAMPLE_RATE = 24000
+
+_DEFAULT_VOICE = "af_heart"
+
+# lang_code is determined by voice prefix: a=American, b=British
+_LANG_CODE = {"a": "a", "b": "b"}
+
+
+class Synthesizer:
+    """Kokoro pipelines kept warm per language, streaming segments to the sound device."""
+
+    def __init__(self) -> None:
+        self._pipelines = {}
+
+    def pipeline(self, voice: str):
+        from kokoro import KPipeline
+
+        lang_code = _LANG_CODE.get(voice[0], "a")
+        if lang_code not in self._pipelines:
+            self._pipelines[lang_code] = KPipeline(lang_code=lang_code)
+        return self._pipelines[lang_code]
+
+    def warm(self, voice: str) -> None:
+        pipeline = self.pipeline(voice)
+        pipeline.load_voice(voice)
+
+    def speak(self, text: str, voice: str, speed: float = 1.0) -> bytes | None:
+        """Play ``text`` as it is synthesized; returns the clip as WAV bytes, or None if silent."""
+        import numpy as np
+        import sounddevice as sd
+
+        pipeline = self.pipeline(voice)
+        played = []
+        with sd.OutputStream(samplerate=SAMPLE_RATE, channels=1, dtype="float32") as stream:
+            for _, _, audio in pipeline(text, voice=voice, speed=speed):
+                if audio is not None:
+                    samples = np.asarray(audio, dtype=np.float32)
+                    stream.write(samples.reshape(-1, 1))
+                    played.append(samples)
+        return to_wav(np.concatenate(played)) if played else None
+
+
+def _recv_all(conn: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        data = conn.recv(65536)
+        if not data:
+            return b"".join(chunks)
+        chunks.append(data)
+
+
+def handle(conn: socket.socket, synth) -> None:
+    wav = None
+    try:
+        request = json.loads(_recv_all(conn))
+        text = str(request.get("text", "")).strip()
+        if not text:
+            raise ValueError("empty text")
+        voice = request.get("voice") or _DEFAULT_VOICE
+        speed = float(request.get("speed", 1.0))
+        wav = synth.speak(text, voice, speed)
+        response = {"ok": True}
+    except Exception as e:
+        response = {"ok": False, "error": str(e)}
+    with contextlib.suppress(OSError):
+        conn.sendall(json.dumps(response).encode("utf-8"))
+    # The cache key has no speed, so only the client's default-speed clips are stored.
+    if wav and speed == 1.0:
+        with contextlib.suppress(OSError):
+            cache_wav(text, voice, wav)
+
+
+def serve(socket_path: Path, synth, idle_timeout: float = IDLE_TIMEOUT, warm_voice: str = "") -> None:
+    """Serve requests until idle. Exits quietly if another server holds the lock."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    lock = open(socket_path.with_name(socket_path.name + ".lock"), "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return  # another server is already running
+
+    if warm_voice:
+        with contextlib.suppress(Exception):
+            synth.warm(warm_voice)
+
+    with contextlib.suppress(FileNotFoundError):
+        socket_path.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    server.settimeout(idle_timeout)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            with conn:
+                conn.settimeout(None)
+                handle(conn, synth)
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        lock.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Warm Kokoro TTS server")
+    parser.add_argument("--socket", type=Path, default=Path(os.getenv("KOKORO_SOCKET", SOCKET_PATH)))
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    args = parser.parse_args()
+    serve(args.socket, Synthesizer(), args.idle_timeout, os.getenv("KOKORO_VOICE", _DEFAULT_VOICE))
+
+
+if __name__ == "__main__":
+    main()
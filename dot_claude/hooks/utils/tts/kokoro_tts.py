@@ -14,6 +14,13 @@ Downloads the Kokoro-82M v1.0 model from Hugging Face on first run;
 subsequent runs use the local HF cache. Produces higher-quality, more varied
 speech than macOS `say`.
 
+Synthesis normally happens in kokoro_server.py, which keeps the model
+loaded, streams segments to the sound device as they are ready and then
+stores the clip in the audio cache; this script is a thin client for it.
+When the server is not running, the client starts it for next time and
+synthesizes one-shot in-process as before. Set KOKORO_SERVER=0 to always
+synthesize one-shot.
+
 Voice is controlled by the KOKORO_VOICE environment variable.
 Default: af_heart (warm American female, closest to "Her" aesthetic).
 
@@ -23,41 +30,166 @@ British female:  bf_emma, bf_alice, bf_isabella, bf_lily
 Usage:
     ./kokoro_tts.py "Text to speak"
     KOKORO_VOICE=bf_emma ./kokoro_tts.py "Text to speak"
+    ./kokoro_tts.py --render "A" "B"       # Cache phrases without playing
 """
 
+import io
+import json
 import os
+import socket
+import subprocess
 import sys
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from utils.audio_cache import AudioCache, cache_key, play_cached
 
 _DEFAULT_VOICE = "af_heart"
 
 # lang_code is determined by voice prefix: a=American, b=British
 _LANG_CODE = {"a": "a", "b": "b"}
 
+SOCKET_PATH = os.getenv("KOKORO_SOCKET") or os.path.expanduser("~/.claude/data/kokoro.sock")
+SERVER_TIMEOUT = 60
+SAMPLE_RATE = 24000
+MODEL = "kokoro-82m-v1.0"
 
-def main():
-    text = " ".join(sys.argv[1:]).strip() if len(sys.argv) > 1 else "Task complete!"
-    if not text:
-        sys.exit(1)
 
-    try:
-        from kokoro import KPipeline
-        import sounddevice as sd
-        import numpy as np
+def _key(text, voice):
+    return cache_key("kokoro", voice, MODEL, text)
 
-        voice = os.getenv("KOKORO_VOICE", _DEFAULT_VOICE)
-        lang_code = _LANG_CODE.get(voice[0], "a")  # derive from voice prefix
 
-        pipeline = KPipeline(lang_code=lang_code)
+def cache_wav(text, voice, wav):
+    """Store ``wav`` as the cached audio for ``text`` spoken in ``voice``."""
+    AudioCache().store(_key(text, voice), wav, "wav")
 
-        samples = []
-        for _, _, audio in pipeline(text, voice=voice, speed=1.0):
-            samples.append(audio)
 
-        if samples:
-            audio_out = np.concatenate(samples)
-            sd.play(audio_out, samplerate=24000)
-            sd.wait()
+def _via_server(text, voice):
+    """Speak through the warm server. Returns its response dict, or None if unreachable."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(SERVER_TIMEOUT)
+    try:
+        sock.connect(SOCKET_PATH)
+    except OSError:
+        sock.close()
+        return None
+
+    with sock:
+        sock.sendall(json.dumps({"text": text, "voice": voice, "speed": 1.0}).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            chunks.append(data)
+    try:
+        return json.loads(b"".join(chunks))
+    except ValueError:
+        return {"ok": False, "error": "server closed the connection"}
+
+
+def _start_server():
+    """Launch kokoro_server.py detached so the next call finds the model warm."""
+    server = os.path.join(os.path.dirname(os.path.realpath(__file__)), "kokoro_server.py")
+    for cmd in (["uv", "run", "--script", server], [sys.executable, server]):
+        try:
+            subprocess.Popen(
+                [*cmd, "--socket", SOCKET_PATH],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            return
+        except OSError:
+            continue
+
+
+def speak(text):
+    """Speak ``text`` via the warm server, or one-shot if it is not running. Raises on failure."""
+    voice = os.getenv("KOKORO_VOICE", _DEFAULT_VOICE)
+    if play_cached(AudioCache(), _key(text, voice)):
+        return
+    if os.getenv("KOKORO_SERVER", "1") != "0":
+        response = _via_server(text, voice)
+        if response is not None:
+            if not response.get("ok"):
+                raise RuntimeError(response.get("error", "kokoro server failed"))
+            return
+        _start_server()
+    speak_once(text, voice)
+
+
+def _synthesize(text, voice):
+    """Load Kokoro and synthesize ``text``; returns float32 samples or None."""
+    from kokoro import KPipeline
+    import numpy as np
+
+    lang_code = _LANG_CODE.get(voice[0], "a")  # derive from voice prefix
+
+    pipeline = KPipeline(lang_code=lang_code)
+
+    samples = []
+    for _, _, audio in pipeline(text, voice=voice, speed=1.0):
+        samples.append(audio)
+    return np.concatenate(samples) if samples else None
+
+
+def to_wav(samples):
+    """Encode float32 samples as 16-bit mono WAV bytes for the audio cache."""
+    import numpy as np
+
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+def speak_once(text, voice=None):
+    """Load Kokoro, synthesize ``text``, cache and play it, all in this process. Raises on failure."""
+    import sounddevice as sd
+
+    voice = voice or os.getenv("KOKORO_VOICE", _DEFAULT_VOICE)
+    audio_out = _synthesize(text, voice)
+    if audio_out is not None:
+        cache_wav(text, voice, to_wav(audio_out))
+        sd.play(audio_out, samplerate=SAMPLE_RATE)
+        sd.wait()
+
+
+def render(texts):
+    """Synthesize ``texts`` into the audio cache without playing them."""
+    voice = os.getenv("KOKORO_VOICE", _DEFAULT_VOICE)
+    cache = AudioCache()
+    for text in texts:
+        key = _key(text, voice)
+        if cache.lookup(key) is None:
+            samples = _synthesize(text, voice)
+            if samples is not None:
+                cache.store(key, to_wav(samples), "wav")
 
+
+def main():
+    if sys.argv[1:2] == ["--render"]:
+        try:
+            render(sys.argv[2:])
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    text = " ".join(sys.argv[1:]).strip() if len(sys.argv) > 1 else "Task complete!"
+    if not text:
+        sys.exit(1)
+
+    try:
+        speak(text)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
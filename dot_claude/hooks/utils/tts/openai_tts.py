@@ -3,19 +3,84 @@
 # requires-python = ">=3.8"
 # dependencies = [
 #     "openai",
-#     "openai[voice_helpers]",
 #     "python-dotenv",
+#     "sounddevice",
 # ]
 # ///
 
 import os
 import sys
-import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from utils.audio_cache import AudioCache, cache_key, play_cached
+from utils.audio_stream import play_stream
+from utils.http_clients import openai_client
 
-async def main():
+MODEL = "gpt-4o-mini-tts"
+VOICE = "nova"
+INSTRUCTIONS = "Speak in a cheerful, positive yet professional tone."
+SAMPLE_RATE = 24000  # response_format="pcm" is 24 kHz 16-bit mono
+
+
+def _key(text):
+    return cache_key("openai", VOICE, f"{MODEL}/{INSTRUCTIONS}", text)
+
+
+def _api_key():
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY not found in environment variables")
+    return api_key
+
+
+def _stream(text):
+    """Play ``text`` as PCM while it downloads, on the shared pooled client. Raises on failure."""
+    speech = openai_client(_api_key()).audio.speech
+    with speech.with_streaming_response.create(
+        model=MODEL,
+        voice=VOICE,
+        input=text,
+        instructions=INSTRUCTIONS,
+        response_format="pcm",
+    ) as response:
+        play_stream(response.iter_bytes(4096), SAMPLE_RATE)
+
+
+def synthesize(text):
+    """Render ``text`` to MP3 bytes with OpenAI TTS. Raises on failure."""
+    response = openai_client(_api_key()).audio.speech.create(
+        model=MODEL,
+        voice=VOICE,
+        input=text,
+        instructions=INSTRUCTIONS,
+        response_format="mp3",
+    )
+    return response.content
+
+
+def speak(text):
+    """Play ``text`` from the audio cache, or stream it from OpenAI TTS. Raises on failure.
+
+    Streamed playback is not cached; ``--render`` fills the cache for
+    phrases worth keeping.
+    """
+    if play_cached(AudioCache(), _key(text)):
+        return
+    _stream(text)
+
+
+def render(texts):
+    """Synthesize ``texts`` into the audio cache without playing them."""
+    cache = AudioCache()
+    for text in texts:
+        key = _key(text)
+        if cache.lookup(key) is None:
+            cache.store(key, synthesize(text), "mp3")
+
+
+def main():
     """
     OpenAI TTS Script
 
@@ -25,12 +90,13 @@ async def main():
     Usage:
     - ./openai_tts.py                    # Uses default text
     - ./openai_tts.py "Your custom text" # Uses provided text
+    - ./openai_tts.py --render "A" "B"   # Cache phrases without playing
 
     Features:
     - OpenAI gpt-4o-mini-tts model (latest)
     - Nova voice (engaging and warm)
     - Streaming audio with instructions support
-    - Live audio playback via LocalAudioPlayer
+    - Live playback as PCM arrives, through a bounded jitter buffer
     """
 
     # Load environment variables
@@ -45,11 +111,11 @@ async def main():
         sys.exit(1)
 
     try:
-        from openai import AsyncOpenAI
-        from openai.helpers import LocalAudioPlayer
+        import openai  # noqa: F401 — fail early with the install hint below
 
-        # Initialize OpenAI client
-        openai = AsyncOpenAI(api_key=api_key)
+        if sys.argv[1:2] == ["--render"]:
+            render(sys.argv[2:])
+            return
 
         print("🎙️  OpenAI TTS")
         print("=" * 20)
@@ -64,15 +130,8 @@ async def main():
         print("🔊 Generating and streaming...")
 
         try:
-            # Generate and stream audio using OpenAI TTS
-            async with openai.audio.speech.with_streaming_response.create(
-                model="gpt-4o-mini-tts",
-                voice="nova",
-                input=text,
-                instructions="Speak in a cheerful, positive yet professional tone.",
-                response_format="mp3",
-            ) as response:
-                await LocalAudioPlayer().play(response)
+            # Play a cached rendering, or generate and stream audio using OpenAI TTS
+            speak(text)
 
             print("✅ Playback complete!")
 
@@ -90,4 +149,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
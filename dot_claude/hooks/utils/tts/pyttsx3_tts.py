@@ -15,6 +15,11 @@ import random
 import subprocess
 
 
+def speak(text):
+    """Speak ``text`` with macOS say. Raises on failure."""
+    subprocess.run(["say", text], check=True, capture_output=True)
+
+
 def main():
     if len(sys.argv) > 1:
         text = " ".join(sys.argv[1:])
@@ -29,7 +34,7 @@ def main():
         text = random.choice(completion_messages)
 
     try:
-        subprocess.run(["say", text], check=True, capture_output=True)
+        speak(text)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -9,9 +9,12 @@
 import json
 import os
 import sys
-import subprocess
 from pathlib import Path
-from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "hooks"))
+
+from utils.git_state import git_state
+from utils.status_telemetry import record_render
 
 try:
     from dotenv import load_dotenv
@@ -21,71 +24,20 @@ except ImportError:
 
 
 def log_status_line(input_data, status_line_output):
-    """Log status line event to logs directory."""
-    # Ensure logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'status_line.json'
-    
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
-    # Create log entry with input data and generated output
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "input_data": input_data,
-        "status_line_output": status_line_output
-    }
-    
-    # Append the log entry
-    log_data.append(log_entry)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    """Count the render; a sample of renders is logged to logs/status_line.jsonl."""
+    record_render("v1", input_data, status_line_output)
 
 
 def get_git_branch():
     """Get current git branch if in a git repository."""
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return None
+    state = git_state()
+    return state.branch if state else None
 
 
 def get_git_status():
-    """Get git status indicators."""
-    try:
-        # Check if there are uncommitted changes
-        result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        if result.returncode == 0:
-            changes = result.stdout.strip()
-            if changes:
-                lines = changes.split('\n')
-                return f"±{len(lines)}"
-    except Exception:
-        pass
-    return ""
+    """Get git status indicators (count of changed tracked files)."""
+    state = git_state()
+    return f"±{state.changes}" if state and state.changes else ""
 
 
 def generate_status_line(input_data):
@@ -10,7 +10,10 @@ import json
 import os
 import sys
 from pathlib import Path
-from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "hooks"))
+
+from utils.status_telemetry import record_render
 
 try:
     from dotenv import load_dotenv
@@ -20,39 +23,8 @@ except ImportError:
 
 
 def log_status_line(input_data, status_line_output, error_message=None):
-    """Log status line event to logs directory."""
-    # Ensure logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'status_line.json'
-    
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
-    # Create log entry with input data and generated output
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "version": "v2",
-        "input_data": input_data,
-        "status_line_output": status_line_output,
-    }
-    
-    if error_message:
-        log_entry["error"] = error_message
-    
-    # Append the log entry
-    log_data.append(log_entry)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    """Count the render; errors and a sample of renders are logged to logs/status_line.jsonl."""
+    record_render("v2", input_data, status_line_output, error_message)
 
 
 def get_last_prompt(session_id):
@@ -1,74 +1,36 @@
-#!/usr/bin/env -S uv run --script
-# /// script
-# requires-python = ">=3.11"
-# dependencies = [
-#     "python-dotenv",
-# ]
-# ///
+#!/usr/bin/env python3
+"""Status line v4: agent name, model, latest prompt and session extras.
+
+Stdlib only, so it runs under plain ``python3`` without ``uv`` resolving an
+environment on every refresh:
+
+    "statusLine": {"type": "command", "command": "python3 ~/.claude/status_lines/status_line_v4.py"}
+
+Session state comes from ``utils.status_cache``, which re-reads the session
+file only when it changed. Renders are sampled by ``utils.status_telemetry``;
+an unsampled render writes nothing.
+"""
 
 import json
-import os
 import sys
 from pathlib import Path
-from datetime import datetime
-
-try:
-    from dotenv import load_dotenv
 
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "hooks"))
 
+from utils.status_cache import SessionStateCache
+from utils.status_telemetry import record_render
 
-def log_status_line(input_data, status_line_output, error_message=None):
-    """Log status line event to logs directory."""
-    # Ensure logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "status_line.json"
-
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, "r") as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-
-    # Create log entry with input data and generated output
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "version": "v4",
-        "input_data": input_data,
-        "status_line_output": status_line_output,
-    }
+session_cache = SessionStateCache()
 
-    if error_message:
-        log_entry["error"] = error_message
 
-    # Append the log entry
-    log_data.append(log_entry)
-
-    # Write back to file with formatting
-    with open(log_file, "w") as f:
-        json.dump(log_data, f, indent=2)
+def log_status_line(input_data, status_line_output, error_message=None):
+    """Count and log the render if it is sampled."""
+    record_render("v4", input_data, status_line_output, error_message)
 
 
 def get_session_data(session_id):
-    """Get session data including agent name, prompts, and extras."""
-    session_file = Path(f".claude/data/sessions/{session_id}.json")
-
-    if not session_file.exists():
-        return None, f"Session file {session_file} does not exist"
-
-    try:
-        with open(session_file, "r") as f:
-            session_data = json.load(f)
-            return session_data, None
-    except Exception as e:
-        return None, f"Error reading session file: {str(e)}"
+    """Get the cached session digest: agent name, latest prompt, and extras."""
+    return session_cache.load(session_id)
 
 
 def truncate_prompt(prompt, max_length=75):
@@ -134,9 +96,9 @@ def generate_status_line(input_data):
         log_status_line(input_data, f"[{model_name}] 💭 No session data", error)
         return f"\033[36m[{model_name}]\033[0m \033[90m💭 No session data\033[0m"
 
-    # Extract agent name, prompts, and extras
-    agent_name = session_data.get("agent_name", "Agent")
-    prompts = session_data.get("prompts", [])
+    # Extract agent name, latest prompt, and extras
+    agent_name = session_data.get("agent_name") or "Agent"
+    current_prompt = session_data.get("last_prompt")
     extras = session_data.get("extras", {})
 
     # Build status line components
@@ -149,8 +111,7 @@ def generate_status_line(input_data):
     parts.append(f"\033[34m[{model_name}]\033[0m")
 
     # Most recent prompt
-    if prompts:
-        current_prompt = prompts[-1]
+    if current_prompt is not None:
         icon = get_prompt_icon(current_prompt)
         truncated = truncate_prompt(current_prompt, 100)
         parts.append(f"{icon} \033[97m{truncated}\033[0m")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Claude Code status line: model, directory, git branch and time (Starship style).
+
+Single-process replacement for ``statusline-command.sh``. The shell version
+ran ``jq`` twice, ``basename``, up to three ``git`` commands and ``date``
+on every refresh. This one parses the input once, reads the branch straight
+from ``.git/HEAD`` and formats the time in-process. The dirty marker comes
+from ``git_state.is_dirty``: an in-process stat check of the index entries
+against the working tree. Only staged changes need ``git``; that answer is
+cached until HEAD or the index changes. A refresh is therefore one
+``python3`` process with no children, however often files are edited. The
+exception is the first refresh after a ``git add``, commit or checkout.
+
+    "statusLine": {"type": "command", "command": "python3 ~/.claude/statusline-command.py"}
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "hooks"))
+
+from utils.git_state import find_git_dir, is_dirty, read_head
+
+
+def dir_label(current_dir: str) -> str:
+    if current_dir == os.path.expanduser("~"):
+        return "~"
+    if current_dir == "/":
+        return "/"
+    return os.path.basename(current_dir.rstrip("/"))
+
+
+def git_label(current_dir: str) -> str:
+    """`` branch`` plus ``*`` when tracked files changed; empty outside a repo or on a detached HEAD."""
+    git_dir = find_git_dir(current_dir)
+    branch = read_head(git_dir) if git_dir else None
+    if not branch or branch == "HEAD":
+        return ""
+    return f" {branch}*" if is_dirty(current_dir) else f" {branch}"
+
+
+def render(input_data: dict) -> str:
+    current_dir = (input_data.get("workspace") or {}).get("current_dir") or input_data.get("cwd") or os.getcwd()
+    model_name = (input_data.get("model") or {}).get("display_name") or "Claude"
+    return (
+        f"\033[2m\033[36m{model_name}\033[0m "
+        f"\033[2m\033[94m{dir_label(current_dir)}\033[0m"
+        f"{git_label(current_dir)} "
+        f"\033[2m\033[33m{time.strftime('%H:%M')}\033[0m"
+    )
+
+
+def main() -> None:
+    try:
+        input_data = json.loads(sys.stdin.read() or "{}")
+    except ValueError:
+        input_data = {}
+    sys.stdout.write(render(input_data if isinstance(input_data, dict) else {}))
+
+
+if __name__ == "__main__":
+    main()
@@ -578,10 +578,12 @@ def run_hook_tests() -> None:
         for matcher in hooks_list:
             for hook in matcher.get("hooks", []):
                 cmd = hook.get("command", "")
-                # Use a portable pattern — home dir varies by OS/user
-                m = re.search(r"\.claude/hooks/(\S+\.py)", cmd)
-                if m:
-                    name = m.group(1)
+                # Use a portable pattern — home dir varies by OS/user.
+                # hook_client.py commands name the real hook as their first argument.
+                m = re.search(r"\.claude/hooks/(\S+\.py)(?:\s+(\S+\.py))?", cmd)
+                for name in (m.groups() if m else ()):
+                    if not name:
+                        continue
                     # chezmoi strips "executable_" prefix on deploy; check both forms
                     rel = "dot_claude/hooks/" + name
                     rel_exec = "dot_claude/hooks/executable_" + name
@@ -753,14 +755,18 @@ def run_hook_unit_tests() -> None:
     print()
     print("=== Hook Unit Tests ===")
 
-    test_file = DOTFILES_DIR / "tests" / "test_hooks.py"
+    test_dir = DOTFILES_DIR / "tests"
     label = "Hook unit tests (pytest)"
-    if not test_file.exists():
-        fail_test(label, f"test file not found: {test_file}")
+    if not (test_dir / "test_hooks.py").exists():
+        fail_test(label, f"test file not found: {test_dir / 'test_hooks.py'}")
         return
 
+    # Every unit test module under tests/; the integration tests need a deployed
+    # ~/.claude and the migration tests run in their own category.
     result = run(
-        "python3", "-m", "pytest", str(test_file), "-v",
+        "python3", "-m", "pytest", str(test_dir), "-v",
+        f"--ignore={test_dir / 'test_hooks_integration.py'}",
+        f"--ignore={test_dir / 'chezmoiscripts'}",
         cwd=str(DOTFILES_DIR),
     )
     if result.returncode == 0:
@@ -0,0 +1,141 @@
+"""Tests for the content-addressed TTS audio cache."""
+
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils.audio_cache import AudioCache, cache_key, play_cached, play_file, prewarm
+from utils.common import Backend, static_phrases
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AudioCache(tmp_path / "tts-cache", max_bytes=1000)
+
+
+def _age(path, seconds):
+    t = time.time() - seconds
+    os.utime(path, (t, t))
+
+
+# ---------------------------------------------------------------------------
+# TestCacheKey
+# ---------------------------------------------------------------------------
+
+
+class TestCacheKey:
+    def test_stable_and_whitespace_insensitive(self):
+        assert cache_key("openai", "nova", "m", "All done!") == cache_key("openai", "nova", "m", " All done! ")
+
+    @pytest.mark.parametrize("variant", [
+        ("elevenlabs", "nova", "m", "All done!"),
+        ("openai", "alloy", "m", "All done!"),
+        ("openai", "nova", "m2", "All done!"),
+        ("openai", "nova", "m", "All done"),
+    ])
+    def test_every_component_matters(self, variant):
+        assert cache_key(*variant) != cache_key("openai", "nova", "m", "All done!")
+
+
+# ---------------------------------------------------------------------------
+# TestAudioCache
+# ---------------------------------------------------------------------------
+
+
+class TestAudioCache:
+    def test_store_then_lookup(self, cache):
+        path = cache.store("abc", b"ID3data", "mp3")
+        assert path.name == "abc.mp3"
+        assert cache.lookup("abc") == path
+        assert path.read_bytes() == b"ID3data"
+
+    def test_miss_returns_none(self, cache):
+        assert cache.lookup("nope") is None
+
+    def test_empty_audio_not_stored(self, cache):
+        assert cache.store("abc", b"", "mp3") is None
+
+    def test_evicts_least_recently_used_over_budget(self, cache):
+        old = cache.store("old", b"x" * 400, "mp3")
+        used = cache.store("used", b"x" * 400, "mp3")
+        _age(old, 100)
+        _age(used, 200)
+        cache.lookup("used")  # a hit refreshes recency
+        cache.store("new", b"x" * 400, "wav")
+        assert cache.lookup("old") is None
+        assert cache.lookup("used") is not None
+        assert cache.lookup("new") is not None
+        assert cache.stats()["bytes"] <= 1000
+
+    def test_budget_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_TTS_CACHE_MB", "0.5")
+        assert AudioCache(tmp_path).max_bytes == 512 * 1024
+
+    def test_clear(self, cache):
+        cache.store("a", b"1", "mp3")
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+
+
+# ---------------------------------------------------------------------------
+# TestPlayback
+# ---------------------------------------------------------------------------
+
+
+class TestPlayback:
+    def test_hit_is_played_with_first_available_player(self, cache):
+        cache.store("k", b"RIFF", "wav")
+        with patch("utils.audio_cache.shutil.which", side_effect=lambda p: "/usr/bin/aplay" if p == "aplay" else None), \
+             patch("utils.audio_cache.subprocess.run", return_value=MagicMock(returncode=0)) as run:
+            assert play_cached(cache, "k") is True
+        assert run.call_args[0][0][0] == "/usr/bin/aplay"
+
+    def test_miss_is_not_played(self, cache):
+        with patch("utils.audio_cache.subprocess.run") as run:
+            assert play_cached(cache, "k") is False
+        run.assert_not_called()
+
+    def test_no_player_for_format_is_a_miss(self, tmp_path):
+        mp3 = tmp_path / "a.mp3"
+        mp3.write_bytes(b"ID3")
+        with patch("utils.audio_cache.shutil.which", side_effect=lambda p: "/usr/bin/aplay" if p == "aplay" else None):
+            assert play_file(mp3) is False
+
+
+# ---------------------------------------------------------------------------
+# TestPrewarm
+# ---------------------------------------------------------------------------
+
+
+class TestPrewarm:
+    def test_static_phrases_cover_fixed_speech(self, monkeypatch):
+        monkeypatch.setenv("ENGINEER_NAME", "Sam")
+        phrases = static_phrases()
+        assert "All done!" in phrases
+        assert "Your input is needed" in phrases
+        assert "Sam, your input is needed" in phrases
+        assert "Claude Code session started" in phrases
+        assert len(phrases) == len(set(phrases))
+
+    def test_renders_with_each_available_caching_backend(self, tmp_path):
+        backends = [
+            Backend("elevenlabs", tmp_path / "elevenlabs_tts.py"),
+            Backend("kokoro", tmp_path / "kokoro_tts.py"),
+            Backend("pyttsx3", tmp_path / "pyttsx3_tts.py"),
+        ]
+        for b in backends:
+            b.script.write_text("")
+        service = MagicMock(tts_backends=backends)
+        with patch("utils.common.build_service", return_value=service), \
+             patch.object(Backend, "run", autospec=True, return_value="") as run:
+            rendered = prewarm()
+        assert set(rendered) == {"elevenlabs", "kokoro"}
+        for call in run.call_args_list:
+            assert call.args[1] == "--render"
+            assert "All done!" in call.args[2:]
@@ -0,0 +1,130 @@
+"""Tests for streamed PCM playback through the jitter buffer."""
+
+import io
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils.audio_stream import JitterBuffer, play_stream, to_wav
+
+RATE = 1000  # 2000 bytes per second keeps the arithmetic readable
+
+
+class FakeSink:
+    """Records writes, and when the first write happened."""
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.writes = []
+        self.first_write_at = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, data):
+        if self.first_write_at is None:
+            self.first_write_at = time.monotonic()
+        self.writes.append(bytes(data))
+
+
+def _sink_factory(sinks):
+    def factory(sample_rate):
+        sink = FakeSink(sample_rate)
+        sinks.append(sink)
+        return sink
+    return factory
+
+
+# ---------------------------------------------------------------------------
+# TestJitterBuffer
+# ---------------------------------------------------------------------------
+
+
+class TestJitterBuffer:
+    def test_put_blocks_when_full_until_drained(self):
+        buf = JitterBuffer(4)
+        buf.put(b"abcd")
+        done = threading.Event()
+        threading.Thread(target=lambda: (buf.put(b"ef"), done.set()), daemon=True).start()
+        assert not done.wait(0.1)
+        assert buf.take(2) == b"ab"
+        assert done.wait(1)
+        assert buf.take(10) == b"cdef"
+
+    def test_close_releases_waiters(self):
+        buf = JitterBuffer(4)
+        threading.Timer(0.05, buf.close).start()
+        assert buf.wait_for(100, timeout=2) is True
+        assert buf.closed
+
+
+# ---------------------------------------------------------------------------
+# TestPlayStream
+# ---------------------------------------------------------------------------
+
+
+class TestPlayStream:
+    def test_plays_everything_in_order_and_returns_clip(self):
+        sinks = []
+        chunks = [b"\x01\x00" * 50, b"\x02\x00" * 50, b"\x03"]  # odd tail byte is dropped from playback
+        clip = play_stream(iter(chunks), RATE, prebuffer=0.01, sink_factory=_sink_factory(sinks))
+        assert clip == b"".join(chunks)
+        played = b"".join(sinks[0].writes)
+        assert played == b"".join(chunks)[:200]
+        assert all(len(w) % 2 == 0 for w in sinks[0].writes)
+
+    def test_playback_starts_before_download_finishes(self):
+        sinks = []
+        first_chunk_done = []
+
+        def slow_chunks():
+            yield b"\x00\x00" * 100
+            first_chunk_done.append(time.monotonic())
+            time.sleep(0.3)
+            yield b"\x00\x00" * 100
+
+        play_stream(slow_chunks(), RATE, prebuffer=0.05, sink_factory=_sink_factory(sinks))
+        assert sinks[0].first_write_at < first_chunk_done[0] + 0.2
+
+    def test_reader_error_raised_after_playing_what_arrived(self):
+        sinks = []
+
+        def broken():
+            yield b"\x00\x00" * 100
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            play_stream(broken(), RATE, prebuffer=0.01, sink_factory=_sink_factory(sinks))
+        assert len(b"".join(sinks[0].writes)) == 200
+
+    def test_empty_stream_never_opens_device(self):
+        sinks = []
+        assert play_stream(iter([]), RATE, sink_factory=_sink_factory(sinks)) == b""
+        assert sinks == []
+
+    def test_sink_failure_does_not_hang_reader(self):
+        def endless():
+            while True:
+                yield b"\x00\x00" * 100
+
+        def broken_sink(sample_rate):
+            raise OSError("no audio device")
+
+        with pytest.raises(OSError):
+            play_stream(endless(), RATE, prebuffer=0.01, capacity=0.1, sink_factory=broken_sink)
+
+
+def test_to_wav_round_trip():
+    pcm = b"\x01\x00\x02\x00"
+    with wave.open(io.BytesIO(to_wav(pcm, 24000))) as w:
+        assert (w.getnchannels(), w.getsampwidth(), w.getframerate()) == (1, 2, 24000)
+        assert w.readframes(2) == pcm
@@ -0,0 +1,218 @@
+"""Tests for the append-only JSONL event store used by hook loggers."""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils.event_store import (
+    RotationPolicy,
+    append_event,
+    encode_event,
+    load_index,
+    migrate_json_array,
+    migrate_log_dir,
+    policy_for,
+    read_events,
+    rotate,
+)
+
+
+# ---------------------------------------------------------------------------
+# TestAppendEvent
+# ---------------------------------------------------------------------------
+
+
+class TestAppendEvent:
+    def test_encodes_compact_single_line(self):
+        assert encode_event({"a": 1, "b": "x"}) == b'{"a":1,"b":"x"}\n'
+
+    def test_encodes_non_ascii_and_unserialisable_values(self):
+        line = encode_event({"msg": "café", "path": Path("/tmp")})
+        assert json.loads(line) == {"msg": "café", "path": "/tmp"}
+
+    def test_creates_parent_directories(self, tmp_path):
+        log = tmp_path / "a" / "b" / "events.jsonl"
+        append_event(log, {"n": 1})
+        assert list(read_events(log)) == [{"n": 1}]
+
+    def test_appends_without_rewriting(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        append_event(log, {"n": 1})
+        inode = os.stat(log).st_ino
+        append_event(log, {"n": 2})
+        assert os.stat(log).st_ino == inode
+        assert [e["n"] for e in read_events(log)] == [1, 2]
+
+    def test_interleaved_appenders_never_tear_lines(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        ctx = multiprocessing.get_context("fork")
+        policy = RotationPolicy(max_bytes=0, max_age=0)
+        writers = [ctx.Process(target=_append_many, args=(log, w, 200, policy)) for w in range(4)]
+        for p in writers:
+            p.start()
+        for p in writers:
+            p.join(timeout=60)
+            assert p.exitcode == 0
+
+        raw = log.read_bytes().splitlines()
+        events = [json.loads(line) for line in raw]  # every line parses: nothing torn
+        assert len(events) == 4 * 200
+        assert all(e["payload"] == "x" * 8192 for e in events)
+        for w in range(4):
+            assert [e["i"] for e in events if e["writer"] == w] == list(range(200))
+
+
+def _append_many(log, writer, count, policy):
+    """One concurrent appender; lines are larger than PIPE_BUF to stress atomicity."""
+    for i in range(count):
+        append_event(log, {"writer": writer, "i": i, "payload": "x" * 8192}, policy)
+
+
+# ---------------------------------------------------------------------------
+# TestReadEvents
+# ---------------------------------------------------------------------------
+
+
+class TestReadEvents:
+    def test_missing_file_yields_nothing(self, tmp_path):
+        assert list(read_events(tmp_path / "nope.jsonl")) == []
+
+    def test_skips_blank_and_torn_lines(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        log.write_text('{"n":1}\n\n{"n":2}\n{"n":')
+        assert list(read_events(log)) == [{"n": 1}, {"n": 2}]
+
+
+# ---------------------------------------------------------------------------
+# TestMigration
+# ---------------------------------------------------------------------------
+
+
+class TestMigration:
+    def test_converts_array_and_renames_original(self, tmp_path):
+        src = tmp_path / "stop.json"
+        src.write_text(json.dumps([{"n": 1}, {"n": 2}], indent=2))
+        assert migrate_json_array(src) == 2
+        assert list(read_events(tmp_path / "stop.jsonl")) == [{"n": 1}, {"n": 2}]
+        assert not src.exists()
+        assert (tmp_path / "stop.json.migrated").exists()
+
+    def test_legacy_events_precede_existing_jsonl(self, tmp_path):
+        src = tmp_path / "stop.json"
+        src.write_text(json.dumps([{"n": 1}]))
+        append_event(tmp_path / "stop.jsonl", {"n": 2})
+        migrate_json_array(src)
+        assert [e["n"] for e in read_events(tmp_path / "stop.jsonl")] == [1, 2]
+
+    @pytest.mark.parametrize("content", ["not json", '{"an": "object"}'])
+    def test_leaves_non_array_files_untouched(self, tmp_path, content):
+        src = tmp_path / "stop.json"
+        src.write_text(content)
+        assert migrate_json_array(src) == 0
+        assert src.read_text() == content
+        assert not (tmp_path / "stop.jsonl").exists()
+
+    def test_migrate_log_dir_only_touches_known_logs(self, tmp_path):
+        (tmp_path / "post_tool_use.json").write_text(json.dumps([{"t": 1}]))
+        (tmp_path / "chat.json").write_text(json.dumps([{"type": "user"}]))
+        assert migrate_log_dir(tmp_path) == {"post_tool_use": 1}
+        assert (tmp_path / "chat.json").exists()
+
+
+# ---------------------------------------------------------------------------
+# TestRotation
+# ---------------------------------------------------------------------------
+
+
+class TestRotation:
+    def test_rotates_when_size_exceeded(self, tmp_path):
+        log = tmp_path / "stop.jsonl"
+        policy = RotationPolicy(max_bytes=100, max_age=0)
+        for i in range(10):
+            append_event(log, {"i": i, "pad": "x" * 20}, policy=policy)
+        index = load_index(log)
+        assert len(index["segments"]) >= 2
+        assert all((tmp_path / s["file"]).exists() for s in index["segments"])
+        assert [e["i"] for e in read_events(log)] == list(range(10))
+
+    def test_concurrent_appends_survive_rotation(self, tmp_path):
+        log = tmp_path / "stop.jsonl"
+        policy = RotationPolicy(max_bytes=64 * 1024, max_age=0, keep_segments=0, retain_days=0)
+        ctx = multiprocessing.get_context("fork")
+        writers = [ctx.Process(target=_append_many, args=(log, w, 100, policy)) for w in range(4)]
+        for p in writers:
+            p.start()
+        for p in writers:
+            p.join(timeout=60)
+            assert p.exitcode == 0
+
+        assert len(load_index(log)["segments"]) >= 5
+        events = list(read_events(log))
+        assert len(events) == 4 * 100
+        assert sorted((e["writer"], e["i"]) for e in events) == [(w, i) for w in range(4) for i in range(100)]
+
+    def test_rotates_when_age_exceeded(self, tmp_path):
+        log = tmp_path / "stop.jsonl"
+        policy = RotationPolicy(max_bytes=0, max_age=3600)
+        append_event(log, {"n": 1}, policy=policy)
+        with patch("utils.event_store.time.time", return_value=time.time() + 7200):
+            append_event(log, {"n": 2}, policy=policy)
+        assert len(load_index(log)["segments"]) == 1
+        assert not log.exists()
+        assert [e["n"] for e in read_events(log)] == [1, 2]
+
+    def test_closed_segments_are_compressed(self, tmp_path):
+        log = tmp_path / "stop.jsonl"
+        append_event(log, {"n": 1})
+        segment = rotate(log)
+        assert segment.suffix in (".gz", ".zst")
+        assert not list(tmp_path.glob("stop.*.jsonl"))
+
+    def test_rotate_empty_log_is_noop(self, tmp_path):
+        log = tmp_path / "stop.jsonl"
+        log.touch()
+        assert rotate(log) is None
+        assert load_index(log)["segments"] == []
+
+    def test_prunes_beyond_keep_segments(self, tmp_path):
+        log = tmp_path / "stop.jsonl"
+        policy = RotationPolicy(keep_segments=2, retain_days=0)
+        for i in range(4):
+            append_event(log, {"n": i}, policy=policy)
+            rotate(log, policy)
+        index = load_index(log)
+        assert len(index["segments"]) == 2
+        assert len(list(tmp_path.glob("stop.*.jsonl.*"))) == 2
+        assert [e["n"] for e in read_events(log)] == [2, 3]
+
+    def test_prunes_segments_older_than_retention(self, tmp_path):
+        log = tmp_path / "stop.jsonl"
+        policy = RotationPolicy(keep_segments=0, retain_days=1)
+        append_event(log, {"n": 1}, policy=policy)
+        rotate(log, policy, now=time.time() - 3 * 86400)
+        append_event(log, {"n": 2}, policy=policy)
+        rotate(log, policy)
+        assert [e["n"] for e in read_events(log)] == [2]
+
+    def test_read_events_skips_segments_outside_window(self, tmp_path):
+        log = tmp_path / "stop.jsonl"
+        now = time.time()
+        with patch("utils.event_store.time.time", return_value=now - 2000):
+            append_event(log, {"n": 1})
+        rotate(log, now=now - 1000)
+        append_event(log, {"n": 2})
+        assert [e["n"] for e in read_events(log, since=now - 500)] == [2]
+        assert [e["n"] for e in read_events(log, until=now - 1500)] == [1]
+
+    def test_policy_for_uses_event_type(self):
+        assert policy_for("/x/post_tool_use.jsonl").max_age == 86400
+        assert policy_for("/x/session_start.jsonl").retain_days == 365
+        assert policy_for("/x/unknown.jsonl") == RotationPolicy()
@@ -0,0 +1,181 @@
+"""Tests for the cached git state provider."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils import git_state as git_state_module
+from utils.git_state import (
+    GitState,
+    find_git_dir,
+    git_state,
+    is_dirty,
+    parse_status,
+    read_head,
+    read_index,
+    worktree_changed,
+)
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+    "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com",
+    "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1",
+}
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, env={**os.environ, **GIT_ENV})
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    (path / "a.txt").write_text("a\n")
+    git(path, "add", "a.txt")
+    git(path, "commit", "-qm", "init")
+    return path
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "git-state"
+
+
+class TestParseStatus:
+    def test_branch_upstream_and_changes(self):
+        state = parse_status(
+            "# branch.oid 1234\n# branch.head main\n# branch.upstream origin/main\n# branch.ab +2 -3\n"
+            "1 .M N... 100644 100644 100644 abc abc a.txt\n1 M. N... 100644 100644 100644 abc def b.txt\n"
+        )
+        assert state == GitState(branch="main", changes=2, ahead=2, behind=3, upstream="origin/main")
+        assert state.dirty
+
+    def test_detached_head(self):
+        assert parse_status("# branch.oid 1234\n# branch.head (detached)\n").branch == "HEAD"
+
+
+class TestGitDir:
+    def test_found_from_subdirectory(self, repo):
+        (repo / "sub" / "deeper").mkdir(parents=True)
+        assert find_git_dir(repo / "sub" / "deeper") == repo / ".git"
+
+    def test_outside_repository(self, tmp_path):
+        assert find_git_dir(tmp_path) is None
+
+    def test_worktree_git_file(self, repo, tmp_path):
+        git(repo, "worktree", "add", "-q", "-b", "side", str(tmp_path / "wt"))
+        git_dir = find_git_dir(tmp_path / "wt")
+        assert git_dir.parent.name == "worktrees"
+        assert read_head(git_dir) == "side"
+
+    def test_read_head(self, repo):
+        assert read_head(repo / ".git") == "main"
+        git(repo, "checkout", "-q", "--detach")
+        assert read_head(repo / ".git") == "HEAD"
+
+
+class TestGitState:
+    def test_clean_repository(self, repo, cache_dir):
+        assert git_state(repo, cache_dir=cache_dir) == GitState(branch="main")
+
+    def test_untracked_files_are_not_counted(self, repo, cache_dir):
+        (repo / "new.txt").write_text("x")
+        assert git_state(repo, cache_dir=cache_dir).changes == 0
+
+    def test_outside_repository_is_none(self, tmp_path, cache_dir):
+        assert git_state(tmp_path, cache_dir=cache_dir) is None
+
+    def test_cached_until_ttl(self, repo, cache_dir):
+        assert git_state(repo, cache_dir=cache_dir).changes == 0
+        (repo / "a.txt").write_text("changed\n")
+        with patch.object(git_state_module, "_run_status") as run:
+            assert git_state(repo, cache_dir=cache_dir).changes == 0
+        run.assert_not_called()
+        assert git_state(repo, ttl=0, cache_dir=cache_dir).changes == 1
+
+    def test_index_change_invalidates(self, repo, cache_dir):
+        git_state(repo, cache_dir=cache_dir)
+        (repo / "b.txt").write_text("b\n")
+        git(repo, "add", "b.txt")
+        assert git_state(repo, cache_dir=cache_dir).changes == 1
+
+    def test_checkout_invalidates(self, repo, cache_dir):
+        git_state(repo, cache_dir=cache_dir)
+        git(repo, "checkout", "-qb", "feature/x")
+        assert git_state(repo, cache_dir=cache_dir).branch == "feature/x"
+
+    def test_status_run_does_not_touch_index(self, repo, cache_dir):
+        (repo / "a.txt").write_text("changed\n")
+        before = os.stat(repo / ".git" / "index").st_mtime_ns
+        git_state(repo, cache_dir=cache_dir)
+        assert os.stat(repo / ".git" / "index").st_mtime_ns == before
+
+    def test_ahead_of_upstream(self, repo, tmp_path, cache_dir):
+        clone = tmp_path / "clone"
+        git(tmp_path, "clone", "-q", str(repo), str(clone))
+        (clone / "a.txt").write_text("local\n")
+        git(clone, "commit", "-qam", "local")
+        state = git_state(clone, cache_dir=cache_dir)
+        assert (state.upstream, state.ahead, state.behind) == ("origin/main", 1, 0)
+
+    def test_git_failure_is_none(self, repo, cache_dir):
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            assert git_state(repo, cache_dir=cache_dir) is None
+
+
+class TestIndexStat:
+    def test_read_index_lists_tracked_paths(self, repo):
+        (repo / "sub").mkdir()
+        (repo / "sub" / ("long-name-" * 12 + ".txt")).write_text("x\n")
+        git(repo, "add", "sub")
+        listed = subprocess.run(["git", "ls-files"], cwd=repo, capture_output=True, text=True).stdout.split()
+        assert [entry[0] for entry in read_index(repo / ".git")] == listed
+
+    def test_unsupported_index_version_is_none(self, repo):
+        git(repo, "update-index", "--index-version", "4")
+        assert read_index(repo / ".git") is None
+
+    def test_worktree_changes(self, repo):
+        git_dir = repo / ".git"
+        assert worktree_changed(git_dir, repo) is False
+        (repo / "new.txt").write_text("untracked\n")
+        assert worktree_changed(git_dir, repo) is False
+        (repo / "a.txt").write_text("changed\n")
+        assert worktree_changed(git_dir, repo) is True
+        git(repo, "checkout", "--", "a.txt")
+        assert worktree_changed(git_dir, repo) is False
+        (repo / "a.txt").unlink()
+        assert worktree_changed(git_dir, repo) is True
+
+
+class TestIsDirty:
+    def test_edits_are_seen_without_running_git(self, repo, cache_dir):
+        assert is_dirty(repo, cache_dir=cache_dir) is False
+        with patch.object(git_state_module, "_run_status", side_effect=AssertionError("git ran")):
+            assert is_dirty(repo, cache_dir=cache_dir) is False  # staged answer from the cache
+            (repo / "a.txt").write_text("changed\n")
+            assert is_dirty(repo, cache_dir=cache_dir) is True
+
+    def test_staged_change_is_dirty(self, repo, cache_dir):
+        assert is_dirty(repo, cache_dir=cache_dir) is False
+        (repo / "a.txt").write_text("staged\n")
+        git(repo, "add", "a.txt")
+        assert is_dirty(repo, cache_dir=cache_dir) is True
+        git(repo, "commit", "-qm", "staged")
+        assert is_dirty(repo, cache_dir=cache_dir) is False
+
+    def test_unreadable_index_falls_back_to_git_state(self, repo, cache_dir):
+        git(repo, "update-index", "--index-version", "4")
+        (repo / "a.txt").write_text("changed\n")
+        assert is_dirty(repo, cache_dir=cache_dir) is True
+
+    def test_outside_repository_is_none(self, tmp_path, cache_dir):
+        assert is_dirty(tmp_path, cache_dir=cache_dir) is None
@@ -0,0 +1,201 @@
+"""Tests for the persistent hook server and its stdin-to-socket client."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+HOOKS_SRC = Path(__file__).parent.parent / "dot_claude" / "hooks"
+sys.path.insert(0, str(HOOKS_SRC))
+
+from utils.hook_server import load_hooks
+
+FAKE_HOOK = textwrap.dedent("""\
+    import json
+    import os
+    import sys
+
+
+    def main():
+        data = json.load(sys.stdin)
+        print(json.dumps({
+            "cwd": os.getcwd(),
+            "args": sys.argv[1:],
+            "data": data,
+            "env": os.getenv("HOOK_TEST_VAR"),
+            "pid": os.getpid(),
+        }))
+        sys.exit(int(data.get("exit", 0)))
+
+
+    if __name__ == "__main__":
+        main()
+""")
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def hooks_dir(tmp_path):
+    """A hooks directory holding the real client/server and a fake stop.py."""
+    d = tmp_path / "hooks"
+    (d / "utils").mkdir(parents=True)
+    shutil.copy(HOOKS_SRC / "executable_hook_client.py", d / "hook_client.py")
+    shutil.copy(HOOKS_SRC / "utils" / "hook_server.py", d / "utils" / "hook_server.py")
+    (d / "stop.py").write_text(FAKE_HOOK)
+    return d
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    # AF_UNIX paths are limited to ~104 bytes; pytest tmp paths can exceed that.
+    path = Path(f"/tmp/hookd-test-{os.getpid()}-{tmp_path.name}.sock")
+    yield path
+    path.unlink(missing_ok=True)
+    Path(str(path) + ".lock").unlink(missing_ok=True)
+
+
+@pytest.fixture
+def server(hooks_dir, socket_path):
+    proc = subprocess.Popen(
+        [sys.executable, str(hooks_dir / "utils" / "hook_server.py"),
+         "--socket", str(socket_path), "--hooks-dir", str(hooks_dir), "--idle-timeout", "30"],
+    )
+    deadline = time.time() + 5
+    while not socket_path.exists() and time.time() < deadline:
+        time.sleep(0.02)
+    yield proc
+    proc.terminate()
+    proc.wait(timeout=5)
+
+
+@pytest.fixture
+def fake_uv(tmp_path):
+    """A ``uv`` on PATH that logs its arguments and runs the script with the test interpreter."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "uv.log"
+    uv = bin_dir / "uv"
+    uv.write_text(textwrap.dedent(f"""\
+        #!/bin/sh
+        echo "$@" >> {log}
+        shift; [ "$1" = "--script" ] && shift
+        exec {sys.executable} "$@"
+    """))
+    uv.chmod(0o755)
+    return {"PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}"}, log
+
+
+def run_client(hooks_dir, socket_path, payload, *args, cwd=None, **env):
+    return subprocess.run(
+        [sys.executable, str(hooks_dir / "hook_client.py"), "stop.py", *args],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env={**os.environ, "CLAUDE_HOOKD_SOCKET": str(socket_path), **env},
+        timeout=30,
+    )
+
+
+# ---------------------------------------------------------------------------
+# TestLoadHooks
+# ---------------------------------------------------------------------------
+
+
+class TestLoadHooks:
+    def test_loads_hooks_with_main_and_skips_broken(self, tmp_path):
+        (tmp_path / "stop.py").write_text(FAKE_HOOK)
+        (tmp_path / "notification.py").write_text("this is not python(")
+        (tmp_path / "pre_compact.py").write_text("x = 1\n")
+        assert set(load_hooks(tmp_path)) == {"stop.py"}
+
+
+# ---------------------------------------------------------------------------
+# TestServerRoundTrip
+# ---------------------------------------------------------------------------
+
+
+class TestServerRoundTrip:
+    def test_relays_output_exit_code_and_caller_context(self, hooks_dir, socket_path, server, tmp_path):
+        result = run_client(
+            hooks_dir, socket_path, {"exit": 2}, "--notify", cwd=tmp_path, HOOK_TEST_VAR="from-client"
+        )
+        assert result.returncode == 2
+        out = json.loads(result.stdout)
+        assert out["cwd"] == str(tmp_path.resolve())
+        assert out["args"] == ["--notify"]
+        assert out["env"] == "from-client"
+        assert out["pid"] != server.pid  # ran in a forked child
+
+    def test_does_not_start_a_second_server(self, hooks_dir, socket_path, server):
+        run_client(hooks_dir, socket_path, {})
+        second = subprocess.run(
+            [sys.executable, str(hooks_dir / "utils" / "hook_server.py"),
+             "--socket", str(socket_path), "--hooks-dir", str(hooks_dir)],
+            timeout=10,
+        )
+        assert second.returncode == 0
+        assert run_client(hooks_dir, socket_path, {}).returncode == 0
+
+
+# ---------------------------------------------------------------------------
+# TestClientFallback
+# ---------------------------------------------------------------------------
+
+
+class TestClientFallback:
+    def test_runs_under_uv_when_disabled(self, hooks_dir, socket_path, fake_uv):
+        env, log = fake_uv
+        result = run_client(hooks_dir, socket_path, {"exit": 3}, "--notify", CLAUDE_HOOKD="0", HOOK_TEST_VAR="x", **env)
+        assert result.returncode == 3
+        out = json.loads(result.stdout)
+        assert out["env"] == "x"
+        assert out["args"] == ["--notify"]
+        assert log.read_text().splitlines() == [f"run --script {hooks_dir / 'stop.py'} --notify"]
+        assert not socket_path.exists()
+
+    def test_runs_under_uv_and_starts_server_when_down(self, hooks_dir, socket_path, fake_uv):
+        env, log = fake_uv
+        result = run_client(hooks_dir, socket_path, {"n": 1}, **env)
+        assert result.returncode == 0
+        out = json.loads(result.stdout)
+        assert out["data"] == {"n": 1}
+        assert out["pid"] != os.getpid()
+        deadline = time.time() + 10
+        while not socket_path.exists() and time.time() < deadline:
+            time.sleep(0.05)
+        try:
+            assert socket_path.exists()
+            calls = log.read_text()
+            assert f"run --script {hooks_dir / 'utils' / 'hook_server.py'}" in calls
+            assert f"run --script {hooks_dir / 'stop.py'}" in calls
+        finally:
+            subprocess.run(["pkill", "-f", str(socket_path)])
+
+    def test_runs_with_own_interpreter_without_uv(self, hooks_dir, socket_path, tmp_path):
+        result = run_client(hooks_dir, socket_path, {"exit": 4}, CLAUDE_HOOKD="0", PATH=str(tmp_path))
+        assert result.returncode == 4
+        assert json.loads(result.stdout)["data"] == {"exit": 4}
+
+    def test_falls_back_for_hooks_the_server_does_not_know(self, hooks_dir, socket_path, server):
+        (hooks_dir / "custom.py").write_text(FAKE_HOOK)
+        result = subprocess.run(
+            [sys.executable, str(hooks_dir / "hook_client.py"), "custom.py"],
+            input="{}",
+            capture_output=True,
+            text=True,
+            env={**os.environ, "CLAUDE_HOOKD_SOCKET": str(socket_path)},
+            timeout=30,
+        )
+        assert result.returncode == 0
+        assert json.loads(result.stdout)["pid"] != server.pid
@@ -1,9 +1,13 @@
 """Comprehensive pytest tests for the Claude Code hook notification system."""
 
 import json
+import multiprocessing
+import os
 import subprocess
 import sys
 import textwrap
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -15,10 +19,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
 from utils.common import (
     FALLBACK_MESSAGES,
     Backend,
+    BackendHealth,
+    Budget,
+    InProcessBackend,
+    MessageCache,
     NotificationService,
+    TranscriptCache,
     TranscriptParser,
+    _tail_jsonl,
     build_service,
     get_notify_mode,
+    load_plugin,
+    normalize_context,
+    rank_backends,
 )
 
 
@@ -27,6 +40,13 @@ from utils.common import (
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def isolated_pools(tmp_path, monkeypatch):
+    """Keep announcement draws away from ~/.claude/data/pools and never spawn refills."""
+    monkeypatch.setenv("CLAUDE_POOL_DIR", str(tmp_path / "pools"))
+    monkeypatch.setattr("utils.phrase_pool.start_refill", lambda *args, **kwargs: None)
+
+
 @pytest.fixture
 def tmp_script(tmp_path):
     """Create a temporary script file that exists on disk."""
@@ -136,6 +156,37 @@ class TestBackend:
         with patch("utils.common.subprocess.run", side_effect=FileNotFoundError):
             assert b.run() is None
 
+    def test_spawn_starts_own_process_group(self, tmp_script):
+        b = Backend(name="test", script=tmp_script)
+        with patch("utils.common.subprocess.Popen") as mock_popen:
+            b.spawn("--completion")
+        args, kwargs = mock_popen.call_args
+        assert args[0] == ["uv", "run", str(tmp_script), "--completion"]
+        assert kwargs["start_new_session"] is True
+
+    def test_spawn_returns_none_when_uv_missing(self, tmp_script):
+        b = Backend(name="test", script=tmp_script)
+        with patch("utils.common.subprocess.Popen", side_effect=FileNotFoundError):
+            assert b.spawn() is None
+
+    def test_collect_returns_stripped_stdout(self, tmp_script):
+        b = Backend(name="test", script=tmp_script)
+        proc = subprocess.Popen(
+            [sys.executable, "-c", "print('  done  ')"], stdout=subprocess.PIPE, text=True
+        )
+        assert b.collect(proc) == "done"
+
+    def test_collect_kills_process_group_on_timeout(self, tmp_script):
+        b = Backend(name="test", script=tmp_script, timeout=0.2)
+        proc = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            stdout=subprocess.PIPE, text=True, start_new_session=True,
+        )
+        start = time.monotonic()
+        assert b.collect(proc) is None
+        assert proc.wait(timeout=5) != 0
+        assert time.monotonic() - start < 5
+
 
 # ---------------------------------------------------------------------------
 # TestTranscriptParser
@@ -208,6 +259,184 @@ class TestTranscriptParser:
         assert actions_line.count("Bash(") == 8
 
 
+# ---------------------------------------------------------------------------
+# TestTailJsonl
+# ---------------------------------------------------------------------------
+
+
+class TestTailJsonl:
+    def _write(self, tmp_path, lines, trailing_newline=True):
+        f = tmp_path / "t.jsonl"
+        f.write_text("\n".join(lines) + ("\n" if trailing_newline else ""))
+        return f
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64, 64 * 1024])
+    def test_matches_forward_read_across_block_boundaries(self, tmp_path, block_size):
+        lines = [json.dumps({"i": i, "pad": "y" * (i * 13 % 50)}) for i in range(40)]
+        f = self._write(tmp_path, lines)
+        result = _tail_jsonl(str(f), 10, block_size=block_size)
+        assert [e["i"] for e in result] == list(range(30, 40))
+
+    def test_returns_whole_file_when_shorter_than_limit(self, tmp_path):
+        f = self._write(tmp_path, [json.dumps({"i": i}) for i in range(3)], trailing_newline=False)
+        assert [e["i"] for e in _tail_jsonl(str(f), 60, block_size=5)] == [0, 1, 2]
+
+    def test_reassembles_line_longer_than_block(self, tmp_path):
+        big = {"i": 1, "blob": "z" * 10_000}
+        f = self._write(tmp_path, [json.dumps({"i": 0}), json.dumps(big), json.dumps({"i": 2})])
+        result = _tail_jsonl(str(f), 2, block_size=256)
+        assert result == [big, {"i": 2}]
+
+    def test_skips_malformed_lines_without_counting_them(self, tmp_path):
+        f = self._write(tmp_path, [json.dumps({"i": 0}), json.dumps({"i": 1}), "not json", ""])
+        assert [e["i"] for e in _tail_jsonl(str(f), 2, block_size=4)] == [0, 1]
+
+    def test_parse_only_sees_last_entries(self, tmp_path):
+        lines = [json.dumps({"type": "user", "message": {"content": "old request"}})]
+        lines += [json.dumps({"type": "system"})] * 100
+        lines.append(json.dumps({"type": "user", "message": {"content": "new request"}}))
+        f = self._write(tmp_path, lines)
+        result = TranscriptParser.parse(str(f), max_entries=5)
+        assert "Request: new request" in result
+        assert "old request" not in result
+
+
+# ---------------------------------------------------------------------------
+# TestTranscriptCache
+# ---------------------------------------------------------------------------
+
+
+def _user(text):
+    return json.dumps({"type": "user", "message": {"content": text}})
+
+
+def _assistant_text(text):
+    return json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": text}]}})
+
+
+class TestTranscriptCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return TranscriptCache(cache_file=tmp_path / "cache.json")
+
+    def test_cold_summary_matches_parser(self, cache, transcript_file):
+        assert cache.summarize(str(transcript_file)) == TranscriptParser.parse(str(transcript_file))
+
+    def test_returns_none_for_missing_or_none_path(self, cache):
+        assert cache.summarize(None) is None
+        assert cache.summarize("/nonexistent/file.jsonl") is None
+
+    def test_incremental_update_reads_only_appended_lines(self, cache, tmp_path):
+        f = tmp_path / "t.jsonl"
+        f.write_text(_user("first request") + "\n")
+        cache.summarize(str(f))
+
+        with open(f, "a") as out:
+            out.write(_user("second request") + "\n" + _assistant_text("All fixed.") + "\n")
+        with patch("utils.common._tail_jsonl", side_effect=AssertionError("cold path used")):
+            result = cache.summarize(str(f))
+
+        assert "Request: second request" in result
+        assert "Outcome: All fixed." in result
+
+    def test_partial_last_line_is_folded_once_complete(self, cache, tmp_path):
+        f = tmp_path / "t.jsonl"
+        line = _user("finished later")
+        f.write_text(_user("hello") + "\n" + line[:10])
+        assert "Request: hello" in cache.summarize(str(f))
+
+        with open(f, "a") as out:
+            out.write(line[10:] + "\n")
+        assert "Request: finished later" in cache.summarize(str(f))
+
+    def test_rewritten_transcript_is_resummarised(self, cache, tmp_path):
+        f = tmp_path / "t.jsonl"
+        f.write_text(_user("a" * 100) + "\n")
+        cache.summarize(str(f))
+        f.write_text(_user("short") + "\n")
+        assert cache.summarize(str(f)) == "Request: short"
+
+    def test_repeated_action_moves_to_end(self, cache, tmp_path):
+        def tool(name, **inp):
+            return json.dumps({"type": "assistant", "message": {"content": [
+                {"type": "tool_use", "name": name, "input": inp}]}})
+
+        f = tmp_path / "t.jsonl"
+        f.write_text("\n".join([tool("Bash", command="pytest"), tool("Grep"), tool("Bash", command="pytest")]) + "\n")
+        assert cache.summarize(str(f)) == "Actions: Grep, Bash(pytest)"
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = TranscriptCache(cache_file=tmp_path / "cache.json", max_transcripts=2)
+        paths = []
+        for i in range(3):
+            f = tmp_path / f"t{i}.jsonl"
+            f.write_text(_user(f"r{i}") + "\n")
+            paths.append(str(f))
+            cache.summarize(str(f))
+        stored = json.loads((tmp_path / "cache.json").read_text())
+        assert set(stored) == set(paths[1:])
+
+    def test_evicts_transcripts_untouched_past_max_age(self, tmp_path):
+        cache = TranscriptCache(cache_file=tmp_path / "cache.json", max_age=3600)
+        old, new = tmp_path / "old.jsonl", tmp_path / "new.jsonl"
+        old.write_text(_user("old") + "\n")
+        new.write_text(_user("new") + "\n")
+        cache.summarize(str(old))
+        os.utime(old, (1, 1))
+        cache.summarize(str(new))
+        assert set(json.loads((tmp_path / "cache.json").read_text())) == {str(new)}
+
+    def test_incremental_summary_matches_fresh_parse_as_window_slides(self, cache, tmp_path):
+        def tool(name, **inp):
+            return json.dumps({"type": "assistant", "message": {"content": [
+                {"type": "tool_use", "name": name, "input": inp}]}})
+
+        f = tmp_path / "t.jsonl"
+        f.write_text(_user("old request") + "\n" + tool("Agent", description="explore") + "\n")
+        assert cache.summarize(str(f)) == TranscriptParser.parse(str(f))
+        for batch in range(6):
+            lines = [tool("Bash", command=f"step {batch}-{i}") for i in range(15)]
+            lines += [tool("Agent", description=f"agent {batch}"), _assistant_text(f"done {batch}")]
+            if batch == 4:
+                lines.append(_user("new request"))
+            with open(f, "a") as out:
+                out.write("\n".join(lines) + "\n")
+            assert cache.summarize(str(f)) == TranscriptParser.parse(str(f))
+        assert "old request" not in cache.summarize(str(f))
+
+    def test_unterminated_last_line_is_not_folded_twice(self, cache, tmp_path):
+        def agent(desc):
+            return json.dumps({"type": "assistant", "message": {"content": [
+                {"type": "tool_use", "name": "Agent", "input": {"description": desc}}]}})
+
+        f = tmp_path / "t.jsonl"
+        f.write_text(_user("go") + "\n" + agent("A"))
+        cache.summarize(str(f))
+        with open(f, "a") as out:
+            out.write("\n" + agent("B") + "\n")
+        assert cache.summarize(str(f)) == TranscriptParser.parse(str(f))
+        assert "Actions: Agent(A), Agent(B)" in cache.summarize(str(f))
+
+    def test_concurrent_processes_keep_every_transcript(self, tmp_path):
+        cache_file = tmp_path / "cache.json"
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_summarize_many, args=(cache_file, tmp_path, w, 10)) for w in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=60)
+            assert p.exitcode == 0
+        assert len(json.loads(cache_file.read_text())) == 4 * 10
+
+
+def _summarize_many(cache_file, tmp_path, writer, count):
+    cache = TranscriptCache(cache_file=cache_file)
+    for i in range(count):
+        f = tmp_path / f"t{writer}-{i}.jsonl"
+        f.write_text(_user(f"r{writer}-{i}") + "\n")
+        cache.summarize(str(f))
+
+
 # ---------------------------------------------------------------------------
 # TestNotificationService
 # ---------------------------------------------------------------------------
@@ -433,6 +662,376 @@ class TestNotificationService:
         llm2_run.assert_not_called()
 
 
+# ---------------------------------------------------------------------------
+# TestLlmRace
+# ---------------------------------------------------------------------------
+
+
+def _racer(name, answer, delay=0.0):
+    """A mock LLM backend whose spawned run answers ``answer`` after ``delay`` seconds."""
+    b = MagicMock(spec=Backend)
+    b.name = name
+    b.is_available.return_value = True
+    b.spawn.return_value = MagicMock(name=f"{name}-proc")
+
+    def collect(proc):
+        time.sleep(delay)
+        return answer
+
+    b.collect.side_effect = collect
+    return b
+
+
+def _race_service(llms, **kwargs):
+    return NotificationService(
+        tts_backends=[], llm_backends=llms, fallback_messages=["fallback"], llm_race=True, **kwargs
+    )
+
+
+class TestLlmRace:
+    def test_fastest_answer_wins_when_higher_priority_fails(self):
+        slow_fail = _racer("a", None, delay=0.05)
+        fast = _racer("b", "from b", delay=0.0)
+        assert _race_service([slow_fail, fast])._generate_message() == "from b"
+
+    def test_prefers_higher_priority_within_grace(self):
+        preferred = _racer("a", "from a", delay=0.1)
+        fast = _racer("b", "from b")
+        assert _race_service([preferred, fast], llm_grace=1.0)._generate_message() == "from a"
+
+    def test_grace_expiry_takes_lower_priority_answer(self):
+        slow = _racer("a", "from a", delay=2.0)
+        fast = _racer("b", "from b")
+        start = time.monotonic()
+        assert _race_service([slow, fast], llm_grace=0.1)._generate_message() == "from b"
+        assert time.monotonic() - start < 1.0
+
+    def test_deadline_bounds_latency_and_falls_back(self):
+        llms = [_racer("a", "late", delay=2.0), _racer("b", "late", delay=2.0)]
+        start = time.monotonic()
+        assert _race_service(llms, llm_deadline=0.2)._generate_message() == "fallback"
+        assert time.monotonic() - start < 1.0
+
+    def test_cancels_all_spawned_runs(self):
+        winner, loser = _racer("a", "from a"), _racer("b", "late", delay=2.0)
+        _race_service([winner, loser])._generate_message()
+        loser.cancel.assert_called_once_with(loser.spawn.return_value)
+        winner.cancel.assert_called_once_with(winner.spawn.return_value)
+
+    def test_empty_answers_are_not_accepted(self):
+        llms = [_racer("a", ""), _racer("b", "from b", delay=0.05)]
+        assert _race_service(llms)._generate_message() == "from b"
+
+    def test_unspawnable_backend_counts_as_failed(self):
+        broken, ok = _racer("a", None), _racer("b", "from b")
+        broken.spawn.return_value = None
+        assert _race_service([broken, ok])._generate_message() == "from b"
+        broken.collect.assert_not_called()
+
+    def test_single_backend_runs_sequentially(self):
+        only = _racer("a", None)
+        only.run.return_value = "from run"
+        assert _race_service([only])._generate_message() == "from run"
+        only.spawn.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# TestBackendHealth
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def health(tmp_path):
+    return BackendHealth(tmp_path / "backend-health.json", failure_threshold=2, cooldown=60)
+
+
+class TestBackendHealth:
+    def test_new_backend_is_closed(self, tmp_path, health):
+        b = _make_backend(tmp_path, name="ollama")
+        assert health.state(b) == "closed"
+        assert health.allow(b) is True
+
+    def test_opens_after_consecutive_failures(self, tmp_path, health):
+        b = _make_backend(tmp_path, name="ollama")
+        health.record(b, False, 15.0)
+        assert health.allow(b) is True
+        health.record(b, False, 15.0)
+        assert health.state(b) == "open"
+        assert health.allow(b) is False
+
+    def test_success_resets_failure_streak(self, tmp_path, health):
+        b = _make_backend(tmp_path, name="ollama")
+        health.record(b, False, 1.0)
+        health.record(b, True, 0.5)
+        health.record(b, False, 1.0)
+        assert health.state(b) == "closed"
+        stats = health.stats(b)
+        assert (stats["successes"], stats["failures"]) == (1, 2)
+        assert stats["samples"] == [[1.0, 0], [0.5, 1], [1.0, 0]]
+
+    def test_half_open_allows_single_probe(self, tmp_path, health):
+        b = _make_backend(tmp_path, name="ollama")
+        health.record(b, False, 1.0)
+        health.record(b, False, 1.0)
+        with patch("utils.common.time.time", return_value=time.time() + 120):
+            assert health.state(b) == "half-open"
+            assert health.allow(b) is True
+            assert health.allow(b) is False  # probe already in flight
+
+    def test_failed_probe_reopens_and_success_closes(self, tmp_path, health):
+        b = _make_backend(tmp_path, name="ollama")
+        health.record(b, False, 1.0)
+        health.record(b, False, 1.0)
+        later = time.time() + 120
+        with patch("utils.common.time.time", return_value=later):
+            health.allow(b)
+            health.record(b, False, 1.0)
+            assert health.state(b) == "open"
+        with patch("utils.common.time.time", return_value=later + 120):
+            health.allow(b)
+            health.record(b, True, 0.2)
+        assert health.state(b) == "closed"
+
+    def test_tts_and_llm_backends_with_same_name_are_separate(self, tmp_path, health):
+        (tmp_path / "tts").mkdir()
+        (tmp_path / "llm").mkdir()
+        tts = Backend("openai", tmp_path / "tts" / "openai_tts.py")
+        llm = Backend("openai", tmp_path / "llm" / "oai.py")
+        health.record(tts, False, 1.0)
+        health.record(tts, False, 1.0)
+        assert health.state(tts) == "open"
+        assert health.state(llm) == "closed"
+
+    def test_samples_are_bounded(self, tmp_path):
+        h = BackendHealth(tmp_path / "h.json", max_samples=3)
+        b = _make_backend(tmp_path, name="kokoro")
+        for i in range(5):
+            h.record(b, True, float(i))
+        assert [s[0] for s in h.stats(b)["samples"]] == [2.0, 3.0, 4.0]
+
+    def test_concurrent_processes_do_not_lose_counts(self, tmp_path):
+        f = tmp_path / "h.json"
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_record_many, args=(f, tmp_path, 25)) for _ in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=60)
+            assert p.exitcode == 0
+        stats = BackendHealth(f).stats(_make_backend(tmp_path, name="kokoro"))
+        assert stats["successes"] == 4 * 25
+
+    def test_corrupt_file_is_treated_as_empty(self, tmp_path):
+        f = tmp_path / "h.json"
+        f.write_text("{oops")
+        h = BackendHealth(f)
+        b = _make_backend(tmp_path, name="kokoro")
+        assert h.allow(b) is True
+        h.record(b, True, 0.1)
+        assert h.stats(b)["successes"] == 1
+
+
+def _record_many(health_file, tmp_path, count):
+    h = BackendHealth(health_file)
+    b = _make_backend(tmp_path, name="kokoro")
+    for _ in range(count):
+        h.record(b, True, 0.1)
+
+
+class TestServiceCircuitBreaker:
+    def test_open_tts_backend_is_skipped(self, tmp_path, health):
+        dead = _make_backend(tmp_path, name="ollama_tts")
+        ok = _make_backend(tmp_path, name="say")
+        health.record(dead, False, 10.0)
+        health.record(dead, False, 10.0)
+        svc = NotificationService([dead, ok], [], ["done"], health=health)
+        with patch.object(dead, "run") as dead_run, patch.object(ok, "run", return_value="") as ok_run:
+            svc.speak_notification("hello")
+        dead_run.assert_not_called()
+        ok_run.assert_called_once_with("hello")
+
+    def test_open_llm_backend_is_skipped(self, tmp_path, health):
+        dead = _make_backend(tmp_path, name="ollama")
+        ok = _make_backend(tmp_path, name="anthropic")
+        health.record(dead, False, 15.0)
+        health.record(dead, False, 15.0)
+        svc = NotificationService([], [dead, ok], ["fallback"], health=health)
+        with patch.object(dead, "run") as dead_run, patch.object(ok, "run", return_value="Done"):
+            assert svc._generate_message() == "Done"
+        dead_run.assert_not_called()
+
+    def test_runs_are_recorded(self, tmp_path, health):
+        failing = _make_backend(tmp_path, name="elevenlabs")
+        ok = _make_backend(tmp_path, name="say")
+        svc = NotificationService([failing, ok], [], ["done"], health=health)
+        with patch.object(failing, "run", return_value=None), patch.object(ok, "run", return_value=""):
+            svc.speak_notification("hello")
+        assert health.stats(failing)["consecutive_failures"] == 1
+        assert health.stats(ok)["successes"] == 1
+
+    def test_race_records_only_finished_runs(self, tmp_path, health):
+        winner, loser = _racer("a", "from a"), _racer("b", "late", delay=2.0)
+        winner.script = tmp_path / "llm" / "a.py"
+        loser.script = tmp_path / "llm" / "b.py"
+        svc = _race_service([winner, loser], health=health)
+        assert svc._generate_message() == "from a"
+        assert health.stats(winner)["successes"] == 1
+        assert health.stats(loser) == {}
+
+    def test_race_deadline_counts_stragglers_as_failures(self, tmp_path, health):
+        slow = _racer("a", "late", delay=2.0)
+        slow.script = tmp_path / "llm" / "a.py"
+        other = _racer("b", None)
+        other.script = tmp_path / "llm" / "b.py"
+        svc = _race_service([slow, other], health=health, llm_deadline=0.2)
+        assert svc._generate_message() == "fallback"
+        assert health.stats(slow)["failures"] == 1
+        assert health.stats(other)["failures"] == 1
+
+
+# ---------------------------------------------------------------------------
+# TestRankBackends
+# ---------------------------------------------------------------------------
+
+
+def _seed(health, backend, times, ok=True):
+    for t in times:
+        health.record(backend, ok, t)
+
+
+class TestRankBackends:
+    @pytest.fixture
+    def chain(self, tmp_path):
+        return [_make_backend(tmp_path, name=n) for n in ("elevenlabs", "openai", "kokoro", "pyttsx3")]
+
+    def test_unmeasured_keep_configured_order(self, chain, health):
+        assert rank_backends(chain, health) == chain
+
+    def test_fastest_reliable_backend_first(self, chain, health):
+        elevenlabs, openai, kokoro, pyttsx3 = chain
+        _seed(health, elevenlabs, [2.0, 2.2, 2.5])
+        _seed(health, pyttsx3, [0.3, 0.3, 0.4])
+        assert [b.name for b in rank_backends(chain, health)] == ["pyttsx3", "elevenlabs", "openai", "kokoro"]
+
+    def test_p95_tail_penalised(self, chain, health):
+        elevenlabs, openai, kokoro, pyttsx3 = chain
+        _seed(health, elevenlabs, [1.0] * 9 + [9.0])
+        _seed(health, openai, [1.5] * 10)
+        assert rank_backends(chain, health)[:2] == [openai, elevenlabs]
+
+    def test_mostly_failing_backend_sinks_below_unmeasured(self, chain, health):
+        elevenlabs, openai, kokoro, pyttsx3 = chain
+        _seed(health, elevenlabs, [0.1, 0.1, 0.1], ok=False)
+        assert rank_backends(chain, health)[-1] is elevenlabs
+
+    def test_success_rate_scales_cost(self, chain, health):
+        elevenlabs, openai, kokoro, pyttsx3 = chain
+        _seed(health, elevenlabs, [1.0, 1.0], ok=True)
+        _seed(health, elevenlabs, [1.0], ok=False)
+        _seed(health, openai, [1.2, 1.2, 1.2])
+        assert rank_backends(chain, health)[:2] == [openai, elevenlabs]
+
+    def test_pin_breaks_ties(self, chain, health):
+        elevenlabs, openai, kokoro, pyttsx3 = chain
+        _seed(health, elevenlabs, [1.05, 1.05, 1.05])
+        _seed(health, openai, [1.0, 1.0, 1.0])
+        assert rank_backends(chain, health)[0] is elevenlabs  # tie: configured order
+        assert rank_backends(chain, health, pinned=["tts/openai", "openai"])[0] is openai
+
+    def test_pin_does_not_override_clear_winner(self, chain, health):
+        elevenlabs, openai, kokoro, pyttsx3 = chain
+        _seed(health, elevenlabs, [3.0, 3.0, 3.0])
+        _seed(health, openai, [1.0, 1.0, 1.0])
+        assert rank_backends(chain, health, pinned=["elevenlabs"])[0] is openai
+
+    def test_build_service_adaptive_mode(self, tmp_path, health, monkeypatch):
+        monkeypatch.setenv("CLAUDE_NOTIFY_ORDER", "adaptive")
+        (tmp_path / "utils" / "llm").mkdir(parents=True)
+        _seed(health, Backend("ollama", tmp_path / "utils" / "llm" / "ollama.py"), [0.2, 0.2, 0.2])
+        with patch("utils.common.BackendHealth", return_value=health):
+            svc = build_service(hooks_dir=tmp_path)
+        assert svc.llm_backends[0].name == "ollama"
+        assert [b.name for b in svc.tts_backends] == ["elevenlabs", "openai", "kokoro", "pyttsx3"]
+
+
+# ---------------------------------------------------------------------------
+# TestMessageCache
+# ---------------------------------------------------------------------------
+
+
+_CONTEXT = "Request: fix the tests\nActions: Edit src/app.py, Bash(pytest -q)\nOutcome: All 42 tests pass."
+
+
+class TestMessageCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return MessageCache(tmp_path / "message-cache.sqlite", ttl=60, max_entries=3)
+
+    def test_round_trip(self, cache):
+        assert cache.get(_CONTEXT) is None
+        cache.put(_CONTEXT, "Tests are green!")
+        assert cache.get(_CONTEXT) == "Tests are green!"
+
+    def test_near_identical_contexts_share_a_key(self):
+        variant = _CONTEXT.replace("42", "43").upper().replace(" ", "  ")
+        assert normalize_context(variant) == normalize_context(_CONTEXT)
+        assert MessageCache.key(variant) == MessageCache.key(_CONTEXT)
+        assert MessageCache.key(_CONTEXT.replace("app.py", "db.py")) != MessageCache.key(_CONTEXT)
+
+    def test_hashes_fold_but_hex_letter_words_do_not(self):
+        assert normalize_context("commit abc1234 by 550e8400-e29b-41d4-a716-446655440000") == "commit # by #"
+        assert normalize_context("Defaced, effaced and added a decade") == "defaced, effaced and added a decade"
+        assert MessageCache.key("effaced the README") != MessageCache.key("defaced the README")
+
+    def test_entries_expire(self, cache):
+        cache.put(_CONTEXT, "old news")
+        with patch("utils.common.time.time", return_value=time.time() + 61):
+            assert cache.get(_CONTEXT) is None
+
+    def test_least_recently_used_evicted(self, cache):
+        for i in "abc":
+            cache.put(f"context {i}", i)
+        cache.get("context a")
+        cache.put("context d", "d")
+        assert cache.get("context b") is None
+        assert [cache.get(f"context {i}") for i in "acd"] == ["a", "c", "d"]
+
+    def test_unwritable_location_is_a_miss(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        cache = MessageCache(blocker / "cache.sqlite")
+        cache.put(_CONTEXT, "x")
+        assert cache.get(_CONTEXT) is None
+
+    def test_hit_skips_llm(self, tmp_path, cache):
+        llm = _make_backend(tmp_path, name="llm")
+        svc = NotificationService([], [llm], ["fallback"], message_cache=cache)
+        with patch("utils.common.TranscriptCache.summarize", return_value=_CONTEXT), \
+             patch.object(llm, "run", return_value="Tests are green!") as run:
+            assert svc._generate_message("t.jsonl") == "Tests are green!"
+            assert svc._generate_message("t.jsonl") == "Tests are green!"
+        run.assert_called_once()
+
+    def test_fallback_and_contextless_messages_not_cached(self, tmp_path, cache):
+        llm = _make_backend(tmp_path, name="llm")
+        svc = NotificationService([], [llm], ["fallback"], message_cache=cache)
+        with patch("utils.common.TranscriptCache.summarize", return_value=_CONTEXT), \
+             patch.object(llm, "run", return_value=None):
+            assert svc._generate_message("t.jsonl") == "fallback"
+        assert cache.get(_CONTEXT) is None
+        with patch("utils.common.TranscriptCache.summarize", return_value=None), \
+             patch.object(llm, "run", return_value="Done!") as run:
+            svc._generate_message(None)
+            svc._generate_message(None)
+        assert run.call_count == 2
+
+    def test_build_service_ttl_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_NOTIFY_MESSAGE_TTL", "0")
+        assert build_service(hooks_dir=tmp_path).message_cache is None
+        monkeypatch.setenv("CLAUDE_NOTIFY_MESSAGE_TTL", "120")
+        assert build_service(hooks_dir=tmp_path).message_cache.ttl == 120
+
+
 # ---------------------------------------------------------------------------
 # TestBuildService
 # ---------------------------------------------------------------------------
@@ -453,6 +1052,17 @@ class TestBuildService:
         names = [b.name for b in svc.llm_backends]
         assert names == ["claude_cli", "openai", "anthropic", "ollama"]
 
+    def test_llm_race_off_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CLAUDE_NOTIFY_LLM_RACE", raising=False)
+        assert build_service(hooks_dir=tmp_path).llm_race is False
+
+    def test_llm_race_configured_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_NOTIFY_LLM_RACE", "1")
+        monkeypatch.setenv("CLAUDE_NOTIFY_LLM_DEADLINE", "4")
+        monkeypatch.setenv("CLAUDE_NOTIFY_LLM_GRACE", "bogus")
+        svc = build_service(hooks_dir=tmp_path)
+        assert (svc.llm_race, svc.llm_deadline, svc.llm_grace) == (True, 4.0, 0.5)
+
 
 # Recursion guard behavior is tested behaviorally in test_hooks_integration.py:
 # TestStopHookBehavior::test_recursion_guard_exits_zero_no_log
@@ -558,6 +1168,358 @@ class TestDeliverVisual:
         assert "--urgent" in received[0]
 
 
+# ---------------------------------------------------------------------------
+# TestConcurrentDelivery
+# ---------------------------------------------------------------------------
+
+
+def _channel(name, result="", delay=0.0, log=None):
+    """A mock delivery backend that records when it finished."""
+    b = MagicMock(spec=Backend)
+    b.name = name
+    b.timeout = 10
+    b.is_available.return_value = True
+
+    def run(*args, **kwargs):
+        time.sleep(delay)
+        if log is not None:
+            log.append((name, time.monotonic()))
+        return result
+
+    b.run.side_effect = run
+    return b
+
+
+class TestConcurrentDelivery:
+    def test_visual_not_delayed_by_slow_tts(self):
+        log = []
+        tts = _channel("kokoro", delay=0.5, log=log)
+        visual = _channel("macos", log=log)
+        svc = NotificationService([tts], [], ["done"], visual_backends=[visual])
+        start = time.monotonic()
+        svc.speak_notification("Build finished")
+        assert [name for name, _ in log] == ["macos", "kokoro"]
+        assert log[0][1] - start < 0.25
+
+    def test_deadline_bounds_delivery(self):
+        tts = _channel("kokoro", delay=2.0)
+        visual = _channel("macos")
+        svc = NotificationService([tts], [], ["done"], visual_backends=[visual], delivery_deadline=0.2)
+        start = time.monotonic()
+        svc.speak_notification("Build finished")
+        assert time.monotonic() - start < 1.0
+        visual.run.assert_called_once_with("Build finished", "--urgent")
+
+    def test_each_channel_keeps_its_fallback_order(self):
+        tts1, tts2 = _channel("elevenlabs", result=None), _channel("openai")
+        vis1, vis2 = _channel("macos", result=None), _channel("terminal")
+        svc = NotificationService([tts1, tts2], [], ["done"], visual_backends=[vis1, vis2])
+        svc.speak_notification("hi")
+        for b in (tts1, tts2, vis1, vis2):
+            b.run.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# TestBudget
+# ---------------------------------------------------------------------------
+
+
+def _budget_service(tts=(), llms=(), **kwargs):
+    return NotificationService(list(tts), list(llms), ["fallback"], **kwargs)
+
+
+class TestBudget:
+    def test_unbounded_budget(self):
+        budget = Budget()
+        assert not budget.bounded
+        assert budget.remaining() == float("inf")
+        assert budget.until_first_sound() == float("inf")
+
+    def test_first_sound_and_total_count_down(self):
+        budget = Budget(first_sound=2.0, total=10.0, started=time.monotonic() - 1.5)
+        assert 0.4 < budget.until_first_sound() <= 0.5
+        assert 8.4 < budget.remaining() <= 8.5
+        assert Budget(first_sound=5.0, total=1.0).until_first_sound() <= 1.0
+        assert Budget(total=1.0, started=time.monotonic() - 5).remaining() == 0.0
+
+    def test_llm_run_is_capped_by_generation_window(self):
+        llm = _channel("anthropic", result="Done")
+        svc = _budget_service(llms=[llm], first_sound=2.0, speech_lead=0.5)
+        assert svc._generate_message(budget=svc.budget()) == "Done"
+        assert llm.run.call_args.kwargs["timeout"] <= 1.5
+
+    def test_unbounded_llm_run_keeps_backend_timeout(self):
+        llm = _channel("anthropic", result="Done")
+        assert _budget_service(llms=[llm])._generate_message() == "Done"
+        llm.run.assert_called_once_with("--completion")
+
+    def test_spent_window_degrades_to_fallback(self):
+        llm = _channel("anthropic", result="Done")
+        svc = _budget_service(llms=[llm], first_sound=0.4, speech_lead=0.5)
+        assert svc._generate_message(budget=svc.budget()) == "fallback"
+        llm.run.assert_not_called()
+
+    def test_cached_message_used_when_window_is_spent(self, tmp_path):
+        transcript = tmp_path / "t.jsonl"
+        transcript.write_text(json.dumps({"type": "user", "message": {"content": "Fix the login bug"}}) + "\n")
+        llm = _channel("anthropic", result="Login fixed!")
+        cache = MessageCache(tmp_path / "cache.sqlite")
+        with patch("utils.common.TranscriptCache.summarize", return_value="User asked: fix login"):
+            svc = _budget_service(llms=[llm], message_cache=cache)
+            assert svc._generate_message(str(transcript)) == "Login fixed!"
+            svc = _budget_service(llms=[llm], message_cache=cache, first_sound=0.1)
+            assert svc._generate_message(str(transcript), svc.budget()) == "Login fixed!"
+        llm.run.assert_called_once()
+
+    def test_backend_too_slow_for_window_is_skipped(self, tmp_path, health):
+        slow = _channel("ollama", result="slow answer")
+        slow.script = tmp_path / "llm" / "ollama.py"
+        fast = _channel("openai", result="fast answer")
+        fast.script = tmp_path / "llm" / "oai.py"
+        for _ in range(3):
+            health.record(slow, True, 4.0)
+        svc = _budget_service(llms=[slow, fast], health=health, first_sound=2.0)
+        assert svc._generate_message(budget=svc.budget()) == "fast answer"
+        slow.run.assert_not_called()
+
+    def test_slow_half_open_backend_keeps_its_probe(self, tmp_path, health):
+        slow = _channel("ollama", result="slow answer")
+        slow.script = tmp_path / "llm" / "ollama.py"
+        for _ in range(3):
+            health.record(slow, True, 4.0)
+        health.record(slow, False, 4.0)
+        health.record(slow, False, 4.0)
+        later = time.time() + 120
+        svc = _budget_service(llms=[slow], health=health, first_sound=2.0)
+        with patch("utils.common.time.time", return_value=later):
+            assert svc._generate_message(budget=svc.budget()) == "fallback"
+            slow.run.assert_not_called()
+            assert health.state(slow) == "half-open"  # probe not spent on a skipped backend
+            assert health.allow(slow) is True
+
+    def test_spent_total_does_not_claim_probe(self, tmp_path, health):
+        tts = _channel("elevenlabs")
+        tts.script = tmp_path / "tts" / "elevenlabs_tts.py"
+        health.record(tts, False, 1.0)
+        health.record(tts, False, 1.0)
+        svc = _budget_service(health=health)
+        with patch("utils.common.time.time", return_value=time.time() + 120):
+            assert svc._run_chain([tts], "hi", budget=Budget(total=1.0, started=time.monotonic() - 5)) is False
+            assert health.allow(tts) is True
+
+    def test_race_is_limited_by_window(self):
+        llms = [_racer("a", "late", delay=2.0), _racer("b", "late", delay=2.0)]
+        svc = _race_service(llms, first_sound=0.7, speech_lead=0.5)
+        start = time.monotonic()
+        assert svc._generate_message(budget=svc.budget()) == "fallback"
+        assert time.monotonic() - start < 1.0
+
+    def test_total_budget_bounds_delivery(self):
+        tts = _channel("kokoro", delay=2.0)
+        svc = _budget_service(tts=[tts], total_budget=0.3)
+        start = time.monotonic()
+        svc.speak_notification("Build finished")
+        assert time.monotonic() - start < 1.0
+        assert tts.run.call_args.kwargs["timeout"] <= 0.3
+
+    def test_spent_total_skips_remaining_backends(self):
+        svc = _budget_service()
+        first, second = _channel("elevenlabs", result=None), _channel("say")
+        budget = Budget(total=1.0, started=time.monotonic() - 5)
+        assert svc._run_chain([first, second], "hi", budget=budget) is False
+        first.run.assert_not_called()
+        second.run.assert_not_called()
+
+    def test_build_service_reads_budget_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_NOTIFY_FIRST_SOUND", "2")
+        monkeypatch.setenv("CLAUDE_NOTIFY_BUDGET", "12")
+        svc = build_service(hooks_dir=tmp_path, mode="silent")
+        assert (svc.first_sound, svc.total_budget, svc.speech_lead) == (2.0, 12.0, 0.5)
+        monkeypatch.delenv("CLAUDE_NOTIFY_FIRST_SOUND")
+        monkeypatch.delenv("CLAUDE_NOTIFY_BUDGET")
+        svc = build_service(hooks_dir=tmp_path, mode="silent")
+        assert not svc.budget().bounded
+
+
+# ---------------------------------------------------------------------------
+# TestInProcessBackend
+# ---------------------------------------------------------------------------
+
+
+def _plugin(tmp_path, name, body, deps=()):
+    script = tmp_path / f"{name}.py"
+    header = "# /// script\n# dependencies = [\n" + "".join(f'#     "{d}",\n' for d in deps) + "# ]\n# ///\n"
+    script.write_text(header + textwrap.dedent(body))
+    return script
+
+
+class TestInProcessBackend:
+    def test_completion_entry_receives_context(self, tmp_path):
+        script = _plugin(tmp_path, "llm_ok", """
+            import os
+            def generate_completion_message(context=None):
+                print("noise on stdout")
+                return f"  done: {context} in {os.getpid()}  "
+        """)
+        b = InProcessBackend("llm", script, entry="generate_completion_message")
+        with patch("utils.common.subprocess.run") as mock_run:
+            assert b.run("--completion", "--context", "fixed auth") == f"done: fixed auth in {os.getpid()}"
+        mock_run.assert_not_called()
+
+    def test_completion_none_is_failure(self, tmp_path):
+        script = _plugin(tmp_path, "llm_none", "def generate_completion_message(context=None):\n    return None\n")
+        b = InProcessBackend("llm", script, entry="generate_completion_message")
+        assert b.run("--completion") is None
+
+    def test_speak_success_and_failure(self, tmp_path):
+        script = _plugin(tmp_path, "tts_speak", """
+            def speak(text):
+                if text == "boom":
+                    raise RuntimeError("device busy")
+        """)
+        b = InProcessBackend("tts", script)
+        assert b.run("hello") == ""
+        assert b.run("boom") is None
+
+    def test_falls_back_to_uv_when_dependencies_missing(self, tmp_path):
+        script = _plugin(
+            tmp_path, "tts_heavy", "import not_a_real_package_xyz\ndef speak(text):\n    pass\n",
+            deps=("not-a-real-package-xyz",),
+        )
+        b = InProcessBackend("tts", script)
+        mock_result = MagicMock(returncode=0, stdout="")
+        with patch("utils.common.subprocess.run", return_value=mock_result) as mock_run:
+            assert b.run("hello") == ""
+        assert mock_run.call_args[0][0] == ["uv", "run", str(script), "hello"]
+
+    def test_falls_back_to_uv_on_import_error_at_call_time(self, tmp_path):
+        script = _plugin(tmp_path, "tts_extra", "def speak(text):\n    import not_a_real_package_xyz\n")
+        b = InProcessBackend("tts", script)
+        mock_result = MagicMock(returncode=0, stdout="")
+        with patch("utils.common.subprocess.run", return_value=mock_result) as mock_run:
+            assert b.run("hello") == ""
+            assert b.run("again") == ""
+        assert mock_run.call_count == 2
+        assert load_plugin(script) is None
+
+    def test_lazily_imported_dependency_still_loads_in_process(self, tmp_path):
+        # Like kokoro_tts.py: the heavy package is declared but only imported by the fallback path
+        script = _plugin(tmp_path, "tts_lazy", """
+            def speak(text):
+                if text == "one-shot":
+                    import not_a_real_package_xyz
+        """, deps=("not-a-real-package-xyz",))
+        b = InProcessBackend("tts", script)
+        with patch("utils.common.subprocess.run") as mock_run:
+            assert b.run("via server") == ""
+        mock_run.assert_not_called()
+
+    def test_module_is_imported_once(self, tmp_path):
+        counter = tmp_path / "imports.txt"
+        script = _plugin(tmp_path, "tts_once", f"""
+            with open({str(counter)!r}, "a") as f:
+                f.write("x")
+            def speak(text):
+                pass
+        """)
+        b = InProcessBackend("tts", script)
+        b.run("a")
+        b.run("b")
+        assert counter.read_text() == "x"
+
+    def test_isolated_call_runs_in_child(self, tmp_path):
+        script = _plugin(tmp_path, "tts_pid", "import os\ndef speak(text):\n    return str(os.getpid())\n")
+        b = InProcessBackend("tts", script, isolate=True)
+        assert b.run("hi") not in ("", str(os.getpid()))
+
+    def test_isolated_call_discards_child_stdout(self, tmp_path, capfd):
+        script = _plugin(tmp_path, "tts_noisy", "def speak(text):\n    print('noise on stdout')\n    return 'ok'\n")
+        assert InProcessBackend("tts", script, isolate=True).run("hi") == "ok"
+        assert "noise" not in capfd.readouterr().out
+
+    def test_threaded_call_leaves_stdout_alone(self, tmp_path):
+        script = _plugin(tmp_path, "llm_blocking", """
+            import threading
+            started, release = threading.Event(), threading.Event()
+            def generate_completion_message(context=None):
+                started.set()
+                release.wait(5)
+                return "ok"
+        """)
+        b = InProcessBackend("llm", script, entry="generate_completion_message")
+        module = load_plugin(script)
+        stdout = sys.stdout
+        results = []
+        caller = threading.Thread(target=lambda: results.append(b.run("--completion")))
+        caller.start()
+        try:
+            assert module.started.wait(5)
+            assert sys.stdout is stdout
+        finally:
+            module.release.set()
+            caller.join(5)
+        assert results == ["ok"]
+
+    def test_isolated_call_enforces_timeout(self, tmp_path):
+        script = _plugin(tmp_path, "tts_hang", "import time\ndef speak(text):\n    time.sleep(30)\n")
+        b = InProcessBackend("tts", script, isolate=True, timeout=0.3)
+        start = time.monotonic()
+        assert b.run("hi") is None
+        assert time.monotonic() - start < 5
+
+    def test_default_timeout_bounds_non_isolated_call(self, tmp_path):
+        script = _plugin(tmp_path, "llm_stuck", """
+            import time
+            def generate_completion_message(context=None):
+                time.sleep(30)
+        """)
+        b = InProcessBackend("llm", script, entry="generate_completion_message", timeout=0.3)
+        start = time.monotonic()
+        assert b.run("--completion") is None
+        assert time.monotonic() - start < 5
+
+    def test_explicit_timeout_is_enforced(self, tmp_path):
+        script = _plugin(tmp_path, "llm_hang", """
+            import time
+            def generate_completion_message(context=None):
+                time.sleep(30)
+        """)
+        b = InProcessBackend("llm", script, entry="generate_completion_message")
+        start = time.monotonic()
+        assert b.run("--completion", timeout=0.3) is None
+        assert time.monotonic() - start < 5
+
+    def test_isolated_failure_is_none(self, tmp_path):
+        script = _plugin(tmp_path, "tts_fail", "def speak(text):\n    raise SystemExit(1)\n")
+        assert InProcessBackend("tts", script, isolate=True).run("hi") is None
+
+    def test_service_mixes_backend_kinds(self, tmp_path):
+        script = _plugin(tmp_path, "tts_fails_inproc", "def speak(text):\n    raise RuntimeError\n")
+        inproc = InProcessBackend("inproc", script)
+        subproc = _make_backend(tmp_path, name="say")
+        svc = NotificationService([inproc, subproc], [], ["done"])
+        with patch.object(subproc, "run", return_value="") as sub_run:
+            svc.speak_notification("hello")
+        sub_run.assert_called_once_with("hello")
+
+    def test_build_service_uses_in_process_backends(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CLAUDE_NOTIFY_INPROCESS", raising=False)
+        svc = build_service(hooks_dir=tmp_path)
+        assert all(isinstance(b, InProcessBackend) for b in svc.tts_backends + svc.llm_backends)
+        assert {b.entry for b in svc.llm_backends} == {"generate_completion_message"}
+        monkeypatch.setenv("CLAUDE_NOTIFY_INPROCESS", "0")
+        svc = build_service(hooks_dir=tmp_path)
+        assert not any(isinstance(b, InProcessBackend) for b in svc.tts_backends + svc.llm_backends)
+
+    def test_shipped_tts_scripts_expose_speak(self):
+        import ast
+        tts_dir = Path(__file__).parent.parent / "dot_claude" / "hooks" / "utils" / "tts"
+        for script in tts_dir.glob("*_tts.py"):
+            tree = ast.parse(script.read_text())
+            names = {n.name for n in tree.body if isinstance(n, ast.FunctionDef)}
+            assert "speak" in names, script.name
+
+
 # ---------------------------------------------------------------------------
 # TestCompletionMessagePrompt
 # Tests the *structure* of the LLM prompt, not LLM output quality (eval
@@ -19,6 +19,7 @@ HOOKS_DIR = Path.home() / ".claude" / "hooks"
 # Helpers from common.py (unit tests for the log helpers added in this refactor)
 sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
 from utils.common import append_to_log, copy_transcript_to_chat
+from utils.event_store import read_events
 
 
 # ---------------------------------------------------------------------------
@@ -45,6 +46,11 @@ def run_hook(script: str, input_data: dict, args: tuple = (), env_overrides: dic
     )
 
 
+def read_jsonl(path: Path) -> list[dict]:
+    """Read a JSONL hook log into a list of events."""
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
 def make_transcript(tmp_path: Path, lines: list[dict] = None) -> Path:
     """Write a minimal JSONL transcript and return its path."""
     lines = lines or [
@@ -65,17 +71,16 @@ class TestStopHookBehavior:
     def test_exits_zero_and_writes_log(self, tmp_path):
         result = run_hook("stop.py", {"event": "stop"}, home=tmp_path)
         assert result.returncode == 0
-        log = tmp_path / ".claude" / "logs" / "stop.json"
+        log = tmp_path / ".claude" / "logs" / "stop.jsonl"
         assert log.exists()
-        data = json.loads(log.read_text())
-        assert isinstance(data, list)
+        data = read_jsonl(log)
         assert data[0] == {"event": "stop"}
 
     def test_appends_on_multiple_calls(self, tmp_path):
         run_hook("stop.py", {"n": 1}, home=tmp_path)
         run_hook("stop.py", {"n": 2}, home=tmp_path)
-        log = tmp_path / ".claude" / "logs" / "stop.json"
-        data = json.loads(log.read_text())
+        log = tmp_path / ".claude" / "logs" / "stop.jsonl"
+        data = read_jsonl(log)
         assert len(data) == 2
         assert data[0]["n"] == 1
         assert data[1]["n"] == 2
@@ -107,7 +112,7 @@ class TestStopHookBehavior:
             home=tmp_path,
         )
         assert result.returncode == 0
-        assert not (tmp_path / ".claude" / "logs" / "stop.json").exists()
+        assert not (tmp_path / ".claude" / "logs" / "stop.jsonl").exists()
 
     def test_invalid_json_exits_zero(self, tmp_path):
         env = {**os.environ, "HOME": str(tmp_path)}
@@ -131,15 +136,15 @@ class TestNotificationHookBehavior:
     def test_exits_zero_and_writes_log(self, tmp_path):
         result = run_hook("notification.py", {"message": "Claude needs input"}, home=tmp_path)
         assert result.returncode == 0
-        log = tmp_path / ".claude" / "logs" / "notification.json"
+        log = tmp_path / ".claude" / "logs" / "notification.jsonl"
         assert log.exists()
-        data = json.loads(log.read_text())
+        data = read_jsonl(log)
         assert data[0]["message"] == "Claude needs input"
 
     def test_appends_on_multiple_calls(self, tmp_path):
         run_hook("notification.py", {"message": "first"}, home=tmp_path)
         run_hook("notification.py", {"message": "second"}, home=tmp_path)
-        data = json.loads((tmp_path / ".claude" / "logs" / "notification.json").read_text())
+        data = read_jsonl(tmp_path / ".claude" / "logs" / "notification.jsonl")
         assert len(data) == 2
 
     def test_recursion_guard_exits_zero_no_log(self, tmp_path):
@@ -150,7 +155,7 @@ class TestNotificationHookBehavior:
             home=tmp_path,
         )
         assert result.returncode == 0
-        assert not (tmp_path / ".claude" / "logs" / "notification.json").exists()
+        assert not (tmp_path / ".claude" / "logs" / "notification.jsonl").exists()
 
 
 # ---------------------------------------------------------------------------
@@ -162,9 +167,9 @@ class TestSubagentStopHookBehavior:
     def test_exits_zero_and_writes_log(self, tmp_path):
         result = run_hook("subagent_stop.py", {"event": "subagent_stop"}, home=tmp_path)
         assert result.returncode == 0
-        log = tmp_path / ".claude" / "logs" / "subagent_stop.json"
+        log = tmp_path / ".claude" / "logs" / "subagent_stop.jsonl"
         assert log.exists()
-        data = json.loads(log.read_text())
+        data = read_jsonl(log)
         assert data[0] == {"event": "subagent_stop"}
 
     def test_chat_flag_writes_chat_json(self, tmp_path):
@@ -186,7 +191,7 @@ class TestSubagentStopHookBehavior:
             home=tmp_path,
         )
         assert result.returncode == 0
-        assert not (tmp_path / ".claude" / "logs" / "subagent_stop.json").exists()
+        assert not (tmp_path / ".claude" / "logs" / "subagent_stop.jsonl").exists()
 
 
 # ---------------------------------------------------------------------------
@@ -196,24 +201,27 @@ class TestSubagentStopHookBehavior:
 
 class TestAppendToLog:
     def test_creates_file_and_directory(self, tmp_path):
-        log_path = str(tmp_path / "sublogs" / "test.json")
+        log_path = str(tmp_path / "sublogs" / "test.jsonl")
         append_to_log(log_path, {"key": "value"})
-        data = json.loads(Path(log_path).read_text())
-        assert data == [{"key": "value"}]
+        assert read_jsonl(Path(log_path)) == [{"key": "value"}]
 
     def test_appends_to_existing(self, tmp_path):
-        log_path = str(tmp_path / "test.json")
+        log_path = str(tmp_path / "test.jsonl")
         append_to_log(log_path, {"n": 1})
         append_to_log(log_path, {"n": 2})
-        data = json.loads(Path(log_path).read_text())
-        assert len(data) == 2
+        assert read_jsonl(Path(log_path)) == [{"n": 1}, {"n": 2}]
+
+    def test_writes_one_compact_line_per_event(self, tmp_path):
+        log_path = tmp_path / "test.jsonl"
+        append_to_log(str(log_path), {"a": 1, "b": [1, 2]})
+        assert log_path.read_text() == '{"a":1,"b":[1,2]}\n'
 
-    def test_recovers_from_corrupt_file(self, tmp_path):
-        log_path = tmp_path / "corrupt.json"
-        log_path.write_text("not valid json")
+    def test_does_not_rewrite_existing_content(self, tmp_path):
+        log_path = tmp_path / "corrupt.jsonl"
+        log_path.write_text("not valid json\n")
         append_to_log(str(log_path), {"recovered": True})
-        data = json.loads(log_path.read_text())
-        assert data == [{"recovered": True}]
+        assert log_path.read_text().startswith("not valid json\n")
+        assert list(read_events(log_path)) == [{"recovered": True}]
 
 
 # ---------------------------------------------------------------------------
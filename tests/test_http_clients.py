@@ -0,0 +1,88 @@
+"""Tests for the shared provider client registry."""
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils import http_clients  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    http_clients._clients.clear()
+    yield
+    http_clients._clients.clear()
+
+
+@pytest.fixture
+def fake_httpx():
+    module = SimpleNamespace(
+        Client=MagicMock(side_effect=lambda **kwargs: SimpleNamespace(kwargs=kwargs, close=MagicMock())),
+        Limits=lambda **kwargs: kwargs,
+        Timeout=lambda read, connect: (read, connect),
+    )
+    with patch.dict(sys.modules, {"httpx": module}):
+        yield module
+
+
+# ---------------------------------------------------------------------------
+# TestRegistry
+# ---------------------------------------------------------------------------
+
+
+class TestRegistry:
+    def test_shared_creates_once_per_key(self):
+        factory = MagicMock(side_effect=object)
+        a = http_clients.shared(("p", "k1"), factory)
+        assert http_clients.shared(("p", "k1"), factory) is a
+        assert http_clients.shared(("p", "k2"), factory) is not a
+        assert factory.call_count == 2
+
+    def test_http_client_pooled_per_provider_with_limits(self, fake_httpx):
+        client = http_clients.http_client("ollama")
+        assert http_clients.http_client("ollama") is client
+        assert http_clients.http_client("anthropic") is not client
+        assert client.kwargs["limits"]["max_connections"] == http_clients.PROVIDER_LIMITS["ollama"]
+        assert client.kwargs["timeout"] == (http_clients.READ_TIMEOUT, http_clients.CONNECT_TIMEOUT)
+
+    def test_http2_follows_h2_availability(self, fake_httpx):
+        with patch.object(http_clients, "http2_available", return_value=True):
+            assert http_clients.http_client("openai").kwargs["http2"] is True
+        with patch.object(http_clients, "http2_available", return_value=False):
+            assert http_clients.http_client("elevenlabs").kwargs["http2"] is False
+
+    def test_sdk_clients_share_the_provider_pool(self, fake_httpx):
+        openai = SimpleNamespace(OpenAI=MagicMock(side_effect=lambda **kw: SimpleNamespace(**kw)))
+        with patch.dict(sys.modules, {"openai": openai}):
+            a = http_clients.openai_client("sk-1")
+            b = http_clients.openai_client("sk-2")
+            assert http_clients.openai_client("sk-1") is a
+            local = http_clients.openai_client("ollama", base_url="http://localhost:11434/v1", provider="ollama")
+        assert a.http_client is b.http_client
+        assert local.http_client is not a.http_client
+        assert openai.OpenAI.call_count == 3
+
+    def test_close_all_closes_http_pools(self, fake_httpx):
+        client = http_clients.http_client("openai")
+        http_clients.close_all()
+        client.close.assert_called_once()
+        assert http_clients._clients == {}
+
+    def test_forked_child_starts_empty(self):
+        http_clients.shared(("p",), object)
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(w, str(len(http_clients._clients)).encode())
+            os._exit(0)
+        os.close(w)
+        os.waitpid(pid, 0)
+        assert os.read(r, 16) == b"0"
+        os.close(r)
+        assert len(http_clients._clients) == 1
@@ -0,0 +1,164 @@
+"""Tests for the warm Kokoro synthesis server and the kokoro_tts.py client."""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks" / "utils" / "tts"))
+
+import kokoro_server  # noqa: E402
+import kokoro_tts  # noqa: E402
+from utils.audio_cache import AudioCache  # noqa: E402
+
+
+class FakeSynth:
+    """Stands in for Synthesizer: records requests instead of loading Kokoro."""
+
+    def __init__(self, fail=False, wav=None):
+        self.spoken = []
+        self.warmed = []
+        self.fail = fail
+        self.wav = wav
+
+    def warm(self, voice):
+        self.warmed.append(voice)
+
+    def speak(self, text, voice, speed=1.0):
+        if self.fail:
+            raise RuntimeError("no audio device")
+        self.spoken.append((text, voice, speed))
+        return self.wav
+
+
+@pytest.fixture(autouse=True)
+def audio_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLAUDE_TTS_CACHE_DIR", str(tmp_path / "tts-cache"))
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    # AF_UNIX paths are limited to ~104 bytes; pytest tmp paths can exceed that.
+    path = Path(f"/tmp/kokoro-test-{os.getpid()}-{tmp_path.name}.sock")
+    yield path
+    path.unlink(missing_ok=True)
+    Path(str(path) + ".lock").unlink(missing_ok=True)
+
+
+def start_server(socket_path, synth, idle_timeout=5.0, warm_voice=""):
+    thread = threading.Thread(
+        target=kokoro_server.serve, args=(socket_path, synth, idle_timeout, warm_voice), daemon=True
+    )
+    thread.start()
+    deadline = time.time() + 5
+    while not socket_path.exists() and time.time() < deadline:
+        time.sleep(0.01)
+    return thread
+
+
+# ---------------------------------------------------------------------------
+# TestServer
+# ---------------------------------------------------------------------------
+
+
+class TestServer:
+    def test_client_round_trip(self, socket_path, monkeypatch):
+        synth = FakeSynth()
+        start_server(socket_path, synth, warm_voice="bf_emma")
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        assert kokoro_tts._via_server("All done", "bf_emma") == {"ok": True}
+        assert synth.spoken == [("All done", "bf_emma", 1.0)]
+        assert synth.warmed == ["bf_emma"]
+
+    def test_synthesis_error_is_reported(self, socket_path, monkeypatch):
+        start_server(socket_path, FakeSynth(fail=True))
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        response = kokoro_tts._via_server("hi", "af_heart")
+        assert response["ok"] is False
+        assert "no audio device" in response["error"]
+
+    def test_empty_text_is_rejected(self, socket_path, monkeypatch):
+        synth = FakeSynth()
+        start_server(socket_path, synth)
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        assert kokoro_tts._via_server("   ", "af_heart")["ok"] is False
+        assert synth.spoken == []
+
+    def test_exits_when_idle_and_removes_socket(self, socket_path):
+        thread = start_server(socket_path, FakeSynth(), idle_timeout=0.2)
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert not socket_path.exists()
+
+    def test_second_server_exits_immediately(self, socket_path):
+        start_server(socket_path, FakeSynth())
+        second = threading.Thread(target=kokoro_server.serve, args=(socket_path, FakeSynth(), 5.0), daemon=True)
+        second.start()
+        second.join(timeout=5)
+        assert not second.is_alive()
+
+
+# ---------------------------------------------------------------------------
+# TestClient
+# ---------------------------------------------------------------------------
+
+
+class TestClient:
+    def test_unreachable_server_is_none(self, socket_path, monkeypatch):
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        assert kokoro_tts._via_server("hi", "af_heart") is None
+
+    def test_falls_back_to_one_shot_and_starts_server(self, socket_path, monkeypatch):
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        monkeypatch.delenv("KOKORO_SERVER", raising=False)
+        monkeypatch.setenv("KOKORO_VOICE", "bf_lily")
+        with patch.object(kokoro_tts, "_start_server") as start, \
+             patch.object(kokoro_tts, "speak_once") as once:
+            kokoro_tts.speak("hello")
+        start.assert_called_once()
+        once.assert_called_once_with("hello", "bf_lily")
+
+    def test_server_failure_raises(self, socket_path, monkeypatch):
+        start_server(socket_path, FakeSynth(fail=True))
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        monkeypatch.delenv("KOKORO_SERVER", raising=False)
+        with patch.object(kokoro_tts, "speak_once") as once, pytest.raises(RuntimeError):
+            kokoro_tts.speak("hello")
+        once.assert_not_called()
+
+    def test_server_synthesis_is_cached_for_next_call(self, socket_path, monkeypatch):
+        synth = FakeSynth(wav=b"RIFF-clip")
+        start_server(socket_path, synth)
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        monkeypatch.delenv("KOKORO_SERVER", raising=False)
+        monkeypatch.setenv("KOKORO_VOICE", "af_heart")
+        kokoro_tts.speak("Build finished")
+        key = kokoro_tts._key("Build finished", "af_heart")
+        deadline = time.time() + 5
+        while AudioCache().lookup(key) is None and time.time() < deadline:
+            time.sleep(0.01)  # the server stores the clip after it has replied
+
+        with patch("utils.audio_cache.play_file", return_value=True) as play:
+            kokoro_tts.speak("Build finished")
+        assert play.call_args[0][0].read_bytes() == b"RIFF-clip"
+        assert len(synth.spoken) == 1
+
+    def test_server_without_audio_caches_nothing(self, socket_path, monkeypatch):
+        start_server(socket_path, FakeSynth())
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        assert kokoro_tts._via_server("hi", "af_heart") == {"ok": True}
+        assert AudioCache().lookup(kokoro_tts._key("hi", "af_heart")) is None
+
+    def test_server_can_be_disabled(self, socket_path, monkeypatch):
+        synth = FakeSynth()
+        start_server(socket_path, synth)
+        monkeypatch.setattr(kokoro_tts, "SOCKET_PATH", str(socket_path))
+        monkeypatch.setenv("KOKORO_SERVER", "0")
+        with patch.object(kokoro_tts, "speak_once") as once:
+            kokoro_tts.speak("hello")
+        once.assert_called_once()
+        assert synth.spoken == []
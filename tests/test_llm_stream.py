@@ -0,0 +1,53 @@
+"""Tests for the first-sentence early exit on streamed LLM completions."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils.llm_stream import take_first_sentence
+
+
+class TestTakeFirstSentence:
+    def test_stops_at_newline(self):
+        assert take_first_sentence(iter(["All done", "!\nMore text", " here"])) == "All done!"
+
+    def test_stops_at_sentence_end(self):
+        assert take_first_sentence(iter(["Tests pass", ". Next I will", " refactor."])) == "Tests pass."
+        assert take_first_sentence(iter(["Ready! ", "Anything else?"])) == "Ready!"
+
+    def test_terminator_needs_following_space_or_quote(self):
+        deltas = iter(["Upgraded to v3.", "5 successfully", ". Bye"])
+        assert take_first_sentence(deltas) == "Upgraded to v3.5 successfully."
+
+    def test_closing_quote_ends_sentence(self):
+        assert take_first_sentence(iter(['"All set."', " extra"])) == '"All set."'
+
+    def test_leading_blank_lines_skipped(self):
+        assert take_first_sentence(iter(["\n\n", "  Done!", "\n"])) == "Done!"
+
+    def test_unterminated_stream_returns_everything(self):
+        assert take_first_sentence(iter(["Work ", "complete"])) == "Work complete"
+
+    def test_max_chars(self):
+        assert take_first_sentence(iter(["word " * 100]), max_chars=20) == "word word word word"
+
+    def test_empty_stream_is_none(self):
+        assert take_first_sentence(iter([])) is None
+        assert take_first_sentence(iter(["", None, "  "])) is None
+
+    def test_generator_closed_after_first_sentence(self):
+        consumed = []
+        closed = []
+
+        def deltas():
+            try:
+                for part in ["Done.", " Second", " third"]:
+                    consumed.append(part)
+                    yield part
+            finally:
+                closed.append(True)
+
+        assert take_first_sentence(deltas()) == "Done."
+        assert consumed == ["Done.", " Second"]
+        assert closed == [True]
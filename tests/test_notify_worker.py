@@ -0,0 +1,157 @@
+"""Tests for the detached notification worker and its spool queue."""
+
+import fcntl
+import json
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils import notify_worker
+from utils.notify_worker import coalesce, drain, enqueue, notify, run, start_worker, take_jobs
+
+
+@pytest.fixture
+def qdir(tmp_path, monkeypatch):
+    d = tmp_path / "notify-queue"
+    monkeypatch.setenv("CLAUDE_NOTIFY_QUEUE", str(d))
+    monkeypatch.setattr(notify_worker, "COALESCE_WINDOW", 0)
+    return d
+
+
+def _job(event, created=None, **extra):
+    return {"event": event, "created": time.time() if created is None else created, **extra}
+
+
+# ---------------------------------------------------------------------------
+# TestEnqueue
+# ---------------------------------------------------------------------------
+
+
+class TestEnqueue:
+    def test_writes_job_file(self, qdir):
+        path = enqueue("stop", transcript_path="/t.jsonl", mode="tts", start=False)
+        job = json.loads(path.read_text())
+        assert job["event"] == "stop"
+        assert job["transcript_path"] == "/t.jsonl"
+        assert job["mode"] == "tts"
+        assert not list(qdir.glob(".*"))  # no leftover temp files
+
+    def test_jobs_are_taken_in_order_and_removed(self, qdir):
+        for i in range(3):
+            enqueue("notification", message=str(i), start=False)
+        assert [j["message"] for j in take_jobs(qdir)] == ["0", "1", "2"]
+        assert take_jobs(qdir) == []
+
+    def test_unreadable_job_is_discarded(self, qdir):
+        qdir.mkdir()
+        (qdir / "1-1.json").write_text("{not json")
+        assert take_jobs(qdir) == []
+        assert not (qdir / "1-1.json").exists()
+
+    def test_notify_enqueues_with_current_mode(self, qdir, monkeypatch):
+        monkeypatch.delenv("CLAUDE_NOTIFY_SYNC", raising=False)
+        with patch("utils.common.get_notify_mode", return_value="macos"), \
+             patch.object(notify_worker, "start_worker") as start, \
+             patch.object(notify_worker, "deliver") as deliver:
+            notify("stop", transcript_path="/t.jsonl")
+        start.assert_called_once()
+        deliver.assert_not_called()
+        assert take_jobs(qdir)[0]["mode"] == "macos"
+
+    def test_notify_sync_delivers_inline(self, qdir, monkeypatch):
+        monkeypatch.setenv("CLAUDE_NOTIFY_SYNC", "1")
+        with patch.object(notify_worker, "deliver") as deliver:
+            notify("notification", message="hi")
+        assert deliver.call_args[0][0]["message"] == "hi"
+        assert not qdir.exists()
+
+
+# ---------------------------------------------------------------------------
+# TestCoalesce
+# ---------------------------------------------------------------------------
+
+
+class TestCoalesce:
+    def test_burst_yields_one_notification_and_one_completion(self):
+        jobs = [
+            _job("subagent_stop", transcript_path="a"),
+            _job("notification", message="first"),
+            _job("stop", transcript_path="b"),
+            _job("subagent_stop", transcript_path="c"),
+            _job("notification", message="second"),
+        ]
+        batch = coalesce(jobs)
+        assert [(j["event"], j.get("message") or j.get("transcript_path")) for j in batch] == [
+            ("notification", "second"),
+            ("stop", "b"),
+        ]
+
+    def test_subagent_completion_used_when_no_stop(self):
+        batch = coalesce([_job("subagent_stop", transcript_path="a"), _job("subagent_stop", transcript_path="b")])
+        assert [j["transcript_path"] for j in batch] == ["b"]
+
+    def test_stale_jobs_are_dropped(self):
+        now = time.time()
+        assert coalesce([_job("stop", created=now - 3600)], now=now) == []
+
+
+# ---------------------------------------------------------------------------
+# TestWorker
+# ---------------------------------------------------------------------------
+
+
+class TestWorker:
+    def test_drain_delivers_coalesced_batch(self, qdir):
+        enqueue("stop", transcript_path="a", start=False)
+        enqueue("stop", transcript_path="b", start=False)
+        with patch.object(notify_worker, "deliver") as deliver:
+            assert drain(qdir) == 2
+        assert [c[0][0]["transcript_path"] for c in deliver.call_args_list] == ["b"]
+
+    def test_delivery_errors_do_not_stop_the_worker(self, qdir):
+        enqueue("notification", message="x", start=False)
+        with patch.object(notify_worker, "deliver", side_effect=RuntimeError):
+            run(qdir, once=True)
+        assert take_jobs(qdir) == []
+
+    def test_deliver_uses_queued_mode(self):
+        with patch("utils.common.build_service") as build:
+            notify_worker.deliver(_job("notification", message="hi", mode="tts"))
+        build.assert_called_once_with(mode="tts")
+        build.return_value.speak_notification.assert_called_once_with(message="hi")
+
+    def test_run_exits_when_another_worker_holds_lock(self, qdir):
+        qdir.mkdir()
+        enqueue("stop", start=False)
+        with open(qdir / "worker.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with patch.object(notify_worker, "deliver") as deliver:
+                run(qdir, once=True)
+        deliver.assert_not_called()
+
+    def test_start_worker_skips_spawn_when_running(self, qdir):
+        qdir.mkdir()
+        with open(qdir / "worker.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with patch("subprocess.Popen") as popen:
+                start_worker(qdir)
+        popen.assert_not_called()
+
+    def test_start_worker_spawns_detached(self, qdir):
+        qdir.mkdir()
+        with patch("subprocess.Popen") as popen:
+            start_worker(qdir)
+        args, kwargs = popen.call_args
+        assert args[0][-2:] == ["--queue", str(qdir)]
+        assert kwargs["start_new_session"] is True
+
+    def test_declares_the_provider_packages_backends_import(self):
+        header = Path(notify_worker.__file__).read_text().split("# ///")[1]
+        for dep in ("anthropic", "openai", "elevenlabs", "sounddevice", "httpx[http2]", "python-dotenv"):
+            assert f'"{dep}"' in header
+        assert "kokoro" not in header
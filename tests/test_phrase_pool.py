@@ -0,0 +1,234 @@
+"""Tests for the pre-generated phrase pools and their background refill."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils import phrase_pool  # noqa: E402
+from utils.common import Backend, NotificationService  # noqa: E402
+from utils.phrase_pool import (  # noqa: E402
+    EXAMPLE_AGENT_NAMES,
+    AnnouncementPool,
+    PhrasePool,
+    agent_name_pool,
+    draw_agent_name,
+    parse_agent_names,
+    parse_announcements,
+    parse_phrases,
+    refill,
+)
+
+
+@pytest.fixture
+def pools(tmp_path):
+    return tmp_path / "pools"
+
+
+@pytest.fixture
+def no_spawn(monkeypatch):
+    started = []
+    monkeypatch.setattr(phrase_pool, "start_refill", lambda kind, directory=None: started.append(kind))
+    return started
+
+
+# ---------------------------------------------------------------------------
+# TestPhrasePool
+# ---------------------------------------------------------------------------
+
+
+class TestPhrasePool:
+    def test_pop_empty_is_none(self, pools):
+        assert PhrasePool("p", pools).pop() is None
+
+    def test_extend_then_pop_drains(self, pools):
+        pool = PhrasePool("p", pools)
+        assert pool.extend(["One!", "Two!", "Three!"]) == 3
+        drawn = {pool.pop() for _ in range(3)}
+        assert drawn == {"One!", "Two!", "Three!"}
+        assert pool.pop() is None
+
+    def test_duplicates_ignored_case_insensitively(self, pools):
+        pool = PhrasePool("p", pools)
+        pool.extend(["All done!"])
+        assert pool.extend(["all done!", "Fresh one!"]) == 1
+        assert len(pool) == 2
+
+    def test_capacity_keeps_newest(self, pools):
+        pool = PhrasePool("p", pools, capacity=3)
+        pool.extend(["a", "b", "c"])
+        pool.extend(["d", "e"])
+        items = {pool.pop() for _ in range(3)}
+        assert {"d", "e"} <= items
+        assert pool.pop() is None
+
+    def test_low_water(self, pools):
+        pool = PhrasePool("p", pools, low_water=2)
+        assert pool.low()
+        pool.extend(["a", "b"])
+        assert not pool.low()
+
+    def test_corrupt_file_is_empty(self, pools):
+        pools.mkdir()
+        (pools / "p.json").write_text("{not json")
+        assert PhrasePool("p", pools).pop() is None
+
+
+# ---------------------------------------------------------------------------
+# TestParsing
+# ---------------------------------------------------------------------------
+
+
+class TestParsing:
+    def test_strips_list_markers_and_quotes(self):
+        text = '1. All done!\n- "Task finished."\n* Ready for more\n\n2) Wrapped up!'
+        assert parse_phrases(text) == ["All done!", "Task finished.", "Ready for more", "Wrapped up!"]
+
+    def test_drops_long_and_formatted_lines(self):
+        text = "Here are your announcements:\n**Done!**\n" + "word " * 20 + "\nGood to go!"
+        assert parse_phrases(text) == ["Good to go!"]
+
+    def test_personal_announcements_must_use_the_name(self):
+        assert parse_announcements("Sam, all set!\nAll done!", "Sam") == ["Sam, all set!"]
+
+    def test_none_is_empty(self):
+        assert parse_phrases(None) == []
+
+
+# ---------------------------------------------------------------------------
+# TestAnnouncementPool
+# ---------------------------------------------------------------------------
+
+
+class TestAnnouncementPool:
+    def test_empty_pool_draws_none_and_requests_refill(self, pools, no_spawn):
+        assert AnnouncementPool(pools, engineer_name="").draw() is None
+        assert no_spawn == ["announcements"]
+
+    def test_full_pool_does_not_request_refill(self, pools, no_spawn):
+        ann = AnnouncementPool(pools, engineer_name="")
+        ann.generic.extend([f"Done number {i}!" for i in range(20)])
+        assert ann.draw().startswith("Done number")
+        assert no_spawn == []
+
+    def test_falls_back_to_other_pool(self, pools, no_spawn):
+        ann = AnnouncementPool(pools, engineer_name="Sam")
+        ann.personal.extend(["Sam, all set!"])
+        with patch("utils.phrase_pool.random.random", return_value=0.9):  # prefers generic
+            assert ann.draw() == "Sam, all set!"
+
+    def test_personal_pool_per_name(self, pools):
+        assert AnnouncementPool(pools, engineer_name="Sam O'Neil").personal.name == "announcements-sam-o-neil"
+        assert AnnouncementPool(pools, engineer_name="").personal is None
+
+    def test_service_uses_pool_before_fixed_fallbacks(self, pools, no_spawn):
+        ann = AnnouncementPool(pools, engineer_name="")
+        svc = NotificationService([], [], ["fixed"], announcements=ann)
+        assert svc._generate_message() == "fixed"
+        ann.generic.extend(["Fresh and ready!"])
+        assert svc._generate_message() == "Fresh and ready!"
+
+    def test_service_tries_llm_before_drawing_pool(self, pools, no_spawn, tmp_path):
+        llm = Backend("llm", tmp_path / "llm.py")
+        ann = AnnouncementPool(pools, engineer_name="")
+        ann.generic.extend(["Pooled one!", "Pooled two!"])
+        svc = NotificationService([], [llm], ["fixed"], announcements=ann)
+        with patch.object(Backend, "is_available", return_value=True), \
+             patch.object(svc, "_run", return_value="Fixed the login flow!") as run:
+            assert svc._generate_message() == "Fixed the login flow!"
+        run.assert_called_once()
+        assert len(ann.generic) == 2  # the pool was not touched
+        with patch.object(Backend, "is_available", return_value=True), \
+             patch.object(svc, "_run", return_value=None):
+            assert svc._generate_message().startswith("Pooled")
+        assert len(ann.generic) == 1
+
+
+# ---------------------------------------------------------------------------
+# TestAgentNames
+# ---------------------------------------------------------------------------
+
+
+class TestAgentNames:
+    def test_parse_keeps_single_valid_words(self):
+        assert parse_agent_names("1. Orion\n- lumen.\nTwo Words\nab\nX-ray\nQUILL") == ["Orion", "Lumen", "Quill"]
+
+    def test_draw_pops_pooled_name(self, pools, no_spawn):
+        agent_name_pool(pools).extend([f"Name{i}" for i in range(30)])
+        assert draw_agent_name(pools).startswith("Name")
+        assert no_spawn == []
+
+    def test_empty_pool_uses_example_and_refills(self, pools, no_spawn):
+        assert draw_agent_name(pools) in EXAMPLE_AGENT_NAMES
+        assert no_spawn == ["agent-names"]
+
+    def test_refill_asks_for_a_batch(self, pools, tmp_path):
+        script = tmp_path / "ollama.py"
+        script.write_text("")
+        with patch("utils.common.build_service") as build, \
+             patch.object(Backend, "run", autospec=True, return_value="Orion\nLumen\nnot a name") as run:
+            build.return_value.llm_backends = [Backend("ollama", script)]
+            assert refill("agent-names", pools) == 2
+        assert run.call_args.args[1:] == ("--agent-names", "40")
+        assert len(agent_name_pool(pools)) == 2
+
+
+# ---------------------------------------------------------------------------
+# TestRefill
+# ---------------------------------------------------------------------------
+
+
+class TestRefill:
+    def _llms(self, tmp_path, names):
+        llms = []
+        for name in names:
+            script = tmp_path / f"{name}.py"
+            script.write_text("")
+            llms.append(Backend(name, script))
+        return llms
+
+    def test_first_answering_backend_fills_each_low_pool(self, pools, tmp_path, monkeypatch):
+        monkeypatch.setenv("ENGINEER_NAME", "Sam")
+        llms = self._llms(tmp_path, ["dead", "alive"])
+        calls = []
+
+        def fake_run(backend, *args):
+            calls.append((backend.name, args))
+            if backend.name == "dead":
+                return None
+            return "Sam, all set!\nReady for you, Sam!" if "--name" in args else "All done!\nTask finished!"
+
+        with patch("utils.common.build_service") as build, patch.object(Backend, "run", autospec=True, side_effect=fake_run):
+            build.return_value.llm_backends = llms
+            assert refill("announcements", pools) == 4
+
+        ann = AnnouncementPool(pools, engineer_name="Sam")
+        assert len(ann.generic) == 2 and len(ann.personal) == 2
+        assert calls[0] == ("dead", ("--announcements", "20"))
+        assert calls[-1] == ("alive", ("--announcements", "20", "--name", "Sam"))
+
+    def test_refill_is_single_instance(self, pools):
+        import fcntl
+
+        pools.mkdir()
+        with open(pools / "announcements.refill.lock", "a") as held:
+            fcntl.flock(held, fcntl.LOCK_EX)
+            with patch.dict(phrase_pool.REFILLERS, {"announcements": lambda d: 99}):
+                assert refill("announcements", pools) == 0
+
+    def test_start_refill_backs_off_after_recent_attempt(self, pools):
+        pools.mkdir()
+        (pools / "announcements.refill.lock").touch()
+        with patch("subprocess.Popen") as popen:
+            phrase_pool.start_refill("announcements", pools)
+        popen.assert_not_called()
+
+    def test_start_refill_spawns_detached(self, pools):
+        with patch("subprocess.Popen") as popen:
+            phrase_pool.start_refill("announcements", pools)
+        args, kwargs = popen.call_args
+        assert args[0][-4:] == ["refill", "announcements", "--dir", str(pools)]
+        assert kwargs["start_new_session"] is True
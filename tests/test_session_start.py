@@ -0,0 +1,95 @@
+"""Tests for session_start.py's concurrent context providers."""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+import session_start
+from session_start import build_morning_context, gather_context, load_development_context, startup_providers
+
+
+def slow(value, delay):
+    def provider():
+        time.sleep(delay)
+        return value
+    return provider
+
+
+def failing():
+    raise RuntimeError("boom")
+
+
+class TestGatherContext:
+    def test_providers_run_concurrently(self):
+        start = time.monotonic()
+        gathered = gather_context({"a": slow(1, 0.3), "b": slow(2, 0.3), "c": slow(3, 0.3)}, deadline=5)
+        assert gathered == {"a": 1, "b": 2, "c": 3}
+        assert time.monotonic() - start < 0.8
+
+    def test_slow_provider_is_omitted_at_deadline(self):
+        start = time.monotonic()
+        gathered = gather_context({"fast": slow("ok", 0), "slow": slow("late", 5)}, deadline=0.3)
+        assert gathered == {"fast": "ok"}
+        assert time.monotonic() - start < 1.5
+
+    def test_failing_provider_is_omitted(self):
+        assert gather_context({"ok": lambda: 1, "bad": failing}, deadline=2) == {"ok": 1}
+
+    def test_returns_as_soon_as_all_finish(self):
+        start = time.monotonic()
+        assert gather_context({"a": lambda: None}, deadline=10) == {"a": None}
+        assert time.monotonic() - start < 1
+
+    def test_no_providers(self):
+        assert gather_context({}, deadline=10) == {}
+
+
+class TestStartupProviders:
+    def test_startup_with_context_runs_git_once(self):
+        providers = startup_providers("startup", load_context=True)
+        assert set(providers) == {"weather", "todos", "git", "issues"}
+
+    def test_resume_without_context_runs_nothing(self):
+        assert startup_providers("resume", load_context=False) == {}
+
+    def test_resume_with_context_skips_morning_providers(self):
+        assert set(startup_providers("resume", load_context=True)) == {"git", "issues"}
+
+    def test_deadline_from_env(self, monkeypatch):
+        monkeypatch.setenv("CLAUDE_SESSION_START_DEADLINE", "1.5")
+        assert session_start.startup_deadline() == 1.5
+        monkeypatch.setenv("CLAUDE_SESSION_START_DEADLINE", "soon")
+        assert session_start.startup_deadline() == session_start.STARTUP_DEADLINE
+
+
+class TestBuildContext:
+    def test_morning_context_with_all_results(self):
+        text = build_morning_context("startup", {"weather": "Sunny", "git": ("main", 2), "todos": 3})
+        assert "Weather: Sunny" in text
+        assert "Branch: main | 2 uncommitted files" in text
+        assert "Pending Tasks: 3 incomplete" in text
+
+    def test_morning_context_omits_missing_providers(self):
+        text = build_morning_context("startup", {"git": (None, None)})
+        assert "Weather" not in text
+        assert "Pending Tasks" not in text
+        assert "Not in git repo" in text
+
+    def test_morning_context_only_on_startup(self):
+        assert build_morning_context("resume", {"weather": "Sunny"}) == ""
+
+    def test_development_context_uses_gathered(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        text = load_development_context("startup", {"git": ("feature", 1), "issues": "#1 bug"})
+        assert "Git branch: feature" in text
+        assert "Uncommitted changes: 1 files" in text
+        assert "#1 bug" in text
+
+    def test_development_context_without_git_or_issues(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        text = load_development_context("clear", {})
+        assert "Session source: clear" in text
+        assert "Git branch" not in text
+        assert "GitHub Issues" not in text
@@ -0,0 +1,89 @@
+"""Tests for the mtime-keyed status line session cache."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils.status_cache import MAX_PROMPT_CHARS, SessionStateCache, digest_session
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    directory = tmp_path / "sessions"
+    directory.mkdir()
+    return directory
+
+
+def _write_session(sessions, session_id, **data):
+    path = sessions / f"{session_id}.json"
+    path.write_text(json.dumps({"session_id": session_id, **data}))
+    return path
+
+
+def _cache(sessions, tmp_path):
+    return SessionStateCache(sessions_dir=sessions, cache_dir=tmp_path / "status-cache")
+
+
+class TestDigestSession:
+    def test_keeps_only_displayed_fields(self):
+        digest = digest_session({"agent_name": "Nova", "prompts": ["a", "b"], "extras": {"k": 1}, "other": "x"})
+        assert digest == {"agent_name": "Nova", "last_prompt": "b", "prompt_count": 2, "extras": {"k": 1}}
+
+    def test_empty_session(self):
+        assert digest_session({}) == {"agent_name": None, "last_prompt": None, "prompt_count": 0, "extras": {}}
+
+    def test_long_prompt_is_cut(self):
+        assert len(digest_session({"prompts": ["x" * 5000]})["last_prompt"]) == MAX_PROMPT_CHARS
+
+
+class TestSessionStateCache:
+    def test_missing_session_is_an_error(self, sessions, tmp_path):
+        state, error = _cache(sessions, tmp_path).load("nope")
+        assert state is None and "does not exist" in error
+
+    def test_corrupt_session_is_an_error(self, sessions, tmp_path):
+        (sessions / "bad.json").write_text("{not json")
+        state, error = _cache(sessions, tmp_path).load("bad")
+        assert state is None and error.startswith("Error reading session file")
+
+    def test_unchanged_session_is_not_parsed_again(self, sessions, tmp_path, monkeypatch):
+        _write_session(sessions, "s1", agent_name="Nova", prompts=["fix the bug"])
+        assert _cache(sessions, tmp_path).load("s1")[0]["last_prompt"] == "fix the bug"
+
+        monkeypatch.setattr("utils.status_cache.digest_session", lambda data: pytest.fail("re-parsed"))
+        state, error = _cache(sessions, tmp_path).load("s1")
+        assert error is None and state["agent_name"] == "Nova"
+
+    def test_changed_session_is_reloaded(self, sessions, tmp_path):
+        path = _write_session(sessions, "s1", prompts=["first"])
+        _cache(sessions, tmp_path).load("s1")
+        _write_session(sessions, "s1", prompts=["first", "second"])
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert _cache(sessions, tmp_path).load("s1")[0]["last_prompt"] == "second"
+
+    def test_write_prunes_digests_past_max_age(self, sessions, tmp_path):
+        cache_dir = tmp_path / "status-cache"
+        for sid in ("old", "new"):
+            _write_session(sessions, sid, prompts=["hi"])
+            SessionStateCache(sessions_dir=sessions, cache_dir=cache_dir, max_age=3600).load(sid)
+        os.utime(cache_dir / "old.json", (1, 1))
+        stray = cache_dir / "gone.json.123.tmp"
+        stray.write_text("{}")
+        os.utime(stray, (1, 1))
+
+        _write_session(sessions, "third", prompts=["hi"])
+        SessionStateCache(sessions_dir=sessions, cache_dir=cache_dir, max_age=3600).load("third")
+        assert sorted(p.name for p in cache_dir.iterdir()) == ["new.json", "third.json"]
+
+    def test_unwritable_cache_dir_still_loads(self, sessions, tmp_path):
+        _write_session(sessions, "s1", agent_name="Nova")
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+        cache = SessionStateCache(sessions_dir=sessions, cache_dir=blocker / "status-cache")
+        assert cache.load("s1")[0]["agent_name"] == "Nova"
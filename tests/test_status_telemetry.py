@@ -0,0 +1,130 @@
+"""Tests for sampled status line telemetry."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dot_claude" / "hooks"))
+
+from utils import status_telemetry
+from utils.status_telemetry import BUCKETS_MS, RenderStats, record_render
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.delenv("CLAUDE_STATUS_TELEMETRY", raising=False)
+    monkeypatch.delenv("CLAUDE_STATUS_SAMPLE", raising=False)
+    return {"log_dir": tmp_path / "logs", "directory": tmp_path / "telemetry"}
+
+
+def _logged(log_dir, name="status_line.jsonl"):
+    path = log_dir / name
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+class TestRenderStats:
+    def test_counts_and_histogram(self, tmp_path):
+        stats = RenderStats("v9", tmp_path)
+        stats.record(0.0005)
+        stats.record(0.003)
+        stats.record(2.0)
+        stats.record(0.0, error=True)
+        snap = stats.snapshot()
+        assert (snap["renders"], snap["errors"], snap["logged"]) == (3, 1, 4)
+        assert snap["histogram"]["<=1ms"] == 1
+        assert snap["histogram"]["<=5ms"] == 1
+        assert snap["histogram"][f">{BUCKETS_MS[-1]}ms"] == 1
+        assert snap["mean_ms"] == pytest.approx((0.5 + 3 + 2000) / 3, abs=0.01)
+
+    def test_weight_scales_counts_and_latency_but_not_logged(self, tmp_path):
+        stats = RenderStats("v9", tmp_path)
+        stats.record(0.003, weight=50)
+        stats.record(0.0, error=True, weight=50)
+        snap = stats.snapshot()
+        assert (snap["renders"], snap["errors"], snap["logged"]) == (50, 50, 2)
+        assert snap["histogram"]["<=5ms"] == 50
+        assert snap["mean_ms"] == pytest.approx(3, abs=0.01)
+
+    def test_snapshot_of_missing_file_is_empty(self, tmp_path):
+        snap = RenderStats("none", tmp_path).snapshot()
+        assert snap["renders"] == 0 and snap["mean_ms"] is None
+
+    def test_flush_due_after_interval(self, tmp_path):
+        stats = RenderStats("v9", tmp_path)
+        with patch("utils.status_telemetry.time.time", return_value=1_000_000):
+            assert stats.record(0.001) is False
+        with patch("utils.status_telemetry.time.time", return_value=1_000_010):
+            assert stats.record(0.001) is False
+        with patch("utils.status_telemetry.time.time", return_value=1_000_000 + status_telemetry.FLUSH_INTERVAL):
+            assert stats.record(0.001) is True
+            assert stats.record(0.001) is False
+
+    def test_reset(self, tmp_path):
+        stats = RenderStats("v9", tmp_path)
+        stats.record(0.001)
+        stats.reset()
+        assert stats.snapshot()["renders"] == 0
+
+
+class TestRecordRender:
+    def test_unsampled_render_touches_no_file(self, dirs, monkeypatch):
+        monkeypatch.setenv("CLAUDE_STATUS_SAMPLE", "0.5")
+        with patch("utils.status_telemetry.random.random", return_value=0.7), \
+             patch("utils.status_telemetry.RenderStats.record", side_effect=AssertionError("counter file opened")):
+            record_render("v9", {"session_id": "s"}, "line", **dirs)
+            record_render("v9", {}, "No session data", error="missing", **dirs)
+        assert not dirs["log_dir"].exists() and not dirs["directory"].exists()
+
+    def test_sampled_render_is_counted_for_the_renders_it_stands_for(self, dirs, monkeypatch):
+        monkeypatch.setenv("CLAUDE_STATUS_SAMPLE", "0.25")
+        with patch("utils.status_telemetry.random.random", return_value=0.1):
+            record_render("v9", {}, "line", **dirs)
+        snap = RenderStats("v9", dirs["directory"]).snapshot()
+        assert (snap["renders"], snap["logged"]) == (4, 1)
+        assert len(_logged(dirs["log_dir"])) == 1
+
+    def test_sampled_render_is_logged(self, dirs, monkeypatch):
+        monkeypatch.setenv("CLAUDE_STATUS_SAMPLE", "1")
+        record_render("v9", {"session_id": "s"}, "line", **dirs)
+        [entry] = _logged(dirs["log_dir"])
+        assert entry["version"] == "v9" and entry["status_line_output"] == "line"
+        assert entry["input_data"] == {"session_id": "s"} and "elapsed_ms" in entry
+
+    def test_sampled_error_is_logged_with_its_message(self, dirs, monkeypatch):
+        monkeypatch.setenv("CLAUDE_STATUS_SAMPLE", "1")
+        record_render("v9", {}, "No session data", error="missing", **dirs)
+        record_render("v9", {}, "line", **dirs)
+        assert [e.get("error") for e in _logged(dirs["log_dir"])] == ["missing", None]
+        snap = RenderStats("v9", dirs["directory"]).snapshot()
+        assert (snap["renders"], snap["errors"], snap["logged"]) == (1, 1, 2)
+
+    def test_full_mode_logs_every_render(self, dirs, monkeypatch):
+        monkeypatch.setenv("CLAUDE_STATUS_TELEMETRY", "full")
+        monkeypatch.setenv("CLAUDE_STATUS_SAMPLE", "0")
+        for _ in range(3):
+            record_render("v9", {}, "line", **dirs)
+        assert len(_logged(dirs["log_dir"])) == 3
+
+    def test_off_mode_records_nothing(self, dirs, monkeypatch):
+        monkeypatch.setenv("CLAUDE_STATUS_TELEMETRY", "off")
+        record_render("v9", {}, "line", error="boom", **dirs)
+        assert not dirs["log_dir"].exists() and not dirs["directory"].exists()
+
+    def test_periodic_flush_appends_snapshot(self, dirs, monkeypatch):
+        monkeypatch.setenv("CLAUDE_STATUS_SAMPLE", "1")
+        with patch("utils.status_telemetry.time.time", return_value=1_000_000):
+            record_render("v9", {}, "line", **dirs)
+        with patch("utils.status_telemetry.time.time", return_value=1_000_000 + status_telemetry.FLUSH_INTERVAL):
+            record_render("v9", {}, "line", **dirs)
+        assert len(_logged(dirs["log_dir"])) == 2
+        [snapshot] = _logged(dirs["log_dir"], "status_line_stats.jsonl")
+        assert snapshot["version"] == "v9" and snapshot["renders"] == 2
+
+    def test_unwritable_telemetry_dir_is_ignored(self, dirs, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_STATUS_SAMPLE", "1")
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+        record_render("v9", {}, "line", log_dir=dirs["log_dir"], directory=blocker / "telemetry")
@@ -0,0 +1,81 @@
+"""Tests for the single-process statusline-command.py status line."""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent / "dot_claude" / "statusline-command.py"
+ANSI = re.compile(r"\033\[[0-9;]*m")
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+    "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com",
+    "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1",
+}
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, env={**os.environ, **GIT_ENV})
+
+
+def status(home, payload, **env):
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT)],
+        input=payload if isinstance(payload, str) else json.dumps(payload),
+        capture_output=True,
+        text=True,
+        env={**os.environ, "HOME": str(home), "CLAUDE_GIT_STATE_TTL": "0", **env},
+        timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    return ANSI.sub("", result.stdout)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "project"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    (path / "a.txt").write_text("a\n")
+    git(path, "add", "a.txt")
+    git(path, "commit", "-qm", "init")
+    return path
+
+
+class TestStatuslineCommand:
+    def test_model_directory_branch_and_time(self, tmp_path, repo):
+        line = status(tmp_path, {"workspace": {"current_dir": str(repo)}, "model": {"display_name": "Opus"}})
+        assert re.fullmatch(r"Opus project main \d\d:\d\d", line)
+
+    def test_dirty_marker(self, tmp_path, repo):
+        (repo / "a.txt").write_text("changed\n")
+        line = status(tmp_path, {"workspace": {"current_dir": str(repo)}})
+        assert " main* " in line
+
+    def test_detached_head_shows_no_branch(self, tmp_path, repo):
+        git(repo, "checkout", "-q", "--detach")
+        assert re.fullmatch(r"Claude project \d\d:\d\d", status(tmp_path, {"cwd": str(repo)}))
+
+    def test_home_and_root_labels(self, tmp_path):
+        assert status(tmp_path, {"cwd": str(tmp_path)}).startswith("Claude ~ ")
+        assert status(tmp_path, {"cwd": "/"}).startswith("Claude / ")
+
+    def test_invalid_input_still_renders(self, tmp_path):
+        assert status(tmp_path, "not json").startswith("Claude ")
+
+    def test_no_git_process_on_cache_hit(self, tmp_path, repo):
+        payload = {"cwd": str(repo)}
+        status(tmp_path, payload, CLAUDE_GIT_STATE_TTL="60")
+        # git is unreachable now, so the dirty check must come from the cache
+        assert " main " in status(tmp_path, payload, CLAUDE_GIT_STATE_TTL="60", PATH="/nonexistent")
+
+    def test_edit_after_cache_fill_is_dirty_without_git(self, tmp_path, repo):
+        payload = {"cwd": str(repo)}
+        status(tmp_path, payload)
+        (repo / "a.txt").write_text("changed\n")
+        assert " main* " in status(tmp_path, payload, PATH="/nonexistent")